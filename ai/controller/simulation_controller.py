@@ -3,11 +3,61 @@ Production-level simulation controller for CyberGuardian AI.
 Orchestrates the scam simulation with full persona/scenario context.
 """
 
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from ai.session.escalation import EscalationTracker
 from ai.session.session_state import SimulationSession, SimulationState
-from ai.risk_detection.risk_detection import detect_risk
-from ai.mentor_engine.mentor_engine import run_mentor, get_quick_tip
-from ai.prompts.prompt_builder import build_simulator_prompt, build_initial_message_prompt
-from ai.llm.ollama_client import call_ollama
+from ai.risk_detection.risk_detection import detect_risk, detect_secondary_risk, has_secondary_detectors
+from ai.risk_detection.conversation_tracker import ConversationRiskTracker
+from ai.mentor_engine.mentor_engine import run_mentor, get_quick_tip, build_fallback_mentor_text
+from ai.prompts.prompt_builder import (
+    build_simulator_prompt, build_stage_prompt, build_initial_message_prompt, build_summary_prompt
+)
+from ai.prompts.scenarios import get_fallback_message, get_scenario
+from ai.llm.generation_profiles import get_generation_profile
+from ai.llm.ollama_client import LLMUnavailable, call_ollama
+from ai.llm.tokens import count_tokens, truncate_to_tokens
+
+# Start the scammer reply while slow (secondary) risk checks run, instead of after them
+SPECULATIVE_GENERATION = os.getenv("SPECULATIVE_GENERATION", "true").lower() == "true"
+_speculation_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("SPECULATIVE_MAX_WORKERS", "32")),
+    thread_name_prefix="speculative-llm"
+)
+speculation_stats = {"started": 0, "used": 0, "cancelled": 0}
+
+# Turns answered from templates because the LLM was down or over budget
+fallback_stats = {"scammer": 0, "mentor": 0}
+
+# Simulator prompt with only the current escalation step instead of the whole scenario
+STAGED_SIMULATOR_PROMPTS = os.getenv("STAGED_SIMULATOR_PROMPTS", "true").lower() == "true"
+
+# Scammer-turn prompt sizes and how much history the token budget let in
+prompt_token_stats = {
+    "turns": 0,
+    "prompt_tokens": 0,
+    "max_prompt_tokens": 0,
+    "history_tokens": 0,
+    "history_messages": 0,
+    "dropped_messages": 0,
+    "truncated_messages": 0,
+}
+# Per escalation stage: {stage: {"turns", "prompt_tokens"}}
+stage_prompt_stats = {}
+
+# Fold turns that leave the history window into a rolling "story so far", off the request path
+HISTORY_SUMMARY = os.getenv("HISTORY_SUMMARY", "true").lower() == "true"
+SUMMARY_BATCH_LINES = int(os.getenv("HISTORY_SUMMARY_BATCH_LINES", "4"))
+SUMMARY_MAX_TOKENS = 200
+SUMMARY_INPUT_TOKENS = 1024
+_summary_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("HISTORY_SUMMARY_WORKERS", "4")),
+    thread_name_prefix="history-summary"
+)
+summary_stats = {"updates": 0, "lines_folded": 0, "failures": 0, "stale": 0}
 
 
 class SimulationController:
@@ -17,26 +67,86 @@ class SimulationController:
     Key guarantees:
     - HIGH risk ALWAYS triggers mentor, NEVER calls scammer LLM
     - Persona/scenario context flows to all components
-    - Conversation history is limited to prevent hallucination
+    - Conversation history is limited to a token budget, to prevent
+      hallucination and bound prompt evaluation time
     """
     
-    def __init__(self, persona: str, age: int, scenario: str):
+    def __init__(self, persona: str, age: int, scenario: str, session_id: Optional[str] = None):
         self.session = SimulationSession(persona, age, scenario)
-        self.sim_prompt = build_simulator_prompt(persona, age, scenario)
         self.initial_prompt = build_initial_message_prompt(persona, age, scenario)
         
+        # Rolling per-conversation risk state (what was asked, split digits)
+        self.risk_tracker = ConversationRiskTracker()
+
+        # Which step of the scenario's escalation pattern the scammer is on
+        self.escalation = EscalationTracker(len(get_scenario(scenario)["escalation_pattern"]))
+        
         # Store context for mentor
         self.persona = persona
         self.age = age
         self.scenario = scenario
+        
+        # Fair-queuing key for the LLM scheduler
+        self.session_id = session_id
+
+        # Simulator prompt and scammer-turn tokens without history, per stage; tokens of the last full prompt
+        self._frames = {}
+        self.last_prompt_tokens = 0
+
+        # First history line of the last prompt's window, and the summary update in flight
+        self._window_start = 0
+        self._window_truncated = False
+        # History lines already counted as dropped from a sent prompt (high-water mark)
+        self._dropped_lines = 0
+        self._summary_job: Optional[Future] = None
+        self._summary_lock = threading.Lock()
+
+    def _frame(self) -> Tuple[str, int]:
+        """Simulator prompt for the current stage and the tokens of a turn prompt built on it without history."""
+        stage = self.escalation.stage if STAGED_SIMULATOR_PROMPTS else None
+        if stage not in self._frames:
+            if stage is None:
+                sim_prompt = build_simulator_prompt(self.persona, self.age, self.scenario)
+            else:
+                sim_prompt = build_stage_prompt(self.persona, self.age, self.scenario, stage)
+            self._frames[stage] = (sim_prompt, count_tokens(self._turn_prompt("", sim_prompt=sim_prompt)))
+        return self._frames[stage]
 
-    def _get_limited_history(self, max_exchanges: int = 5) -> str:
-        """Return only the last N exchanges from history to prevent LLM hallucination."""
-        lines = [line for line in self.session.history.strip().split('\n') if line.strip()]
-        # Each exchange = 2 lines (User + Scammer)
-        max_lines = max_exchanges * 2
-        limited = lines[-max_lines:] if len(lines) > max_lines else lines
-        return '\n'.join(limited)
+    @property
+    def sim_prompt(self) -> str:
+        return self._frame()[0]
+
+    @property
+    def frame_tokens(self) -> int:
+        return self._frame()[1]
+
+    def _history_lines(self) -> List[str]:
+        return [line for line in self.session.history.strip().split('\n') if line.strip()]
+
+    def _get_limited_history(self, token_budget: int) -> Tuple[str, int]:
+        """
+        Return the most recent history lines that fit in `token_budget`
+        tokens (oldest first) and their token count. Short chats keep many
+        exchanges, long pasted messages push older ones out; a latest
+        message that alone exceeds the budget is cut to fit. Lines already
+        folded into the session summary are never repeated.
+        """
+        lines = self._history_lines()
+        window, used = [], 0
+        self._window_truncated = False
+        for line in reversed(lines[self.session.summarized_lines:]):
+            tokens = count_tokens(line) + 1  # + the newline joining it
+            if used + tokens > token_budget:
+                if not window:
+                    line = truncate_to_tokens(line, token_budget - 4) + " ..."
+                    window.append(line)
+                    used = count_tokens(line) + 1
+                    self._window_truncated = True
+                break
+            window.append(line)
+            used += tokens
+        self._window_start = len(lines) - len(window)
+        return '\n'.join(reversed(window)), used
 
     def _get_last_scammer_message(self) -> str:
         """Extract the last scammer message for mentor context."""
@@ -46,6 +156,140 @@ class SimulationController:
                 return line.replace("Scammer:", "").strip()
         return ""
 
+    def _fallback_scammer_message(self) -> str:
+        fallback_stats["scammer"] += 1
+        turn = self.session.history.count("\nScammer:")
+        return get_fallback_message(self.scenario, turn)
+
+    def _turn_prompt(self, history: str, story: str = "", sim_prompt: Optional[str] = None) -> str:
+        return f"""
+{sim_prompt or self.sim_prompt}
+{story}
+Conversation so far:
+{history}
+
+Scammer:
+"""
+
+    def _build_turn_prompt(self) -> Tuple[str, dict]:
+        """The scammer-turn prompt and its token usage, for _record_prompt() once it is sent."""
+        budget = get_generation_profile("scammer_turn")["history_tokens"]
+        with self._summary_lock:
+            history, history_tokens = self._get_limited_history(budget)
+            summary = self.session.summary
+        story = f"\nStory so far (earlier messages):\n{summary}\n" if summary else ""
+        usage = {
+            "prompt_tokens": self.frame_tokens + history_tokens + count_tokens(story),
+            "history_tokens": history_tokens,
+            "history_messages": history.count("\n") + 1 if history else 0,
+            "window_start": self._window_start,
+            "truncated": self._window_truncated,
+            "stage": self.escalation.stage + 1,
+        }
+        return self._turn_prompt(history, story), usage
+
+    def _record_prompt(self, usage: dict):
+        """
+        Add a prompt that was sent to the LLM to the prompt statistics.
+        History lines count as dropped only the first time a prompt leaves
+        them out, not again on every later turn.
+        """
+        self.last_prompt_tokens = usage["prompt_tokens"]
+        prompt_token_stats["turns"] += 1
+        prompt_token_stats["prompt_tokens"] += usage["prompt_tokens"]
+        prompt_token_stats["history_tokens"] += usage["history_tokens"]
+        prompt_token_stats["max_prompt_tokens"] = max(prompt_token_stats["max_prompt_tokens"], usage["prompt_tokens"])
+        prompt_token_stats["history_messages"] += usage["history_messages"]
+        prompt_token_stats["truncated_messages"] += usage["truncated"]
+        if usage["window_start"] > self._dropped_lines:
+            prompt_token_stats["dropped_messages"] += usage["window_start"] - self._dropped_lines
+            self._dropped_lines = usage["window_start"]
+        by_stage = stage_prompt_stats.setdefault(usage["stage"], {"turns": 0, "prompt_tokens": 0})
+        by_stage["turns"] += 1
+        by_stage["prompt_tokens"] += usage["prompt_tokens"]
+
+    def _schedule_summary(self):
+        """
+        Fold history lines that have left the prompt window into the
+        session summary, in the background at the scheduler's background
+        priority, once SUMMARY_BATCH_LINES of them have accumulated. One
+        update per session runs at a time; the next turn picks up the rest.
+        """
+        if not HISTORY_SUMMARY or (self._summary_job is not None and not self._summary_job.done()):
+            return
+        with self._summary_lock:
+            lines = self._history_lines()
+            start = self.session.summarized_lines
+            pending = lines[start:self._window_start]
+            if len(pending) < SUMMARY_BATCH_LINES:
+                return
+            # Bound the summarizer's input; lines past the bound wait for the next update
+            batch, used = [], 0
+            for line in pending:
+                used += count_tokens(line) + 1
+                if batch and used > SUMMARY_INPUT_TOKENS:
+                    break
+                batch.append(truncate_to_tokens(line, SUMMARY_INPUT_TOKENS))
+            history = self.session.history
+            previous = self.session.summary
+        self._summary_job = _summary_pool.submit(
+            self._update_summary, history, previous, '\n'.join(batch), start + len(batch)
+        )
+
+    def _update_summary(self, history: str, previous: str, older_lines: str, summarized_lines: int):
+        try:
+            summary = call_ollama(build_summary_prompt(previous, older_lines), profile="summary", user=self.session_id)
+        except Exception as e:
+            summary_stats["failures"] += 1
+            print(f"HISTORY SUMMARY ERROR: {str(e)}")
+            return
+
+        with self._summary_lock:
+            # The session was reset while the summary was generated
+            if not self.session.history.startswith(history):
+                summary_stats["stale"] += 1
+                return
+            self.session.summary = truncate_to_tokens(summary.strip(), SUMMARY_MAX_TOKENS)
+            self.session.summarized_lines = summarized_lines
+        summary_stats["updates"] += 1
+        summary_stats["lines_folded"] += older_lines.count('\n') + 1
+
+    def wait_for_summary(self, timeout: Optional[float] = None):
+        """Block until the summary update in flight (if any) has finished."""
+        if self._summary_job is not None:
+            self._summary_job.result(timeout)
+
+    def _speculate(self, message: str, risk: str, prompt: str) -> Tuple[str, Optional[str], bool]:
+        """
+        Generate the scammer reply while the secondary detectors run.
+
+        Returns (final risk, reply, fallback). The reply is only read once
+        the detectors have cleared the message; on HIGH (or a detector
+        error) the generation is cancelled, which aborts the Ollama request,
+        and no reply is returned. If the LLM is unavailable the reply is a
+        templated fallback.
+        """
+        cancel = threading.Event()
+        generation = _speculation_pool.submit(call_ollama, prompt, cancel, "scammer_turn", self.session_id)
+        speculation_stats["started"] += 1
+        try:
+            risk = detect_secondary_risk(message, risk)
+        except Exception:
+            cancel.set()
+            speculation_stats["cancelled"] += 1
+            raise
+
+        if risk == "HIGH":
+            cancel.set()
+            speculation_stats["cancelled"] += 1
+            return risk, None, False
+
+        speculation_stats["used"] += 1
+        try:
+            return risk, generation.result(), False
+        except LLMUnavailable:
+            return risk, self._fallback_scammer_message(), True
+
     def start_simulation(self) -> dict:
         """
         Generate the first scammer message to start the simulation.
@@ -58,17 +302,25 @@ class SimulationController:
             }
         
         # Generate initial scammer message
-        initial_message = call_ollama(self.initial_prompt)
+        fallback = False
+        try:
+            initial_message = call_ollama(self.initial_prompt, profile="opening", user=self.session_id)
+        except LLMUnavailable:
+            initial_message = self._fallback_scammer_message()
+            fallback = True
         
         # Add to history
         self.session.add_message("Scammer", initial_message)
+        self.risk_tracker.observe_scammer(initial_message)
+        self.escalation.observe_scammer()
         
         return {
             "mode": "SIMULATOR",
             "risk": "LOW",
             "message": initial_message,
             "persona": self.persona,
-            "scenario": self.scenario
+            "scenario": self.scenario,
+            "fallback": fallback
         }
 
     def user_message(self, message: str) -> dict:
@@ -79,9 +331,11 @@ class SimulationController:
         1. Check if simulation ended -> return ended state
         2. Add user message to history
         3. Check if mentor active -> block new messages
-        4. Detect risk level
+        4. Detect risk level (message alone, then conversation context)
         5. If HIGH risk -> trigger mentor, DO NOT call scammer LLM
-        6. If LOW/MEDIUM -> call scammer LLM
+        6. If LOW/MEDIUM -> call scammer LLM; with slow secondary detectors
+           the call starts speculatively alongside them and is cancelled
+           if they escalate to HIGH
         """
 
         # If simulation ended, nothing to do
@@ -103,47 +357,79 @@ class SimulationController:
             }
 
         # === CRITICAL: RISK DETECTION BEFORE LLM CALL ===
-        risk = detect_risk(message, self.scenario)
+        # Fast pass: rules and conversation context
+        risk = detect_risk(message, self.scenario, secondary=False)
+        risk = self.risk_tracker.observe_user(message, risk)
+        # Compliance moves the scammer to the next step, hesitation holds it
+        self.escalation.observe_user(risk)
+        fast_risk = risk
+
+        # Slow pass: secondary detectors, with the scammer reply speculated alongside
+        scam_reply = None
+        fallback = False
+        if risk != "HIGH" and has_secondary_detectors():
+            if SPECULATIVE_GENERATION:
+                prompt, usage = self._build_turn_prompt()
+                risk, scam_reply, fallback = self._speculate(message, risk, prompt)
+                # A cancelled speculation never reached the scammer; its prompt is not counted
+                if risk != "HIGH":
+                    self._record_prompt(usage)
+            else:
+                risk = detect_secondary_risk(message, risk)
+            # The speculative prompt was built at the fast-pass stage. A secondary
+            # HIGH cancels it before it is sent, and a secondary MEDIUM only holds
+            # the stage, so the change takes effect from the next scammer turn on
+            if risk != fast_risk:
+                self.escalation.observe_user(risk)
 
         # HIGH RISK → Mentor takes over, NO scammer LLM call
         if risk == "HIGH":
             self.session.pause_for_mentor()
             
             # Get persona-aware mentor explanation
-            mentor_text = run_mentor(
-                last_scammer_message=self._get_last_scammer_message(),
-                user_risky_reply=message,
-                persona=self.persona,
-                age=self.age,
-                scenario=self.scenario
-            )
+            try:
+                mentor_text = run_mentor(
+                    last_scammer_message=self._get_last_scammer_message(),
+                    user_risky_reply=message,
+                    persona=self.persona,
+                    age=self.age,
+                    scenario=self.scenario,
+                    user=self.session_id
+                )
+            except LLMUnavailable:
+                fallback_stats["mentor"] += 1
+                mentor_text = build_fallback_mentor_text(message, self.persona, self.scenario)
+                fallback = True
             
             return {
                 "mode": "MENTOR",
                 "risk": risk,
                 "message": mentor_text,
-                "quick_tip": get_quick_tip(self.persona, self.scenario)
+                "quick_tip": get_quick_tip(self.persona, self.scenario),
+                "fallback": fallback
             }
 
         # LOW / MEDIUM → Continue simulation with scammer LLM
-        full_prompt = f"""
-{self.sim_prompt}
-
-Conversation so far (last 5 exchanges):
-{self._get_limited_history(5)}
-
-Scammer:
-"""
-
-        scam_reply = call_ollama(full_prompt)
+        if scam_reply is None:
+            prompt, usage = self._build_turn_prompt()
+            self._record_prompt(usage)
+            try:
+                scam_reply = call_ollama(prompt, profile="scammer_turn", user=self.session_id)
+            except LLMUnavailable:
+                scam_reply = self._fallback_scammer_message()
+                fallback = True
 
         # Add scam reply to history
         self.session.add_message("Scammer", scam_reply)
+        self.risk_tracker.observe_scammer(scam_reply)
+        self.escalation.observe_scammer()
+        self._schedule_summary()
 
         return {
             "mode": "SIMULATOR",
             "risk": risk,
-            "message": scam_reply
+            "message": scam_reply,
+            "fallback": fallback
         }
 
     def continue_simulation(self) -> dict:
@@ -170,6 +456,9 @@ Scammer:
         Ends the current simulation.
         """
         self.session.reset()
+        self.risk_tracker.reset()
+        self.escalation.reset()
+        self._dropped_lines = 0
         return {
             "mode": "ENDED",
             "message": "Simulation reset. Please choose a new scenario."
@@ -182,5 +471,9 @@ Scammer:
             "age": self.age,
             "scenario": self.scenario,
             "state": self.session.state.value,
-            "message_count": len([l for l in self.session.history.split('\n') if l.strip()])
+            "message_count": len([l for l in self.session.history.split('\n') if l.strip()]),
+            "prompt_tokens": self.last_prompt_tokens,
+            "summarized_messages": self.session.summarized_lines,
+            "risk_context": self.risk_tracker.snapshot(),
+            "escalation": self.escalation.snapshot()
         }
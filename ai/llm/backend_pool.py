@@ -0,0 +1,174 @@
+"""
+Pool of LLM backends with least-loaded routing.
+
+OLLAMA_URL may list several endpoints, comma separated. Each one is an
+Ollama server, or an OpenAI-compatible completions server (vLLM,
+llama.cpp, LM Studio) when prefixed with "openai+":
+
+    OLLAMA_URL=http://gpu1:11434,http://gpu2:11434,openai+http://gpu3:8000
+
+Every call goes to the healthy backend with the lowest expected wait,
+(in-flight requests + 1) x recent latency, so a slow or busy box gets
+proportionally less traffic. A backend is ejected after
+LLM_BACKEND_MAX_FAILURES consecutive errors and readmitted once a health
+check (check_health, run on an interval by the server) reaches it again.
+If every backend is ejected, calls are still attempted on all of them
+rather than failing outright.
+"""
+
+import os
+import threading
+import time
+from typing import Iterable, List, Optional
+
+import requests
+
+OLLAMA_API = "ollama"
+OPENAI_API = "openai"
+
+# Readiness endpoint per API flavour
+HEALTH_PATHS = {OLLAMA_API: "/api/tags", OPENAI_API: "/v1/models"}
+
+
+class LLMBackend:
+    """One endpoint and its live load and health figures."""
+
+    def __init__(self, url: str, api: str = OLLAMA_API):
+        self.url = url.rstrip("/")
+        self.api = api
+        self.in_flight = 0
+        self.latency_ewma: Optional[float] = None
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.healthy = True
+        self.ejected_at: Optional[float] = None
+        self.last_used = 0.0  # time.monotonic() of the last routed call
+
+    @classmethod
+    def parse(cls, spec: str) -> "LLMBackend":
+        """Build a backend from an OLLAMA_URL entry ("url" or "openai+url")."""
+        spec = spec.strip()
+        if spec.startswith(f"{OPENAI_API}+"):
+            return cls(spec[len(OPENAI_API) + 1:], OPENAI_API)
+        return cls(spec, OLLAMA_API)
+
+    def expected_wait(self) -> float:
+        """Seconds a new request would wait here; 0 until a latency is known."""
+        return (self.in_flight + 1) * (self.latency_ewma or 0.0)
+
+    def get_stats(self) -> dict:
+        return {
+            "url": self.url,
+            "api": self.api,
+            "healthy": self.healthy,
+            "in_flight": self.in_flight,
+            "latency_ms": round(self.latency_ewma * 1000, 1) if self.latency_ewma is not None else None,
+            "requests": self.requests,
+            "errors": self.errors,
+        }
+
+
+class BackendPool:
+    """Least-loaded router over a fixed set of LLM backends."""
+
+    def __init__(
+        self,
+        backends: Iterable,
+        max_failures: int = 3,
+        latency_alpha: float = 0.3,
+        health_timeout: float = 2.0
+    ):
+        self.backends: List[LLMBackend] = [
+            b if isinstance(b, LLMBackend) else LLMBackend.parse(b) for b in backends
+        ]
+        if not self.backends:
+            raise ValueError("BackendPool needs at least one backend")
+        self.max_failures = max_failures
+        self.latency_alpha = latency_alpha
+        self.health_timeout = health_timeout
+        self._lock = threading.Lock()
+        self.stats = {"failovers": 0, "ejections": 0, "readmissions": 0}
+
+    @classmethod
+    def from_env(cls) -> "BackendPool":
+        urls = os.getenv("OLLAMA_URL", "http://localhost:11434")
+        return cls(
+            [url for url in urls.split(",") if url.strip()],
+            max_failures=int(os.getenv("LLM_BACKEND_MAX_FAILURES", "3")),
+        )
+
+    def acquire(self, exclude: Iterable[LLMBackend] = ()) -> LLMBackend:
+        """
+        Reserve the least-loaded healthy backend not in `exclude`.
+        Every acquire must be paired with a release.
+        """
+        with self._lock:
+            candidates = [b for b in self.backends if b not in exclude] or self.backends
+            healthy = [b for b in candidates if b.healthy]
+            backend = min(healthy or candidates, key=lambda b: (b.expected_wait(), b.in_flight))
+            backend.in_flight += 1
+            backend.requests += 1
+            backend.last_used = time.monotonic()
+            if exclude:
+                self.stats["failovers"] += 1
+            return backend
+
+    def release(self, backend: LLMBackend, elapsed: Optional[float] = None, ok: bool = True):
+        """
+        Return a backend after a call. `elapsed` (seconds) feeds its latency
+        average; pass None for calls that did not run to completion.
+        """
+        with self._lock:
+            backend.in_flight -= 1
+            if not ok:
+                backend.errors += 1
+                backend.consecutive_failures += 1
+                if backend.healthy and backend.consecutive_failures >= self.max_failures:
+                    self._eject(backend)
+                return
+            backend.consecutive_failures = 0
+            if elapsed is not None:
+                if backend.latency_ewma is None:
+                    backend.latency_ewma = elapsed
+                else:
+                    backend.latency_ewma += self.latency_alpha * (elapsed - backend.latency_ewma)
+
+    def _eject(self, backend: LLMBackend):
+        backend.healthy = False
+        backend.ejected_at = time.time()
+        self.stats["ejections"] += 1
+        print(f"LLM BACKEND EJECTED: {backend.url}")
+
+    def _probe(self, backend: LLMBackend) -> bool:
+        try:
+            response = requests.get(backend.url + HEALTH_PATHS[backend.api], timeout=self.health_timeout)
+            return response.status_code == 200
+        except requests.RequestException:
+            return False
+
+    def check_health(self) -> dict:
+        """
+        Probe every backend once: eject the ones that fail, readmit the
+        ones that answer again. Blocking; run it off the event loop.
+        """
+        for backend in self.backends:
+            alive = self._probe(backend)
+            with self._lock:
+                if alive and not backend.healthy:
+                    backend.healthy = True
+                    backend.ejected_at = None
+                    backend.consecutive_failures = 0
+                    self.stats["readmissions"] += 1
+                    print(f"LLM BACKEND READMITTED: {backend.url}")
+                elif not alive and backend.healthy:
+                    self._eject(backend)
+        return {backend.url: backend.healthy for backend in self.backends}
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                **self.stats,
+                "healthy": sum(b.healthy for b in self.backends),
+                "backends": [b.get_stats() for b in self.backends],
+            }
@@ -0,0 +1,216 @@
+"""
+Record/replay cassette for LLM calls.
+
+In record mode every generation that call_ollama gets from a backend is
+appended to the cassette file with its latency. In replay mode
+call_ollama answers from the cassette and never touches the network, so
+full conversation flows (SimulationController, run_mentor,
+run_simulator) run offline and reproducibly in CI and perf suites.
+
+Requests are keyed by the hash of the full request (model, prompt and
+generation options), so replay is independent of which backend recorded
+it. A prompt recorded several times replays its responses in order and
+then wraps around. Calls that raised LLMUnavailable are recorded too
+(response null) and raise it again on replay, so templated fallbacks
+replay as well. Replayed latency is the recorded latency (as seen by the
+caller, queueing included) times latency_scale; 0 replays instantly.
+
+The file is JSON lines, gzip-compressed when the path ends in .gz:
+    {"k": request hash, "p": profile, "r": response or null, "ms": latency}
+
+Configure with LLM_CASSETTE (path), LLM_CASSETTE_MODE (record|replay) and
+LLM_CASSETTE_LATENCY_SCALE.
+
+Usage:
+    python -m ai.llm.cassette info flows.jsonl.gz
+    python -m ai.llm.cassette flows flows.jsonl.gz --mode record --sessions 20
+    python -m ai.llm.cassette flows flows.jsonl.gz --mode replay --latency-scale 1
+"""
+
+import argparse
+import gzip
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode for a request the cassette never recorded."""
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class Cassette:
+    """Request -> response recordings for one cassette file."""
+
+    def __init__(self, path: str, mode: str = REPLAY, latency_scale: float = 0.0):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._records: Dict[str, List[dict]] = defaultdict(list)
+        self._next: Dict[str, int] = defaultdict(int)
+        self.stats = {"recorded": 0, "replayed": 0, "misses": 0}
+        if os.path.exists(path):
+            with _open(path, "r") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self._records[record["k"]].append(record)
+
+    @classmethod
+    def from_env(cls) -> Optional["Cassette"]:
+        path = os.getenv("LLM_CASSETTE")
+        if not path:
+            return None
+        return cls(
+            path,
+            mode=os.getenv("LLM_CASSETTE_MODE", REPLAY),
+            latency_scale=float(os.getenv("LLM_CASSETTE_LATENCY_SCALE", "0")),
+        )
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    def record(self, key: str, profile: Optional[str], response: Optional[str], elapsed_ms: float):
+        record = {"k": key, "p": profile, "r": response, "ms": round(elapsed_ms, 1)}
+        with self._lock:
+            self._records[key].append(record)
+            # Appending keeps earlier recordings; gzip files become multi-member, which gzip reads back fine
+            with _open(self.path, "a") as f:
+                f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+            self.stats["recorded"] += 1
+
+    def replay(self, key: str, cancel_event: Optional[threading.Event] = None) -> Optional[str]:
+        """
+        The next recorded response for `key` (None for a recorded
+        LLMUnavailable), after its scaled latency. Setting `cancel_event`
+        cuts the wait short; a cancelled replay does not use up its
+        recording, just as a cancelled generation was never recorded.
+        """
+        with self._lock:
+            records = self._records.get(key)
+            if not records:
+                self.stats["misses"] += 1
+                raise CassetteMiss(f"no recording for request {key[:12]}")
+            record = records[self._next[key] % len(records)]
+
+        delay = record["ms"] / 1000 * self.latency_scale
+        if cancel_event is not None:
+            if cancel_event.wait(delay):
+                return None
+        elif delay > 0:
+            time.sleep(delay)
+
+        with self._lock:
+            self._next[key] += 1
+            self.stats["replayed"] += 1
+        return record["r"]
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                **self.stats,
+                "path": self.path,
+                "mode": self.mode,
+                "requests": len(self._records),
+                "responses": sum(len(r) for r in self._records.values()),
+            }
+
+    def summary(self) -> dict:
+        """Responses and recorded latency per profile."""
+        profiles: Dict[str, dict] = {}
+        with self._lock:
+            for records in self._records.values():
+                for record in records:
+                    row = profiles.setdefault(record["p"] or "none", {"responses": 0, "total_ms": 0.0})
+                    row["responses"] += 1
+                    row["total_ms"] += record["ms"]
+        for row in profiles.values():
+            row["mean_ms"] = round(row.pop("total_ms") / row["responses"], 1)
+        return profiles
+
+
+# ================================================
+# CONVERSATION FLOWS
+# ================================================
+
+def run_conversation_flows(sessions: int = 10, seed: int = 1) -> dict:
+    """
+    Drive SimulationController through start -> messages -> (mentor ->
+    continue) for every persona/scenario pair, with trainee replies drawn
+    deterministically from the risk corpus. Returns timings and a digest
+    of every response, which is identical across replays of one cassette.
+    """
+    import hashlib
+    import random
+
+    from ai.controller.simulation_controller import SimulationController
+    from ai.prompts.personas import PERSONAS
+    from ai.prompts.scenarios import SCENARIOS
+    from ai.risk_detection.corpus import generate_corpus
+
+    rng = random.Random(seed)
+    replies = [message for message, _ in generate_corpus(200, seed=seed)]
+    pairs = [(persona, scenario) for persona in PERSONAS for scenario in SCENARIOS]
+    digest = hashlib.sha256()
+    turns = 0
+    started = time.perf_counter()
+    for i in range(sessions):
+        persona, scenario = pairs[i % len(pairs)]
+        controller = SimulationController(persona, 30, scenario, session_id=f"flow-{i}")
+        results = [controller.start_simulation()]
+        for _ in range(4):
+            result = controller.user_message(rng.choice(replies))
+            # Summaries feed later prompts; finishing them here keeps the prompts replayable
+            controller.wait_for_summary()
+            results.append(result)
+            if result["mode"] == "MENTOR":
+                results.append(controller.continue_simulation())
+        for result in results:
+            digest.update(json.dumps(result, sort_keys=True).encode("utf-8"))
+        turns += len(results)
+    elapsed = time.perf_counter() - started
+    return {"sessions": sessions, "turns": turns, "seconds": round(elapsed, 3), "digest": digest.hexdigest()}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Inspect LLM cassettes and run conversation flows against them.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    info = commands.add_parser("info", help="Summarize a cassette")
+    info.add_argument("path")
+    flows = commands.add_parser("flows", help="Run conversation flows, recording or replaying a cassette")
+    flows.add_argument("path")
+    flows.add_argument("--mode", choices=[RECORD, REPLAY], default=REPLAY)
+    flows.add_argument("--sessions", type=int, default=10)
+    flows.add_argument("--seed", type=int, default=1)
+    flows.add_argument("--latency-scale", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    if args.command == "info":
+        cassette = Cassette(args.path)
+        print(json.dumps({**cassette.get_stats(), "profiles": cassette.summary()}, indent=2))
+        return
+
+    from ai.llm import ollama_client
+
+    ollama_client.llm_cassette = Cassette(args.path, args.mode, args.latency_scale)
+    report = run_conversation_flows(args.sessions, args.seed)
+    print(json.dumps({**report, "cassette": ollama_client.llm_cassette.get_stats()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Circuit breaker around LLM calls.
+
+After LLM_BREAKER_FAILURES consecutive failed or over-budget calls the
+circuit opens and call_ollama fails immediately (LLMUnavailable), so the
+controller can answer from templated fallbacks in milliseconds instead of
+every trainee waiting out a dead or overloaded Ollama. After
+LLM_BREAKER_RESET_SECONDS one trial call is let through (half-open); its
+success closes the circuit, its failure opens it again.
+"""
+
+import os
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a single half-open trial call."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._trial_running = False
+        self.stats = {"calls": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    @classmethod
+    def from_env(cls) -> "CircuitBreaker":
+        return cls(
+            failure_threshold=int(os.getenv("LLM_BREAKER_FAILURES", "5")),
+            reset_timeout=float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30")),
+        )
+
+    def allow(self) -> bool:
+        """Whether a call may go to the backends now."""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._trial_running = False
+            if self.state == CLOSED or (self.state == HALF_OPEN and not self._trial_running):
+                self._trial_running = self.state == HALF_OPEN
+                self.stats["calls"] += 1
+                return True
+            self.stats["rejected"] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            self._trial_running = False
+            if self.state != CLOSED:
+                self.state = CLOSED
+                print("LLM CIRCUIT CLOSED")
+
+    def record_failure(self):
+        with self._lock:
+            self.stats["failures"] += 1
+            self.consecutive_failures += 1
+            self._trial_running = False
+            if self.state == HALF_OPEN or (
+                self.state == CLOSED and self.consecutive_failures >= self.failure_threshold
+            ):
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self.stats["opened"] += 1
+                print(f"LLM CIRCUIT OPEN: {self.consecutive_failures} consecutive failures")
+
+    def record_ignored(self):
+        """A call that ended without telling us anything (cancelled, client error)."""
+        with self._lock:
+            self._trial_running = False
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {**self.stats, "state": self.state, "consecutive_failures": self.consecutive_failures}
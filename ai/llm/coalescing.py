@@ -0,0 +1,78 @@
+"""
+In-flight request coalescing ("singleflight") for LLM calls.
+
+Opening prompts and mentor prompts for common replies are byte-identical
+across trainees, so a classroom starting 40 sessions at once would fire
+40 identical generations. Concurrent calls with the same key share one
+in-flight generation instead: the first caller runs it, the rest wait for
+its result (or its exception). Nothing is cached once the generation
+finishes, so later calls still get a fresh sample.
+"""
+
+import hashlib
+import json
+import threading
+from typing import Callable, Dict
+
+
+class _Flight:
+    __slots__ = ("result", "error", "event", "waiters")
+
+    def __init__(self):
+        self.result = None
+        self.error = None
+        self.event = threading.Event()
+        self.waiters = 0
+
+
+def request_key(payload: dict) -> str:
+    """Stable hash of a full request body."""
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class Coalescer:
+    """Shares one call among concurrent callers with the same key."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self.stats = {"requests": 0, "generations": 0, "coalesced": 0}
+
+    def do(self, key: str, fn: Callable[[], str]) -> str:
+        with self._lock:
+            self.stats["requests"] += 1
+            flight = self._flights.get(key)
+            lead = flight is None
+            if lead:
+                flight = self._flights[key] = _Flight()
+                self.stats["generations"] += 1
+            else:
+                flight.waiters += 1
+                self.stats["coalesced"] += 1
+
+        if not lead:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            # Later callers start a new generation; waiters read this flight
+            with self._lock:
+                del self._flights[key]
+            flight.event.set()
+        return flight.result
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            requests = self.stats["requests"]
+            return {
+                **self.stats,
+                "in_flight": len(self._flights),
+                "dedup_ratio": round(self.stats["coalesced"] / requests, 4) if requests else 0.0,
+            }
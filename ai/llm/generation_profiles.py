@@ -0,0 +1,192 @@
+"""
+Named generation profiles for Ollama calls.
+
+Each call site asks for a profile instead of sending a bare prompt, so the
+scammer turn (1-3 sentences per BASE_SIMULATOR_PROMPT) is capped and stops
+before it starts writing the trainee's next line, while the mentor still
+gets room for a full explanation.
+
+Profiles with "coalesce" let concurrent byte-identical requests share one
+generation (see coalescing.py); scammer turns keep their own samples so
+trainees in the same scenario do not all get the same line. "priority" is
+the scheduler class the call queues in (see scheduler.py), and
+"timeout_seconds" the latency budget for queueing plus generation, after
+which the caller falls back to a templated reply. "history_tokens" is the
+budget for conversation history packed into the prompt (see tokens.py).
+
+All profiles share one context size: Ollama reloads the model whenever
+num_ctx changes between requests, which would cost far more than it saves.
+
+Usage (tokens and wall time per call type against the stub server):
+    python -m ai.llm.generation_profiles --calls 20
+"""
+
+import argparse
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+OLLAMA_NUM_CTX = int(os.getenv("OLLAMA_NUM_CTX", "4096"))
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+
+# A model continuing the transcript writes the other side's turn next
+DIALOGUE_STOPS = ["\nUser:", "\nScammer:", "User:"]
+
+GENERATION_PROFILES = {
+    "scammer_turn": {
+        "description": "One in-character scammer reply (1-3 sentences)",
+        "num_predict": 96,
+        "stop": DIALOGUE_STOPS,
+        "temperature": 0.8,
+        "coalesce": False,
+        "priority": "interactive",
+        "timeout_seconds": 12,
+        "history_tokens": 1024,
+    },
+    "opening": {
+        "description": "The first scam message of a simulation",
+        "num_predict": 80,
+        "stop": DIALOGUE_STOPS,
+        "temperature": 0.9,
+        "coalesce": True,
+        "priority": "interactive",
+        "timeout_seconds": 12,
+    },
+    "mentor": {
+        "description": "Mentor explanation after a risky reply",
+        "num_predict": 400,
+        "stop": ["\nUser:", "\nScammer:"],
+        "temperature": 0.4,
+        "coalesce": True,
+        "priority": "mentor",
+        "timeout_seconds": 25,
+    },
+    "summary": {
+        "description": "Rolling summary of turns older than the history window",
+        "num_predict": 160,
+        "stop": ["\nUser:", "\nScammer:"],
+        "temperature": 0.2,
+        "coalesce": False,
+        "priority": "background",
+        "timeout_seconds": 60,
+    },
+}
+
+
+def keep_alive_seconds(keep_alive) -> Optional[float]:
+    """Seconds an Ollama keep_alive value ("30m", "1h", 300, "-1") keeps a model loaded; None is forever."""
+    value = str(keep_alive).strip().lower()
+    units = {"s": 1, "m": 60, "h": 3600}
+    seconds = float(value[:-1]) * units[value[-1]] if value[-1:] in units else float(value)
+    return None if seconds < 0 else seconds
+
+
+def get_generation_profile(profile_key: str) -> dict:
+    """Get a generation profile by key, defaulting to 'scammer_turn'."""
+    return GENERATION_PROFILES.get(profile_key, GENERATION_PROFILES["scammer_turn"])
+
+
+def build_generation_options(profile_key: str) -> Tuple[dict, str]:
+    """Ollama `options` and `keep_alive` for a profile."""
+    profile = get_generation_profile(profile_key)
+    options = {
+        "num_predict": profile["num_predict"],
+        "stop": list(profile["stop"]),
+        "temperature": profile["temperature"],
+        "num_ctx": OLLAMA_NUM_CTX,
+    }
+    return options, profile.get("keep_alive", OLLAMA_KEEP_ALIVE)
+
+
+# ================================================
+# BENCHMARK
+# ================================================
+
+def _turn_prompts() -> Dict[str, List[str]]:
+    """Representative prompts for each profile, built the way the controller does."""
+    from ai.mentor_engine.mentor_engine import build_mentor_prompt
+    from ai.prompts.personas import PERSONAS
+    from ai.prompts.prompt_builder import build_initial_message_prompt, build_simulator_prompt
+    from ai.prompts.scenarios import SCENARIOS
+
+    prompts: Dict[str, List[str]] = {"opening": [], "scammer_turn": [], "mentor": []}
+    for persona in PERSONAS:
+        for scenario in SCENARIOS:
+            prompts["opening"].append(build_initial_message_prompt(persona, 30, scenario))
+            prompts["scammer_turn"].append(
+                f"{build_simulator_prompt(persona, 30, scenario)}\n"
+                f"Conversation so far:\nUser: who is this?\n\nScammer:\n"
+            )
+            prompts["mentor"].append(build_mentor_prompt(persona, 30, scenario))
+    return prompts
+
+
+def run_profile_benchmark(
+    calls: int = 20,
+    latency_ms: float = 100.0,
+    tokens_per_sec: float = 200.0,
+    unconstrained_tokens: int = 500
+) -> Dict[str, dict]:
+    """
+    Tokens generated and wall time per call type, with and without profiles,
+    against a stub whose unconstrained role-play replies run on into fake
+    dialogue.
+
+    Returns:
+        {profile: {"none": {tokens_per_call, ms_per_call, dialogue_leaks}, "profile": {...}}}
+    """
+    from ai.llm import ollama_client
+    from ai.llm.backend_pool import BackendPool
+    from ai.llm.stub_ollama import StubOllamaConfig, StubOllamaServer
+
+    server = StubOllamaServer(config=StubOllamaConfig(
+        latency_ms, tokens_per_sec, default_tokens=unconstrained_tokens, continue_dialogue=True
+    )).start()
+    previous_pool = ollama_client.llm_pool
+    ollama_client.llm_pool = BackendPool([server.url])
+    report = {}
+    try:
+        for profile, prompts in _turn_prompts().items():
+            # Only the role-play turns tend to run on into the next speaker's line
+            server.config.continue_dialogue = profile != "mentor"
+            report[profile] = {}
+            for mode, profile_key in (("none", None), ("profile", profile)):
+                tokens_before = server.stats["tokens_generated"]
+                leaks = 0
+                started = time.perf_counter()
+                for i in range(calls):
+                    reply = ollama_client.call_ollama(prompts[i % len(prompts)], profile=profile_key)
+                    leaks += "User:" in reply
+                elapsed = time.perf_counter() - started
+                report[profile][mode] = {
+                    "tokens_per_call": round((server.stats["tokens_generated"] - tokens_before) / calls, 1),
+                    "ms_per_call": round(elapsed / calls * 1000, 1),
+                    "dialogue_leaks": leaks,
+                }
+    finally:
+        ollama_client.llm_pool = previous_pool
+        server.stop()
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark generation profiles against the stub Ollama server.")
+    parser.add_argument("--calls", type=int, default=20, help="Calls per profile and mode")
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--tokens-per-sec", type=float, default=200.0)
+    parser.add_argument("--unconstrained-tokens", type=int, default=500, help="Reply length with no num_predict")
+    args = parser.parse_args(argv)
+
+    report = run_profile_benchmark(args.calls, args.latency_ms, args.tokens_per_sec, args.unconstrained_tokens)
+    print(f"{'PROFILE':<14}{'TOKENS none/profile':>22}{'MS none/profile':>20}{'LEAKS none/profile':>22}")
+    for profile, row in report.items():
+        none, tuned = row["none"], row["profile"]
+        print(
+            f"{profile:<14}{none['tokens_per_call']:>12}/{tuned['tokens_per_call']:<9}"
+            f"{none['ms_per_call']:>11}/{tuned['ms_per_call']:<8}"
+            f"{none['dialogue_leaks']:>13}/{tuned['dialogue_leaks']:<8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,291 @@
+import json
+import os
+import threading
+import time
+from typing import Optional, Tuple
+
 import requests
 
-OLLAMA_URL = "http://localhost:11434/api/generate"
-MODEL_NAME = "mistral"
+from ai.llm.backend_pool import OPENAI_API, BackendPool, LLMBackend
+from ai.llm.cassette import Cassette
+from ai.llm.circuit_breaker import CircuitBreaker
+from ai.llm.coalescing import Coalescer, request_key
+from ai.llm.generation_profiles import build_generation_options, get_generation_profile
+from ai.llm.scheduler import DEFAULT_PRIORITY, LLMScheduler
+
+MODEL_NAME = os.getenv("OLLAMA_MODEL", "mistral")
+
+# Every endpoint listed in OLLAMA_URL (see backend_pool.py)
+llm_pool = BackendPool.from_env()
+
+# Priority classes and a concurrency limit matched to the backends' slots
+llm_scheduler = LLMScheduler.from_env(len(llm_pool.backends))
+
+# Share identical concurrent generations for profiles with "coalesce"
+LLM_COALESCING = os.getenv("LLM_COALESCING", "true").lower() == "true"
+llm_coalescer = Coalescer()
+
+# Fail fast once the backends keep failing (see circuit_breaker.py)
+llm_breaker = CircuitBreaker.from_env()
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "2"))
+LLM_DEFAULT_TIMEOUT = 30.0
+
+# Record or replay generations (see cassette.py); None talks to the backends
+llm_cassette = Cassette.from_env()
+
+
+class GenerationCancelled(Exception):
+    """Raised by call_ollama when its cancel_event is set mid-generation."""
+
+
+class LLMUnavailable(Exception):
+    """
+    Raised by call_ollama when no reply can be had within the profile's
+    latency budget: the circuit is open, every backend failed, or the
+    queue wait or generation ran over. Callers answer from a fallback.
+    """
+
+
+def _payload(prompt: str, stream: bool, profile: Optional[str]) -> dict:
+    payload = {
+        "model": MODEL_NAME,
+        "prompt": prompt,
+        "stream": stream
+    }
+    if profile is not None:
+        payload["options"], payload["keep_alive"] = build_generation_options(profile)
+    return payload
 
 
-def call_ollama(prompt: str) -> str:
+def _openai_payload(prompt: str, stream: bool, profile: Optional[str]) -> dict:
     payload = {
         "model": MODEL_NAME,
         "prompt": prompt,
-        "stream": False
+        "stream": stream
     }
+    if profile is not None:
+        options, _ = build_generation_options(profile)
+        payload["max_tokens"] = options["num_predict"]
+        payload["stop"] = options["stop"]
+        payload["temperature"] = options["temperature"]
+    return payload
+
+
+def _request(backend: LLMBackend, prompt: str, stream: bool, profile: Optional[str]) -> Tuple[str, dict]:
+    """Endpoint URL and body for a backend's API flavour."""
+    if backend.api == OPENAI_API:
+        return f"{backend.url}/v1/completions", _openai_payload(prompt, stream, profile)
+    return f"{backend.url}/api/generate", _payload(prompt, stream, profile)
+
+
+def _is_backend_failure(error: Exception) -> bool:
+    """Errors worth retrying on another backend (unreachable or 5xx)."""
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    return (
+        isinstance(error, requests.HTTPError)
+        and error.response is not None
+        and error.response.status_code >= 500
+    )
+
+
+def call_ollama(
+    prompt: str,
+    cancel_event: Optional[threading.Event] = None,
+    profile: Optional[str] = None,
+    user: Optional[str] = None
+) -> str:
+    """
+    Generate a completion for `prompt` on the least-loaded backend in
+    llm_pool, failing over to the next one if a backend is unreachable or
+    returns a server error.
+
+    The call first waits for a slot in llm_scheduler, in the profile's
+    priority class; `user` (the session) is the key for fair queuing
+    within that class.
 
-    response = requests.post(OLLAMA_URL, json=payload)
+    `profile` names a generation profile (see generation_profiles.py) that
+    caps length, sets stop sequences and sampling; None sends Ollama's
+    defaults.
+
+    With a `cancel_event` the reply is streamed, and setting the event
+    closes the connection at the next token, which makes Ollama stop
+    generating; GenerationCancelled is raised instead of returning text.
+
+    Calls without a `cancel_event` whose profile has "coalesce" share one
+    generation with concurrent identical requests.
+
+    Raises LLMUnavailable when the circuit is open or the call cannot
+    finish within the profile's "timeout_seconds".
+
+    With llm_cassette set, calls are recorded to it or replayed from it.
+    """
+    if llm_cassette is None:
+        return _generate(prompt, cancel_event, profile, user)
+
+    key = request_key(_payload(prompt, False, profile))
+    if llm_cassette.replaying:
+        reply = llm_cassette.replay(key, cancel_event)
+        if cancel_event is not None and cancel_event.is_set():
+            raise GenerationCancelled()
+        if reply is None:
+            raise LLMUnavailable("LLM unavailable when the cassette was recorded")
+        return reply
+
+    started = time.perf_counter()
+    try:
+        reply = _generate(prompt, cancel_event, profile, user)
+    except LLMUnavailable:
+        llm_cassette.record(key, profile, None, (time.perf_counter() - started) * 1000)
+        raise
+    llm_cassette.record(key, profile, reply, (time.perf_counter() - started) * 1000)
+    return reply
+
+
+def _generate(
+    prompt: str,
+    cancel_event: Optional[threading.Event],
+    profile: Optional[str],
+    user: Optional[str]
+) -> str:
+    """call_ollama without the cassette."""
+    if (
+        LLM_COALESCING
+        and cancel_event is None
+        and profile is not None
+        and get_generation_profile(profile).get("coalesce")
+    ):
+        key = request_key(_payload(prompt, False, profile))
+        return llm_coalescer.do(key, lambda: _scheduled(prompt, None, profile, user))
+    return _scheduled(prompt, cancel_event, profile, user)
+
+
+def _scheduled(
+    prompt: str,
+    cancel_event: Optional[threading.Event],
+    profile: Optional[str],
+    user: Optional[str]
+) -> str:
+    """One generation under the circuit breaker, the scheduler and the profile's latency budget."""
+    if not llm_breaker.allow():
+        raise LLMUnavailable("LLM circuit open")
+
+    generation_profile = get_generation_profile(profile)
+    priority = generation_profile.get("priority", DEFAULT_PRIORITY)
+    deadline = time.perf_counter() + generation_profile.get("timeout_seconds", LLM_DEFAULT_TIMEOUT)
+    try:
+        if not llm_scheduler.acquire(priority, user, cancel_event, timeout=deadline - time.perf_counter()):
+            if cancel_event is not None and cancel_event.is_set():
+                raise GenerationCancelled()
+            raise LLMUnavailable("LLM queue wait exceeded the latency budget")
+        try:
+            reply = _route(prompt, cancel_event, profile, deadline)
+        finally:
+            llm_scheduler.release(priority)
+    except LLMUnavailable:
+        llm_breaker.record_failure()
+        raise
+    except Exception:
+        llm_breaker.record_ignored()
+        raise
+
+    llm_breaker.record_success()
+    return reply
+
+
+def _route(
+    prompt: str,
+    cancel_event: Optional[threading.Event],
+    profile: Optional[str],
+    deadline: float
+) -> str:
+    """Run one generation on the pool, failing over between backends until the deadline."""
+    tried = []
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            raise LLMUnavailable("LLM call exceeded the latency budget")
+        backend = llm_pool.acquire(exclude=tried)
+        started = time.perf_counter()
+        timeout = (min(LLM_CONNECT_TIMEOUT, remaining), remaining)
+        try:
+            if cancel_event is not None:
+                reply = _call_ollama_cancellable(backend, prompt, cancel_event, profile, timeout, deadline)
+            else:
+                reply = _call_ollama(backend, prompt, profile, timeout)
+        except Exception as e:
+            if not _is_backend_failure(e):
+                llm_pool.release(backend)
+                raise
+            llm_pool.release(backend, ok=False)
+            tried.append(backend)
+            print(f"LLM BACKEND ERROR ({backend.url}): {str(e)}")
+            if len(tried) >= len(llm_pool.backends):
+                raise LLMUnavailable(f"all LLM backends failed: {str(e)}") from e
+            continue
+
+        llm_pool.release(backend, time.perf_counter() - started)
+        return reply
+
+
+def _call_ollama(
+    backend: LLMBackend,
+    prompt: str,
+    profile: Optional[str],
+    timeout: Tuple[float, float]
+) -> str:
+    url, payload = _request(backend, prompt, False, profile)
+    response = requests.post(url, json=payload, timeout=timeout)
     response.raise_for_status()
 
+    if backend.api == OPENAI_API:
+        return response.json()["choices"][0]["text"].strip()
     return response.json()["response"].strip()
+
+
+def _stream_text(backend: LLMBackend, line: bytes) -> Tuple[str, bool]:
+    """Text and done flag of one streamed line (NDJSON or OpenAI SSE)."""
+    if backend.api == OPENAI_API:
+        data = line[len(b"data:"):].strip() if line.startswith(b"data:") else b""
+        if not data:
+            return "", False
+        if data == b"[DONE]":
+            return "", True
+        choice = json.loads(data)["choices"][0]
+        return choice.get("text", ""), choice.get("finish_reason") is not None
+
+    chunk = json.loads(line)
+    return chunk.get("response", ""), bool(chunk.get("done"))
+
+
+def _call_ollama_cancellable(
+    backend: LLMBackend,
+    prompt: str,
+    cancel_event: threading.Event,
+    profile: Optional[str],
+    timeout: Tuple[float, float],
+    deadline: float
+) -> str:
+    if cancel_event.is_set():
+        raise GenerationCancelled()
+
+    parts = []
+    url, payload = _request(backend, prompt, True, profile)
+    # Leaving the with-block closes the connection, aborting the generation
+    with requests.post(url, json=payload, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if cancel_event.is_set():
+                raise GenerationCancelled()
+            if time.perf_counter() > deadline:
+                raise LLMUnavailable("LLM call exceeded the latency budget")
+            if not line:
+                continue
+            text, done = _stream_text(backend, line)
+            parts.append(text)
+            if done:
+                break
+
+    if cancel_event.is_set():
+        raise GenerationCancelled()
+    return "".join(parts).strip()
@@ -0,0 +1,170 @@
+"""
+Priority scheduler in front of the LLM backends.
+
+Every generation takes a slot before it is sent. The number of slots
+matches what the backends can actually run at once (OLLAMA_NUM_PARALLEL
+per backend, Ollama's own setting), so excess requests wait here, where
+they can be ordered, instead of in Ollama's FIFO queue.
+
+When a slot frees up it goes to the highest priority class with waiters:
+
+    mentor       the trainee is blocked on the HIGH-risk screen
+    interactive  scammer turns and openings
+    background   warmup, pre-generation, summaries
+
+Within a class, users (sessions) are served round-robin, so one session
+firing many requests cannot starve the others. Background work may hold
+at most LLM_BACKGROUND_SLOTS slots, leaving the rest free for
+interactive turns at all times.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Optional
+
+PRIORITY_CLASSES = ["mentor", "interactive", "background"]
+DEFAULT_PRIORITY = "interactive"
+
+
+class _Waiter:
+    __slots__ = ("event", "granted", "enqueued")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.granted = False
+        self.enqueued = time.perf_counter()
+
+
+class LLMScheduler:
+    """Global concurrency limit with priority classes and per-user fairness."""
+
+    def __init__(self, max_concurrency: int, background_slots: int = 1, wait_samples: int = 1000):
+        self.max_concurrency = max(1, max_concurrency)
+        self.background_slots = max(1, min(background_slots, self.max_concurrency))
+        self._lock = threading.Lock()
+        # Per class: user -> waiters; dict order is the round-robin order
+        self._queues: Dict[str, OrderedDict] = {name: OrderedDict() for name in PRIORITY_CLASSES}
+        self._running = {name: 0 for name in PRIORITY_CLASSES}
+        self._waits = {name: deque(maxlen=wait_samples) for name in PRIORITY_CLASSES}
+        self.stats = {
+            name: {"requests": 0, "queued": 0, "cancelled": 0, "timed_out": 0, "max_wait_ms": 0.0}
+            for name in PRIORITY_CLASSES
+        }
+
+    @classmethod
+    def from_env(cls, backends: int = 1) -> "LLMScheduler":
+        slots = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+        return cls(
+            int(os.getenv("LLM_MAX_CONCURRENCY", str(slots * backends))),
+            background_slots=int(os.getenv("LLM_BACKGROUND_SLOTS", "1")),
+        )
+
+    def acquire(
+        self,
+        priority: str = DEFAULT_PRIORITY,
+        user: Optional[str] = None,
+        cancel_event: Optional[threading.Event] = None,
+        timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Wait for a slot. Returns False (holding nothing) if `cancel_event`
+        is set or `timeout` seconds pass first; otherwise the caller must
+        release(priority).
+        """
+        if priority not in self._queues:
+            priority = DEFAULT_PRIORITY
+        waiter = _Waiter()
+        with self._lock:
+            self.stats[priority]["requests"] += 1
+            self._queues[priority].setdefault(user, deque()).append(waiter)
+            self._dispatch()
+            if waiter.granted:
+                return True
+            self.stats[priority]["queued"] += 1
+
+        deadline = None if timeout is None else waiter.enqueued + timeout
+        while True:
+            # Poll so a cancelled speculative request leaves the queue promptly
+            wait = 0.01 if cancel_event is not None else None
+            if deadline is not None:
+                remaining = max(0.0, deadline - time.perf_counter())
+                wait = remaining if wait is None else min(wait, remaining)
+            if waiter.event.wait(wait):
+                break
+            cancelled = cancel_event is not None and cancel_event.is_set()
+            if cancelled or (deadline is not None and time.perf_counter() >= deadline):
+                with self._lock:
+                    if not waiter.granted:
+                        self._remove(priority, user, waiter)
+                        self.stats[priority]["cancelled" if cancelled else "timed_out"] += 1
+                        return False
+                break
+        if cancel_event is not None and cancel_event.is_set():
+            self.release(priority)
+            return False
+        return True
+
+    def release(self, priority: str = DEFAULT_PRIORITY):
+        if priority not in self._queues:
+            priority = DEFAULT_PRIORITY
+        with self._lock:
+            self._running[priority] -= 1
+            self._dispatch()
+
+    def _has_room(self, priority: str) -> bool:
+        if sum(self._running.values()) >= self.max_concurrency:
+            return False
+        return priority != "background" or self._running["background"] < self.background_slots
+
+    def _dispatch(self):
+        """Grant free slots to waiters, highest class first. Caller holds the lock."""
+        for priority in PRIORITY_CLASSES:
+            queue = self._queues[priority]
+            while queue and self._has_room(priority):
+                user, waiters = next(iter(queue.items()))
+                waiter = waiters.popleft()
+                if waiters:
+                    queue.move_to_end(user)
+                else:
+                    del queue[user]
+                waiter.granted = True
+                self._running[priority] += 1
+                self._record_wait(priority, waiter)
+                waiter.event.set()
+            if queue:
+                # Lower classes never jump a blocked higher one
+                return
+
+    def _remove(self, priority: str, user: Optional[str], waiter: _Waiter):
+        waiters = self._queues[priority].get(user)
+        if waiters is not None:
+            waiters.remove(waiter)
+            if not waiters:
+                del self._queues[priority][user]
+
+    def _record_wait(self, priority: str, waiter: _Waiter):
+        wait_ms = (time.perf_counter() - waiter.enqueued) * 1000
+        self._waits[priority].append(wait_ms)
+        stats = self.stats[priority]
+        stats["max_wait_ms"] = max(stats["max_wait_ms"], round(wait_ms, 2))
+
+    def get_stats(self) -> dict:
+        """Per-class counters, queue depth and recent queue-wait percentiles."""
+        with self._lock:
+            classes = {}
+            for priority in PRIORITY_CLASSES:
+                waits = sorted(self._waits[priority])
+                classes[priority] = {
+                    **self.stats[priority],
+                    "running": self._running[priority],
+                    "waiting": sum(len(w) for w in self._queues[priority].values()),
+                    "p50_wait_ms": round(waits[len(waits) // 2], 2) if waits else 0.0,
+                    "p95_wait_ms": round(waits[int(len(waits) * 0.95)], 2) if waits else 0.0,
+                }
+            return {
+                "max_concurrency": self.max_concurrency,
+                "background_slots": self.background_slots,
+                "classes": classes,
+            }
@@ -0,0 +1,329 @@
+"""
+Deterministic fake Ollama server for load tests and benchmarks.
+
+Speaks enough of the Ollama HTTP API (/api/generate, /api/tags) and of the
+OpenAI-compatible one (/v1/completions, /v1/models) for call_ollama to work
+unchanged. Replies are derived from a hash of the prompt,
+so the same prompt always yields the same text, and generation time is
+simulated from a fixed latency plus a tokens/sec rate. With "stream": true
+the reply is sent as NDJSON chunks, one per token, and generation stops
+when the client disconnects (counted as "cancelled").
+
+With load_ms set, the model starts unloaded: the first request pays the
+load delay, and the model stays resident for the request's keep_alive
+(Ollama's default 5m), as reported by /api/ps. A request with a different
+options.num_ctx than the resident model reloads it, as Ollama does. An
+empty prompt only loads the model, like Ollama's preload request.
+
+Usage:
+    python -m ai.llm.stub_ollama --port 11435 --latency-ms 150 --tokens-per-sec 40
+    OLLAMA_URL=http://127.0.0.1:11435 uvicorn src.app.main:app
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+from ai.llm.generation_profiles import keep_alive_seconds
+
+SCAM_SENTENCES = [
+    "Sir, this is urgent, your account will be blocked in ten minutes.",
+    "Please share the OTP you just received to stop the transaction.",
+    "I am calling from the head office, this is an official verification.",
+    "Do not disconnect the call or the process will fail.",
+    "We only need a small processing fee to release the amount.",
+    "Your documents must be verified today itself.",
+    "Kindly confirm your registered mobile number.",
+    "This matter is confidential, please do not tell anyone.",
+    "The officer is waiting, we must complete this quickly.",
+    "Just tell me the code and everything will be resolved.",
+]
+
+# What an unconstrained chat model writes when it runs on past its own turn
+FAKE_USER_LINES = ["ok", "what should I do?", "is this real?", "I am scared"]
+
+
+class StubOllamaConfig:
+    """Timing and output shape of the fake model."""
+
+    def __init__(
+        self,
+        latency_ms: float = 100.0,
+        tokens_per_sec: float = 50.0,
+        default_tokens: int = 60,
+        model: str = "mistral",
+        continue_dialogue: bool = False,
+        available: bool = True,
+        load_ms: float = 0.0
+    ):
+        self.latency_ms = latency_ms
+        self.tokens_per_sec = tokens_per_sec
+        self.default_tokens = default_tokens
+        self.model = model
+        # Run on into fake "User:"/"Scammer:" lines every few sentences
+        self.continue_dialogue = continue_dialogue
+        # False answers every request with 503, like a model server going down
+        self.available = available
+        # Time to load the model into memory when it is not resident
+        self.load_ms = load_ms
+
+
+def generate_reply(
+    prompt: str,
+    max_tokens: int,
+    continue_dialogue: bool = False,
+    stop: Optional[List[str]] = None
+) -> str:
+    """
+    Deterministic reply text for a prompt, capped at `max_tokens` words and
+    cut at the first stop sequence, as Ollama does.
+    """
+    rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).digest())
+    words = []
+    sentences = 0
+    while len(words) < max_tokens:
+        words.extend(rng.choice(SCAM_SENTENCES).split())
+        sentences += 1
+        if continue_dialogue and sentences % 3 == 0:
+            words.extend(["\nUser:", *rng.choice(FAKE_USER_LINES).split(), "\nScammer:"])
+    reply = " ".join(words[:max_tokens])
+    for sequence in stop or []:
+        index = reply.find(sequence)
+        if index >= 0:
+            reply = reply[:index]
+    return reply
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "StubOllama/1.0"
+    protocol_version = "HTTP/1.1"  # Chunked streaming, like Ollama
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: dict):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_chunk(self, body: dict, openai: bool = False):
+        if openai:
+            data = b"data: " + json.dumps(body).encode("utf-8") + b"\n\n"
+        else:
+            data = json.dumps(body).encode("utf-8") + b"\n"
+        self._send_raw_chunk(data)
+
+    def _send_raw_chunk(self, data: bytes):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def do_GET(self):
+        config = self.server.config
+        if not config.available:
+            self._send_json(503, {"error": "model server unavailable"})
+        elif self.path == "/api/ps":
+            expires = self.server.resident_until()
+            models = [] if expires is None else [{"name": config.model, "expires_at": expires}]
+            self._send_json(200, {"models": models})
+        elif self.path == "/api/tags":
+            self._send_json(200, {"models": [{"name": config.model}]})
+        elif self.path == "/v1/models":
+            self._send_json(200, {"object": "list", "data": [{"id": config.model, "object": "model"}]})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path not in ("/api/generate", "/v1/completions"):
+            self._send_json(404, {"error": "not found"})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not self.server.config.available:
+            self._send_json(503, {"error": "model server unavailable"})
+            return
+
+        openai = self.path == "/v1/completions"
+        if not openai and not request.get("prompt"):
+            self.server.load(request)
+            self._send_json(200, {
+                "model": request.get("model", self.server.config.model),
+                "response": "", "done": True, "done_reason": "load",
+            })
+            return
+        if openai:
+            # Same generation, OpenAI field names
+            request["options"] = {"num_predict": request.get("max_tokens"), "stop": request.get("stop")}
+        if request.get("stream"):
+            self.server.stream(self, request, openai)
+        else:
+            body = self.server.generate(request)
+            if openai:
+                body = _openai_completion(body)
+            self._send_json(200, body)
+
+
+def _openai_completion(body: dict) -> dict:
+    return {
+        "object": "text_completion",
+        "model": body["model"],
+        "choices": [{"index": 0, "text": body["response"], "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": body["prompt_eval_count"], "completion_tokens": body["eval_count"]},
+    }
+
+
+class StubOllamaServer(ThreadingHTTPServer):
+    """Threaded fake Ollama; use start()/stop() to run it in the background."""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, config: Optional[StubOllamaConfig] = None):
+        super().__init__((host, port), _Handler)
+        self.config = config or StubOllamaConfig()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {
+            "requests": 0, "in_flight": 0, "max_in_flight": 0, "tokens_generated": 0, "cancelled": 0,
+            "loads": 0,
+        }
+        self._load_lock = threading.Lock()
+        self._loaded_until: Optional[float] = None  # time.time(); inf while kept forever
+        self._loaded_num_ctx: Optional[int] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def resident_until(self) -> Optional[float]:
+        """Unload time of the model (inf for forever), or None if not resident."""
+        if self.config.load_ms <= 0:
+            return float("inf")
+        with self._lock:
+            if self._loaded_until is None or self._loaded_until <= time.time():
+                return None
+            return self._loaded_until
+
+    def load(self, request: dict):
+        """Load the model if needed, then extend its residency by the request's keep_alive."""
+        if self.config.load_ms > 0:
+            num_ctx = (request.get("options") or {}).get("num_ctx")
+            with self._load_lock:
+                if self.resident_until() is None or num_ctx != self._loaded_num_ctx:
+                    time.sleep(self.config.load_ms / 1000)
+                    with self._lock:
+                        self.stats["loads"] += 1
+                        self._loaded_num_ctx = num_ctx
+            keep_alive = keep_alive_seconds(request.get("keep_alive", "5m"))
+            with self._lock:
+                self._loaded_until = float("inf") if keep_alive is None else time.time() + keep_alive
+
+    def _begin(self, request: dict) -> str:
+        self.load(request)
+        options = request.get("options") or {}
+        # default_tokens is the model's natural reply length; num_predict only caps it
+        max_tokens = min(options.get("num_predict") or self.config.default_tokens, self.config.default_tokens)
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["in_flight"] += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.stats["in_flight"])
+        return generate_reply(
+            request.get("prompt", ""), max_tokens, self.config.continue_dialogue, options.get("stop")
+        )
+
+    def generate(self, request: dict) -> dict:
+        config = self.config
+        reply = self._begin(request)
+        eval_count = len(reply.split())
+
+        started = time.perf_counter()
+        try:
+            time.sleep(config.latency_ms / 1000 + eval_count / config.tokens_per_sec)
+        finally:
+            with self._lock:
+                self.stats["in_flight"] -= 1
+                self.stats["tokens_generated"] += eval_count
+
+        return {
+            "model": request.get("model", config.model),
+            "response": reply,
+            "done": True,
+            "prompt_eval_count": len(request.get("prompt", "")) // 4,
+            "eval_count": eval_count,
+            "total_duration": int((time.perf_counter() - started) * 1e9),
+        }
+
+    def stream(self, handler: BaseHTTPRequestHandler, request: dict, openai: bool = False):
+        """Send the reply token by token; stop early if the client goes away."""
+        config = self.config
+        words = self._begin(request).split()
+        model = request.get("model", config.model)
+        sent = 0
+        try:
+            handler.send_response(200)
+            handler.send_header("Content-Type", "text/event-stream" if openai else "application/x-ndjson")
+            handler.send_header("Transfer-Encoding", "chunked")
+            handler.end_headers()
+            time.sleep(config.latency_ms / 1000)
+            for i, word in enumerate(words):
+                time.sleep(1 / config.tokens_per_sec)
+                token = word if i == 0 else " " + word
+                if openai:
+                    handler._send_chunk({"model": model, "choices": [{"text": token, "finish_reason": None}]}, True)
+                else:
+                    handler._send_chunk({"model": model, "response": token, "done": False})
+                sent += 1
+            if openai:
+                handler._send_chunk({"model": model, "choices": [{"text": "", "finish_reason": "stop"}]}, True)
+                handler._send_raw_chunk(b"data: [DONE]\n\n")
+            else:
+                handler._send_chunk({"model": model, "response": "", "done": True, "eval_count": sent})
+            handler.wfile.write(b"0\r\n\r\n")
+            handler.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            handler.close_connection = True
+            with self._lock:
+                self.stats["cancelled"] += 1
+        finally:
+            with self._lock:
+                self.stats["in_flight"] -= 1
+                self.stats["tokens_generated"] += sent
+
+    def start(self) -> "StubOllamaServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deterministic fake Ollama server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="Fixed delay before the first token")
+    parser.add_argument("--tokens-per-sec", type=float, default=50.0, help="Simulated generation speed")
+    parser.add_argument("--default-tokens", type=int, default=60, help="Tokens generated when num_predict is unset")
+    parser.add_argument("--load-ms", type=float, default=0.0, help="Model load time when not resident")
+    args = parser.parse_args()
+
+    server = StubOllamaServer(
+        args.host,
+        args.port,
+        StubOllamaConfig(args.latency_ms, args.tokens_per_sec, args.default_tokens, load_ms=args.load_ms)
+    )
+    print(f"Stub Ollama listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -0,0 +1,72 @@
+"""
+Prompt token counting.
+
+Prompt evaluation time grows with prompt tokens, so the controller packs
+conversation history against a per-profile token budget (the profile's
+"history_tokens", see generation_profiles.py) rather than a fixed number
+of exchanges.
+
+count_tokens() is exact when TOKENIZER_PATH points at the served model's
+tokenizer.json and the `tokenizers` package is installed
+(pip install tokenizers); otherwise it falls back to estimate_tokens(), a
+fast approximation of a SentencePiece/BPE vocabulary: roughly one token
+per short word, one per digit and one per symbol or non-ASCII character.
+"""
+
+import os
+import re
+
+TOKENIZER_PATH = os.getenv("TOKENIZER_PATH")
+
+# Letter runs, single digits (Llama/Mistral split numbers into digits), anything else non-space
+_PIECES = re.compile(r"[A-Za-z]+|\d|[^\sA-Za-z\d]")
+
+
+def _load_tokenizer():
+    if not TOKENIZER_PATH:
+        return None
+    try:
+        from tokenizers import Tokenizer
+    except ImportError:
+        print("TOKENIZER WARNING: tokenizers is not installed (pip install tokenizers), estimating tokens")
+        return None
+    try:
+        return Tokenizer.from_file(TOKENIZER_PATH)
+    except Exception as e:
+        print(f"TOKENIZER WARNING: cannot load {TOKENIZER_PATH}: {str(e)}, estimating tokens")
+        return None
+
+
+_tokenizer = _load_tokenizer()
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count; a word of up to 7 letters is one token, longer words add one per 8 letters."""
+    tokens = 0
+    for piece in _PIECES.findall(text):
+        tokens += 1 + len(piece) // 8 if piece[0].isalpha() else 1
+    return tokens
+
+
+def count_tokens(text: str) -> int:
+    """Token count of `text`, exact with a configured tokenizer."""
+    if _tokenizer is not None:
+        return len(_tokenizer.encode(text, add_special_tokens=False).ids)
+    return estimate_tokens(text)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """The longest prefix of `text` (cut at a space where possible) that fits in `max_tokens`."""
+    if count_tokens(text) <= max_tokens:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(text[:middle]) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    prefix = text[:low]
+    if " " in prefix:
+        prefix = prefix[:prefix.rindex(" ")]
+    return prefix.rstrip()
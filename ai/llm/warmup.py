@@ -0,0 +1,226 @@
+"""
+Model warmup and keep-alive for the LLM backends.
+
+Ollama loads a model on its first request and unloads it after keep_alive
+of idleness, so the first trainee after a deploy or a quiet spell waits
+for the load (several seconds). ModelWarmer preloads every configured
+model on every backend (Ollama's empty-prompt preload request), and
+ping_idle() re-sends that request only for backends that have been idle
+for half the keep_alive, so steady traffic costs no pings at all.
+
+Readiness (is_ready) means every healthy backend has every model loaded.
+
+Usage (first-turn latency, cold vs warm, against the stub server):
+    python -m ai.llm.warmup --load-ms 3000
+"""
+
+import argparse
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from ai.llm.backend_pool import OPENAI_API, BackendPool, LLMBackend
+from ai.llm.generation_profiles import OLLAMA_KEEP_ALIVE, OLLAMA_NUM_CTX, keep_alive_seconds
+from ai.llm.scheduler import LLMScheduler
+
+# Every model a backend should keep loaded (defaults to OLLAMA_MODEL)
+WARM_MODELS = [
+    model.strip()
+    for model in os.getenv("OLLAMA_WARM_MODELS", os.getenv("OLLAMA_MODEL", "mistral")).split(",")
+    if model.strip()
+]
+
+
+class ModelWarmer:
+    """Preloads models and keeps them resident while traffic is idle."""
+
+    def __init__(
+        self,
+        pool: BackendPool,
+        models: List[str],
+        keep_alive: str = OLLAMA_KEEP_ALIVE,
+        scheduler: Optional[LLMScheduler] = None,
+        load_timeout: float = 120.0
+    ):
+        self.pool = pool
+        self.models = models
+        self.keep_alive = keep_alive
+        self.scheduler = scheduler
+        self.load_timeout = load_timeout
+        keep_seconds = keep_alive_seconds(keep_alive)
+        # Ping before half the keep_alive has passed; None when kept forever
+        self.ping_after = None if keep_seconds is None else keep_seconds / 2
+        self._lock = threading.Lock()
+        self.resident: Dict[Tuple[str, str], bool] = {}
+        self.last_load: Dict[Tuple[str, str], float] = {}
+        self.load_ms: Dict[Tuple[str, str], float] = {}
+        self.stats = {"warmups": 0, "pings": 0, "skipped": 0, "failures": 0}
+
+    def _request(self, backend: LLMBackend, model: str) -> Tuple[str, dict]:
+        if backend.api == OPENAI_API:
+            # No preload API; a one-token completion loads the model
+            return f"{backend.url}/v1/completions", {"model": model, "prompt": " ", "max_tokens": 1}
+        # Same num_ctx as the generation profiles, or the first real call reloads the model
+        return f"{backend.url}/api/generate", {
+            "model": model, "prompt": "", "keep_alive": self.keep_alive, "options": {"num_ctx": OLLAMA_NUM_CTX},
+        }
+
+    def _load(self, backend: LLMBackend, model: str) -> bool:
+        """Load (or refresh the keep_alive of) one model on one backend."""
+        key = (backend.url, model)
+        if self.scheduler is not None:
+            self.scheduler.acquire("background", "model-warmup")
+        started = time.perf_counter()
+        try:
+            url, payload = self._request(backend, model)
+            response = requests.post(url, json=payload, timeout=self.load_timeout)
+            response.raise_for_status()
+            loaded = True
+        except requests.RequestException as e:
+            print(f"MODEL WARMUP ERROR ({backend.url}, {model}): {str(e)}")
+            loaded = False
+        finally:
+            if self.scheduler is not None:
+                self.scheduler.release("background")
+
+        with self._lock:
+            self.resident[key] = loaded
+            if loaded:
+                self.last_load[key] = time.monotonic()
+                self.load_ms[key] = round((time.perf_counter() - started) * 1000, 1)
+            else:
+                self.stats["failures"] += 1
+        return loaded
+
+    def warm(self) -> bool:
+        """Load every model on every backend; True if all are resident."""
+        for backend in self.pool.backends:
+            for model in self.models:
+                if self._load(backend, model):
+                    with self._lock:
+                        self.stats["warmups"] += 1
+                    print(f"MODEL WARM: {model} on {backend.url} ({self.load_ms[(backend.url, model)]} ms)")
+        return self.is_ready()
+
+    def check_resident(self):
+        """Refresh residency from Ollama's /api/ps (models can be evicted or the server restarted)."""
+        for backend in self.pool.backends:
+            if backend.api == OPENAI_API:
+                continue
+            try:
+                response = requests.get(f"{backend.url}/api/ps", timeout=5)
+                response.raise_for_status()
+                loaded = {m.get("name", "").split(":")[0] for m in response.json().get("models", [])}
+            except requests.RequestException:
+                loaded = set()
+            with self._lock:
+                for model in self.models:
+                    self.resident[(backend.url, model)] = model.split(":")[0] in loaded
+
+    def ping_idle(self) -> int:
+        """
+        Refresh models whose backend has seen no traffic (and no ping) for
+        ping_after seconds, and reload any that were evicted. Returns the
+        number of load requests sent.
+        """
+        sent = 0
+        now = time.monotonic()
+        for backend in self.pool.backends:
+            for model in self.models:
+                key = (backend.url, model)
+                with self._lock:
+                    resident = self.resident.get(key, False)
+                    last_activity = max(backend.last_used, self.last_load.get(key, 0.0))
+                idle = self.ping_after is not None and now - last_activity >= self.ping_after
+                if resident and not idle:
+                    with self._lock:
+                        self.stats["skipped"] += 1
+                    continue
+                if self._load(backend, model):
+                    sent += 1
+                    with self._lock:
+                        self.stats["pings"] += 1
+        return sent
+
+    def is_ready(self) -> bool:
+        healthy = [b for b in self.pool.backends if b.healthy]
+        with self._lock:
+            return bool(healthy) and all(
+                self.resident.get((b.url, model), False) for b in healthy for model in self.models
+            )
+
+    def get_stats(self) -> dict:
+        ready = self.is_ready()
+        with self._lock:
+            return {
+                **self.stats,
+                "ready": ready,
+                "models": [
+                    {
+                        "backend": url,
+                        "model": model,
+                        "resident": resident,
+                        "load_ms": self.load_ms.get((url, model)),
+                    }
+                    for (url, model), resident in self.resident.items()
+                ],
+            }
+
+
+# ================================================
+# BENCHMARK
+# ================================================
+
+def _first_turn_ms(server_url: str, warm: bool) -> Tuple[float, Optional[float]]:
+    """(first opening call ms, warmup ms) against a freshly started backend."""
+    from ai.llm import ollama_client
+    from ai.prompts.prompt_builder import build_initial_message_prompt
+
+    previous_pool = ollama_client.llm_pool
+    ollama_client.llm_pool = BackendPool([server_url])
+    try:
+        warmup_ms = None
+        if warm:
+            started = time.perf_counter()
+            ModelWarmer(ollama_client.llm_pool, [ollama_client.MODEL_NAME]).warm()
+            warmup_ms = round((time.perf_counter() - started) * 1000, 1)
+        started = time.perf_counter()
+        ollama_client.call_ollama(build_initial_message_prompt("student", 20, "bank"), profile="opening")
+        return round((time.perf_counter() - started) * 1000, 1), warmup_ms
+    finally:
+        ollama_client.llm_pool = previous_pool
+
+
+def run_warmup_benchmark(load_ms: float = 3000.0, latency_ms: float = 100.0, tokens_per_sec: float = 50.0) -> dict:
+    """First-turn latency on a cold backend vs one warmed at startup (stub with a model load delay)."""
+    from ai.llm.stub_ollama import StubOllamaConfig, StubOllamaServer
+
+    report = {}
+    for mode in ("cold", "warm"):
+        server = StubOllamaServer(config=StubOllamaConfig(latency_ms, tokens_per_sec, load_ms=load_ms)).start()
+        try:
+            first_turn_ms, warmup_ms = _first_turn_ms(server.url, mode == "warm")
+            report[mode] = {"first_turn_ms": first_turn_ms, "warmup_ms": warmup_ms, "loads": server.stats["loads"]}
+        finally:
+            server.stop()
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Cold vs warm first-turn latency against the stub Ollama server.")
+    parser.add_argument("--load-ms", type=float, default=3000.0, help="Simulated model load time")
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--tokens-per-sec", type=float, default=50.0)
+    args = parser.parse_args(argv)
+
+    report = run_warmup_benchmark(args.load_ms, args.latency_ms, args.tokens_per_sec)
+    print(f"{'MODE':<8}{'FIRST TURN ms':>16}{'WARMUP ms':>12}")
+    for mode, row in report.items():
+        print(f"{mode:<8}{row['first_turn_ms']:>16}{str(row['warmup_ms'] or '-'):>12}")
+
+
+if __name__ == "__main__":
+    main()
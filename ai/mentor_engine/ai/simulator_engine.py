@@ -65,7 +65,7 @@ User:
 Scammer:
 """
 
-    scam_reply = call_ollama(full_prompt)
+    scam_reply = call_ollama(full_prompt, profile="scammer_turn")
 
     return {
         "mode": "SIMULATOR",
@@ -3,6 +3,8 @@ Production-level mentor engine for CyberGuardian AI.
 Provides persona-aware, contextual explanations when user shows risky behavior.
 """
 
+from typing import Optional
+
 from ai.llm.ollama_client import call_ollama
 from ai.prompts.personas import get_persona
 from ai.prompts.scenarios import get_scenario
@@ -66,7 +68,8 @@ def run_mentor(
     user_risky_reply: str = "",
     persona: str = "general",
     age: int = 30,
-    scenario: str = "bank"
+    scenario: str = "bank",
+    user: Optional[str] = None
 ) -> str:
     """
     Generate a persona-aware mentor explanation.
@@ -77,6 +80,7 @@ def run_mentor(
         persona: User's persona key
         age: User's age
         scenario: Current scam scenario key
+        user: Session key for fair queuing in the LLM scheduler
     
     Returns:
         Mentor explanation tailored to the user's context
@@ -108,7 +112,7 @@ Be specific to this {scenario_data['name']} scam and this user's profile.
     
     full_prompt = f"{mentor_base}\n{context}"
     
-    return call_ollama(full_prompt)
+    return call_ollama(full_prompt, profile="mentor", user=user)
 
 
 def get_quick_tip(persona: str, scenario: str) -> str:
@@ -126,3 +130,33 @@ def get_quick_tip(persona: str, scenario: str) -> str:
     
     return tips.get((persona, scenario), 
         "When something feels urgent and asks for personal data, pause and verify through official channels.")
+
+
+def build_fallback_mentor_text(
+    user_risky_reply: str = "",
+    persona: str = "general",
+    scenario: str = "bank"
+) -> str:
+    """
+    Templated mentor explanation for when the LLM is unavailable, assembled
+    from the scenario's manipulation techniques and red flags.
+    """
+    scenario_data = get_scenario(scenario)
+    
+    techniques = []
+    for technique in scenario_data["manipulation_techniques"]:
+        name, _, detail = technique.partition(":")
+        techniques.append(f"- {name.strip().title()}: {detail.strip()}")
+    red_flags = [f"- {flag}" for flag in scenario_data["red_flags_to_simulate"]]
+    
+    return f"""Pause here. This conversation matches a {scenario_data['name']} scam.
+
+How the scammer is pressuring you:
+{chr(10).join(techniques)}
+
+Red flags to notice:
+{chr(10).join(red_flags)}
+
+Your reply "{user_risky_reply}" moves the conversation toward what the scammer wants. A safer response is: "I will verify this myself through the official number. I am not sharing anything here."
+
+Tip: {get_quick_tip(persona, scenario)}"""
@@ -3,11 +3,15 @@ Production-level prompt builder for CyberGuardian AI.
 CRITICAL: Contains strict anti-hallucination and time control rules.
 """
 
+import argparse
+from typing import Dict, List, Optional
+
 from ai.prompts.personas import get_persona, get_persona_prompt
-from ai.prompts.scenarios import get_scenario, get_scenario_prompt
+from ai.prompts.scenarios import get_scenario, get_scenario_prompt, get_stage_prompt
 
 
-BASE_SIMULATOR_PROMPT = """
+# Rules for every turn; the escalation rules only apply when the whole pattern is in the prompt
+SIMULATOR_RULES = """
 You are a scam simulator for cybersecurity training.
 
 ═══════════════════════════════════════════════════════════════
@@ -46,7 +50,9 @@ MESSAGE FORMAT RULES
 GOOD EXAMPLE: "Sir, please share the OTP immediately or your account will be blocked."
 BAD EXAMPLE: "I understand your concern. Please be assured that this is a legitimate process. When you receive the OTP, kindly share it with me so that I can verify your account and resolve this security issue."
 
-═══════════════════════════════════════════════════════════════
+"""
+
+ESCALATION_RULES = """═══════════════════════════════════════════════════════════════
 ESCALATION RULES
 ═══════════════════════════════════════════════════════════════
 
@@ -56,6 +62,8 @@ ESCALATION RULES
 4. Increase pressure gradually.
 """
 
+BASE_SIMULATOR_PROMPT = SIMULATOR_RULES + ESCALATION_RULES
+
 
 def build_simulator_prompt(persona: str, age: int, scenario: str) -> str:
     """
@@ -94,6 +102,46 @@ REMEMBER: 1-3 sentences only. Be realistic. Be pressured. Be human.
 """
 
 
+def build_stage_prompt(persona: str, age: int, scenario: str, stage: int) -> str:
+    """
+    Build the simulator prompt for one escalation stage: the turn rules,
+    and only the persona and scenario details that matter at this step
+    (see ai/session/escalation.py).
+    """
+    persona_data = get_persona(persona)
+    scenario_data = get_scenario(scenario)
+    vulnerabilities = persona_data['vulnerabilities']
+    triggers = persona_data['psychological_triggers']
+
+    return f"""
+{SIMULATOR_RULES}
+═══════════════════════════════════════════════════════════════
+TARGET PERSONA
+═══════════════════════════════════════════════════════════════
+TARGET PROFILE:
+- Type: {persona_data['name']}
+- Age: {age} years old
+- Vulnerability to exploit now: {vulnerabilities[stage % len(vulnerabilities)]}
+- Language style: {persona_data['language_style']}
+
+═══════════════════════════════════════════════════════════════
+SCAM SCENARIO
+═══════════════════════════════════════════════════════════════
+{get_stage_prompt(scenario, stage)}
+═══════════════════════════════════════════════════════════════
+YOUR TASK
+═══════════════════════════════════════════════════════════════
+
+Generate ONE short scam message that:
+- Sounds like a real {scenario_data['role']}
+- Uses language appropriate for a {age}-year-old {persona_data['name']}
+- Carries out the CURRENT STEP only
+- Creates pressure using: {triggers[stage % len(triggers)]}
+
+REMEMBER: 1-3 sentences only. Be realistic. Be pressured. Be human.
+"""
+
+
 def build_initial_message_prompt(persona: str, age: int, scenario: str) -> str:
     """
     Build prompt for generating the first scam message.
@@ -121,3 +169,71 @@ REFERENCE OPENINGS (use as inspiration, don't copy exactly):
 
 Generate only the message. Nothing else.
 """
+
+
+def build_summary_prompt(previous_summary: str, older_lines: str, max_words: int = 80) -> str:
+    """
+    Build prompt for folding turns that left the history window into the
+    running "story so far".
+    """
+    return f"""
+You are keeping notes on a scam training conversation between a scammer and a user.
+
+STORY SO FAR:
+{previous_summary or "(nothing yet)"}
+
+NEW MESSAGES:
+{older_lines}
+
+Rewrite the story so far to include the new messages, in at most {max_words} words.
+Keep: who the scammer claims to be, what they asked for, what the user agreed to,
+shared or refused, and any names, amounts or deadlines mentioned.
+Write plain sentences in the past tense. No advice, no dialogue lines.
+
+Updated story so far:
+"""
+
+
+# ================================================
+# BENCHMARK
+# ================================================
+
+def measure_stage_prompts(age: int = 30) -> List[Dict[str, float]]:
+    """
+    Mean simulator prompt tokens per escalation stage, full prompt vs
+    stage prompt, over every persona/scenario pair.
+
+    Returns:
+        [{"stage", "full_tokens", "stage_tokens", "saved_pct"}, ...]
+    """
+    from ai.llm.tokens import count_tokens
+    from ai.prompts.personas import PERSONAS
+    from ai.prompts.scenarios import SCENARIOS
+
+    pairs = [(persona, scenario) for persona in PERSONAS for scenario in SCENARIOS]
+    stages = max(len(SCENARIOS[scenario]['escalation_pattern']) for scenario in SCENARIOS)
+    full = sum(count_tokens(build_simulator_prompt(p, age, s)) for p, s in pairs) / len(pairs)
+    rows = []
+    for stage in range(stages):
+        staged = sum(count_tokens(build_stage_prompt(p, age, s, stage)) for p, s in pairs) / len(pairs)
+        rows.append({
+            "stage": stage + 1,
+            "full_tokens": round(full, 1),
+            "stage_tokens": round(staged, 1),
+            "saved_pct": round(100 * (1 - staged / full), 1),
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Simulator prompt tokens per escalation stage, full vs staged.")
+    parser.add_argument("--age", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    print(f"{'STAGE':<8}{'FULL':>10}{'STAGED':>10}{'SAVED %':>10}")
+    for row in measure_stage_prompts(args.age):
+        print(f"{row['stage']:<8}{row['full_tokens']:>10}{row['stage_tokens']:>10}{row['saved_pct']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -181,6 +181,22 @@ SCENARIOS = {
 }
 
 
+# Pressure a scammer adds per manipulation technique, for templated fallback turns
+TECHNIQUE_PRESSURE_LINES = {
+    "FEAR": "If this is not done now, the consequences will be serious.",
+    "URGENCY": "We have only a few minutes left, please do it right now.",
+    "AUTHORITY": "I am an authorised officer and this is the official procedure.",
+    "TRUST": "I already have your details on record, I am only confirming.",
+    "SCARCITY": "This opportunity will go to someone else if you delay.",
+    "GREED": "Think of what you will receive once this small step is done.",
+    "HOPE": "Everything will work out for you once this is completed.",
+    "RECIPROCITY": "I am helping you here, so please cooperate with me.",
+    "EMOTION": "Please, I really need you right now.",
+    "SECRECY": "Do not discuss this with anyone, it will only cause problems.",
+    "ISOLATION": "Do not disconnect or call anyone else until this is finished.",
+}
+
+
 def get_scenario(scenario_key: str) -> dict:
     """Get scenario details by key, defaulting to 'bank'."""
     return SCENARIOS.get(scenario_key, SCENARIOS["bank"])
@@ -209,3 +225,61 @@ EXAMPLE MESSAGES FOR REFERENCE:
 
 IMPORTANT: Follow the escalation pattern step by step. Do not skip steps.
 """
+
+
+def get_stage_prompt(scenario_key: str, stage: int) -> str:
+    """
+    Build the scenario prompt for one escalation step: the step itself,
+    the one after it, one manipulation technique and one example. Data
+    targets only appear from the middle of the pattern on, once trust and
+    pressure have been built.
+    """
+    scenario = get_scenario(scenario_key)
+    steps = [step.split(". ", 1)[-1] for step in scenario['escalation_pattern']]
+    stage = min(max(stage, 0), len(steps) - 1)
+    techniques = scenario['manipulation_techniques']
+    samples = scenario['sample_messages']
+
+    if stage + 1 < len(steps):
+        next_step = f"NEXT STEP (only once this one has worked): {steps[stage + 1]}"
+    else:
+        next_step = "This is the final step. Keep pressing for it; do not start over."
+    if stage >= len(steps) // 2:
+        data = f"DATA YOU SHOULD TRY TO EXTRACT NOW: {', '.join(scenario['data_extraction_targets'][:2])}"
+    else:
+        data = "Do NOT ask for sensitive data yet."
+
+    return f"""
+SCAM SCENARIO: {scenario['name']}
+YOUR ROLE: {scenario['role']}
+CONTEXT: {scenario['opening_context']}
+
+CURRENT STEP ({stage + 1} of {len(steps)}): {steps[stage]}
+{next_step}
+
+MANIPULATION TECHNIQUE TO USE NOW: {techniques[stage % len(techniques)]}
+
+{data}
+
+EXAMPLE MESSAGE FOR REFERENCE:
+- "{samples[min(stage, len(samples) - 1)]}"
+"""
+
+
+def get_fallback_message(scenario_key: str, turn: int) -> str:
+    """
+    Deterministic scammer line for when the LLM is unavailable.
+
+    Turn 0 is the opening. The sample messages walk the early escalation
+    steps; after them the scammer holds at the final step, repeating its
+    last ask behind a pressure line for each manipulation technique in turn.
+    """
+    scenario = get_scenario(scenario_key)
+    samples = scenario["sample_messages"]
+    if turn < len(samples):
+        return samples[turn]
+
+    techniques = [t.split(":", 1)[0].strip() for t in scenario["manipulation_techniques"]]
+    technique = techniques[(turn - len(samples)) % len(techniques)]
+    pressure = TECHNIQUE_PRESSURE_LINES.get(technique, TECHNIQUE_PRESSURE_LINES["URGENCY"])
+    return f"{pressure} {samples[-1]}"
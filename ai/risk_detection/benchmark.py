@@ -0,0 +1,312 @@
+"""
+Risk detection benchmark and accuracy harness.
+
+Usage:
+    python -m ai.risk_detection.benchmark
+    python -m ai.risk_detection.benchmark --size 100000 --output bench.json
+    python -m ai.risk_detection.benchmark --baseline bench.json --tolerance 0.25
+    python -m ai.risk_detection.benchmark --prefilter-report
+    python -m ai.risk_detection.benchmark --normalization-report
+    python -m ai.risk_detection.benchmark --scenario-report
+
+Exits with status 1 when p99 latency regresses beyond the tolerance against a
+baseline file, exceeds --max-p99-us, or accuracy drops below --min-recall.
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ai.risk_detection import risk_detection
+from ai.risk_detection.risk_detection import detect_risk
+from ai.risk_detection.normalization import normalize
+from ai.risk_detection.corpus import generate_corpus, LABELED_CORPUS, RISK_LEVELS, SCENARIO_LABELED_CORPUS
+from ai.prompts.scenarios import SCENARIOS
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_latency_benchmark(
+    corpus: List[Tuple[str, str]],
+    detector: Callable[[str], str] = detect_risk,
+    warmup: int = 1000
+) -> Dict[str, dict]:
+    """
+    Time `detector` on every message. The normalization cache is cleared
+    before each call so repeated corpus messages are not measured warm.
+
+    Returns:
+        {category: {count, p50_us, p99_us, max_us, msgs_per_sec}} plus an "ALL" row
+    """
+    for message, _ in corpus[:warmup]:
+        detector(message)
+
+    timings = defaultdict(list)
+    clock = time.perf_counter
+    for message, category in corpus:
+        normalize.cache_clear()
+        start = clock()
+        detector(message)
+        timings[category].append(clock() - start)
+
+    timings["ALL"] = [t for values in list(timings.values()) for t in values]
+
+    report = {}
+    for category, values in timings.items():
+        values.sort()
+        total = sum(values)
+        report[category] = {
+            "count": len(values),
+            "p50_us": round(_percentile(values, 50) * 1e6, 2),
+            "p99_us": round(_percentile(values, 99) * 1e6, 2),
+            "max_us": round(values[-1] * 1e6, 2),
+            "msgs_per_sec": round(len(values) / total) if total else 0,
+        }
+    return report
+
+
+def run_accuracy_check(
+    labeled: List[Tuple[str, str]] = LABELED_CORPUS,
+    detector: Callable[[str], str] = detect_risk
+) -> Dict[str, dict]:
+    """
+    Score `detector` against hand-labeled messages.
+
+    Returns:
+        {level: {precision, recall, support}} plus "misses": [(message, expected, got)]
+    """
+    true_pos = defaultdict(int)
+    predicted = defaultdict(int)
+    support = defaultdict(int)
+    misses = []
+
+    for message, expected in labeled:
+        got = detector(message)
+        support[expected] += 1
+        predicted[got] += 1
+        if got == expected:
+            true_pos[expected] += 1
+        else:
+            misses.append((message, expected, got))
+
+    report = {}
+    for level in RISK_LEVELS:
+        report[level] = {
+            "precision": round(true_pos[level] / predicted[level], 3) if predicted[level] else 0.0,
+            "recall": round(true_pos[level] / support[level], 3) if support[level] else 0.0,
+            "support": support[level],
+        }
+    report["misses"] = misses
+    return report
+
+
+def run_prefilter_comparison(corpus: List[Tuple[str, str]]) -> dict:
+    """
+    Time the corpus with the keyword prefilter off and on.
+
+    Returns:
+        {"off": latency report, "on": latency report, "short_circuit_ratio": float}
+    """
+    prefilter = risk_detection.rule_packs.active.prefilter
+    try:
+        prefilter.enabled = False
+        off = run_latency_benchmark(corpus)
+        prefilter.enabled = True
+        prefilter.reset_stats()
+        on = run_latency_benchmark(corpus, warmup=0)
+        ratio = prefilter.short_circuit_ratio()
+    finally:
+        prefilter.enabled = True
+    return {"off": off, "on": on, "short_circuit_ratio": round(ratio, 4)}
+
+
+def run_normalization_benchmark(corpus: List[Tuple[str, str]]) -> Dict[str, dict]:
+    """
+    Time the uncached normalization pass alone.
+
+    Returns:
+        {category: {count, p50_us, p99_us, max_us, msgs_per_sec}} plus an "ALL" row
+    """
+    return run_latency_benchmark(corpus, detector=normalize.__wrapped__)
+
+
+def run_scenario_report(corpus: List[Tuple[str, str]]) -> Dict[str, dict]:
+    """
+    Latency and accuracy per scenario, universal rules vs universal +
+    scenario rules. Accuracy is scored on the labeled corpus plus that
+    scenario's labeled replies.
+
+    Returns:
+        {scenario: {"compile_ms", "universal": {p50_us, p99_us, correct, total},
+        "scenario": {...}, "misses": [(message, expected, got)]}} where
+        misses are scenario-labeled replies the scenario rules still get wrong
+    """
+    report = {}
+    for scenario in SCENARIOS:
+        started = time.perf_counter()
+        risk_detection.rule_packs.active.for_scenario(scenario)
+        compile_ms = (time.perf_counter() - started) * 1000
+
+        labeled = LABELED_CORPUS + SCENARIO_LABELED_CORPUS.get(scenario, [])
+        row = {"compile_ms": round(compile_ms, 2)}
+        for name, key in (("universal", None), ("scenario", scenario)):
+            detector = lambda message, key=key: detect_risk(message, key)
+            latency = run_latency_benchmark(corpus, detector, warmup=0)["ALL"]
+            accuracy = run_accuracy_check(labeled, detector)
+            row[name] = {
+                "p50_us": latency["p50_us"],
+                "p99_us": latency["p99_us"],
+                "correct": len(labeled) - len(accuracy["misses"]),
+                "total": len(labeled),
+            }
+            # Universal-corpus misses are already in the main accuracy report
+            scenario_only = set(SCENARIO_LABELED_CORPUS.get(scenario, []))
+            row["misses"] = [miss for miss in accuracy["misses"] if miss[:2] in scenario_only]
+        report[scenario] = row
+    return report
+
+
+def find_regressions(
+    latency: Dict[str, dict],
+    baseline: Optional[Dict[str, dict]] = None,
+    tolerance: float = 0.25,
+    max_p99_us: Optional[float] = None
+) -> List[str]:
+    """List human-readable latency regressions (empty when all is well)."""
+    problems = []
+    for category, row in latency.items():
+        if max_p99_us is not None and row["p99_us"] > max_p99_us:
+            problems.append(f"{category}: p99 {row['p99_us']}us exceeds budget {max_p99_us}us")
+        if baseline and category in baseline:
+            allowed = baseline[category]["p99_us"] * (1 + tolerance)
+            if row["p99_us"] > allowed:
+                problems.append(
+                    f"{category}: p99 {row['p99_us']}us regressed from "
+                    f"{baseline[category]['p99_us']}us (allowed {allowed:.2f}us)"
+                )
+    return problems
+
+
+def _print_latency(latency: Dict[str, dict]):
+    print(f"{'CATEGORY':<14}{'COUNT':>9}{'P50 us':>10}{'P99 us':>10}{'MAX us':>10}{'MSG/S':>11}")
+    for category in sorted(latency, key=lambda c: (c == "ALL", c)):
+        row = latency[category]
+        print(
+            f"{category:<14}{row['count']:>9}{row['p50_us']:>10}{row['p99_us']:>10}"
+            f"{row['max_us']:>10}{row['msgs_per_sec']:>11}"
+        )
+
+
+def _print_accuracy(accuracy: Dict[str, dict]):
+    print(f"{'LEVEL':<14}{'PRECISION':>10}{'RECALL':>10}{'SUPPORT':>10}")
+    for level in RISK_LEVELS:
+        row = accuracy[level]
+        print(f"{level:<14}{row['precision']:>10}{row['recall']:>10}{row['support']:>10}")
+    for message, expected, got in accuracy["misses"]:
+        print(f"  ✗ '{message}' -> {got} (expected: {expected})")
+
+
+def _print_prefilter(comparison: dict):
+    print(f"Short-circuited (no rule can match): {comparison['short_circuit_ratio']:.1%}")
+    print(f"{'CATEGORY':<14}{'P50 OFF':>10}{'P50 ON':>10}{'P99 OFF':>10}{'P99 ON':>10}{'SPEEDUP':>10}")
+    off, on = comparison["off"], comparison["on"]
+    for category in sorted(on, key=lambda c: (c == "ALL", c)):
+        speedup = on[category]["msgs_per_sec"] / off[category]["msgs_per_sec"] if off[category]["msgs_per_sec"] else 0
+        print(
+            f"{category:<14}{off[category]['p50_us']:>10}{on[category]['p50_us']:>10}"
+            f"{off[category]['p99_us']:>10}{on[category]['p99_us']:>10}{speedup:>9.2f}x"
+        )
+
+
+def _print_scenarios(report: Dict[str, dict]):
+    print(f"{'SCENARIO':<20}{'COMPILE ms':>11}{'P50 U/S':>16}{'P99 U/S':>18}{'ACCURACY U/S':>16}")
+    for scenario, row in report.items():
+        universal, specific = row["universal"], row["scenario"]
+        print(
+            f"{scenario:<20}{row['compile_ms']:>11}"
+            f"{universal['p50_us']:>8}/{specific['p50_us']:<7}"
+            f"{universal['p99_us']:>9}/{specific['p99_us']:<8}"
+            f"{universal['correct']:>7}/{specific['correct']}/{specific['total']}"
+        )
+        for message, expected, got in row["misses"]:
+            print(f"  ✗ '{message}' -> {got} (expected: {expected})")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark detect_risk latency and accuracy.")
+    parser.add_argument("--size", type=int, default=100_000, help="Synthetic corpus size")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the JSON report here (usable as a later --baseline)")
+    parser.add_argument("--baseline", help="Previous JSON report to compare p99 latency against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p99 regression vs baseline")
+    parser.add_argument("--max-p99-us", type=float, help="Absolute p99 budget per category")
+    parser.add_argument("--min-recall", type=float, default=0.0, help="Minimum recall for every risk level")
+    parser.add_argument("--prefilter-report", action="store_true", help="Compare latency with the keyword prefilter off/on")
+    parser.add_argument("--normalization-report", action="store_true", help="Time the shared normalization pass alone")
+    parser.add_argument("--scenario-report", action="store_true", help="Compare universal vs scenario-aware rules per scenario")
+    args = parser.parse_args(argv)
+
+    print("=" * 64)
+    print(f"RISK DETECTION BENCHMARK - {args.size} messages")
+    print("=" * 64)
+    corpus = generate_corpus(args.size, args.seed)
+    latency = run_latency_benchmark(corpus)
+    _print_latency(latency)
+
+    if args.prefilter_report:
+        print("=" * 64)
+        print("KEYWORD PREFILTER - off vs on")
+        print("=" * 64)
+        _print_prefilter(run_prefilter_comparison(corpus))
+
+    if args.normalization_report:
+        print("=" * 64)
+        print("NORMALIZATION - cost per message")
+        print("=" * 64)
+        _print_latency(run_normalization_benchmark(corpus))
+
+    if args.scenario_report:
+        print("=" * 64)
+        print("SCENARIO RULES - universal vs scenario-aware")
+        print("=" * 64)
+        _print_scenarios(run_scenario_report(corpus))
+
+    print("=" * 64)
+    print(f"ACCURACY - {len(LABELED_CORPUS)} labeled messages")
+    print("=" * 64)
+    accuracy = run_accuracy_check()
+    _print_accuracy(accuracy)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["latency"]
+
+    problems = find_regressions(latency, baseline, args.tolerance, args.max_p99_us)
+    for level in RISK_LEVELS:
+        if accuracy[level]["recall"] < args.min_recall:
+            problems.append(f"{level}: recall {accuracy[level]['recall']} below {args.min_recall}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"latency": latency, "accuracy": accuracy}, f, indent=2, ensure_ascii=False)
+
+    print("=" * 64)
+    if problems:
+        for problem in problems:
+            print(f"FAIL: {problem}")
+        return 1
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
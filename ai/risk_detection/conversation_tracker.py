@@ -0,0 +1,159 @@
+"""
+Conversation-aware incremental risk state for one simulation session.
+
+detect_risk judges a reply on its own, so "1234" reads the same whether or
+not the scammer just asked for an OTP, and a card number typed over several
+messages never shows up in any single one. ConversationRiskTracker keeps a
+few fields of rolling state:
+
+- last_ask:       what the scammer's latest message asked for (otp, pin,
+                  cvv, card, account, aadhaar, payment) or None
+- digit buffer:   digits from consecutive number-only user replies (or any
+                  replies while a number is being asked for), capped at
+                  the longest sensitive number (19 digits)
+
+Each message is scanned once; history is never re-read, so the cost of an
+update is O(len(message)) no matter how long the conversation gets.
+"""
+
+import re
+from typing import Optional
+
+from ai.risk_detection.normalization import normalize
+from ai.risk_detection.numeric_extractor import luhn_valid, verhoeff_valid
+
+# Scammer asks, most specific first; the most specific one in a message wins
+_ASK = re.compile(
+    r"\b(?:"
+    r"(?P<cvv>cvv|cvc|(?:3|three)\s*digit)"
+    r"|(?P<pin>(?:atm\s*|upi\s*|m)?pin)"
+    r"|(?P<otp>otp|one\s*time\s*password|(?:verification|security)?\s*code)"
+    r"|(?P<card>card\s*(?:number|no|details)|(?:16|sixteen)\s*digit)"
+    r"|(?P<aadhaar>aadhaa?r|adhaar|(?:12|twelve)\s*digit)"
+    r"|(?P<account>account\s*(?:number|no|details)|a/c|acc\s*no)"
+    r"|(?P<payment>pay|payment|transfer|fee|deposit|amount|rupees|rs)"
+    r")\b"
+)
+_ASK_PRIORITY = {name: rank for rank, name in enumerate(_ASK.groupindex)}
+_DIGIT_RUN = re.compile(r"\d+")
+# A payment is only answered by an amount: a number with a currency marker, or any number in a "paid" reply
+_MONEY_AMOUNT = re.compile(r"(?:₹|\b(?:rs|inr)\.?)\s*(\d[\d,]*)|(\d[\d,]*)\s*(?:/-|(?:rupees|rs|inr)\b)")
+_PAID = re.compile(r"\b(?:paid|sent|transferred)\b")
+_NUMERIC_REPLY = re.compile(r"[\d\s,.\-]+")
+
+# Digit counts that answer each ask (inclusive)
+ASK_DIGIT_LENGTHS = {
+    "otp": (4, 8),
+    "pin": (4, 6),
+    "cvv": (3, 4),
+    "card": (13, 19),
+    "aadhaar": (12, 12),
+    "account": (8, 18),
+    "payment": (3, 9),
+}
+
+_MAX_BUFFER_DIGITS = 19  # Longest card number
+
+
+def classify_ask(scammer_message: str) -> Optional[str]:
+    """The most specific thing a scammer message asks for, or None."""
+    asks = [match.lastgroup for match in _ASK.finditer(normalize(scammer_message))]
+    return min(asks, key=_ASK_PRIORITY.get, default=None)
+
+
+def _money_runs(runs, text: str):
+    """The digit runs of a reply that are amounts of money."""
+    if _PAID.search(text):
+        return runs
+    return [
+        (match.group(1) or match.group(2)).replace(",", "")
+        for match in _MONEY_AMOUNT.finditer(text)
+    ]
+
+
+class ConversationRiskTracker:
+    """
+    Rolling risk state for one conversation.
+
+    observe_scammer() is called with every scammer message and
+    observe_user() with every user reply after detect_risk; observe_user()
+    can only raise the risk level, never lower it.
+    """
+
+    def __init__(self):
+        self.last_ask: Optional[str] = None
+        self.last_reason: Optional[str] = None
+        self._digits = ""
+
+    def observe_scammer(self, message: str):
+        self.last_ask = classify_ask(message)
+
+    def observe_user(self, message: str, risk: str) -> str:
+        """Update the state with a user reply and return the (possibly raised) risk."""
+        text = normalize(message)
+        runs = _DIGIT_RUN.findall(text)
+        self.last_reason = None
+        if not runs:
+            self._digits = ""
+            return risk
+
+        reason = self._split_leak(runs, text)
+        reason = self._answers_ask(runs, text) or reason
+        if reason:
+            # Reported; later replies start a new buffer
+            self._digits = ""
+            if risk != "HIGH":
+                self.last_reason = reason
+                return "HIGH"
+        return risk
+
+    def _answers_ask(self, runs, text: str) -> Optional[str]:
+        """A number in this reply has the shape the scammer just asked for."""
+        if self.last_ask is None:
+            return None
+        if self.last_ask == "payment":
+            runs = _money_runs(runs, text)
+        low, high = ASK_DIGIT_LENGTHS[self.last_ask]
+        for run in runs:
+            if low <= len(run) <= high:
+                return f"answered_{self.last_ask}"
+        return None
+
+    def _split_leak(self, runs, text: str) -> Optional[str]:
+        """Digits of this reply complete a sensitive number begun in earlier ones."""
+        # Years and counts in ordinary chat are not buffered: only digit-only
+        # replies, or any reply while the scammer is asking for a number
+        if self.last_ask in (None, "payment") and not _NUMERIC_REPLY.fullmatch(text):
+            self._digits = ""
+            return None
+
+        new_digits = "".join(runs)
+        buffer = (self._digits + new_digits)[-_MAX_BUFFER_DIGITS:]
+        self._digits = buffer
+        if len(buffer) <= len(new_digits):
+            return None
+
+        # Numbers ending with this reply that reach back into earlier replies
+        for length in range(len(new_digits) + 1, len(buffer) + 1):
+            digits = buffer[-length:]
+            if 13 <= length <= 19 and luhn_valid(digits):
+                return "split_card"
+            if length == 12 and digits[0] not in "01" and verhoeff_valid(digits):
+                return "split_aadhaar"
+        if self.last_ask is not None and self.last_ask != "payment":
+            low, high = ASK_DIGIT_LENGTHS[self.last_ask]
+            if low <= len(buffer) <= high:
+                return f"split_{self.last_ask}"
+        return None
+
+    def reset(self):
+        self.last_ask = None
+        self.last_reason = None
+        self._digits = ""
+
+    def snapshot(self) -> dict:
+        return {
+            "last_ask": self.last_ask,
+            "last_reason": self.last_reason,
+            "buffered_digits": len(self._digits),
+        }
@@ -0,0 +1,342 @@
+"""
+Message corpora for benchmarking and regression-testing risk detection.
+
+- generate_corpus(): large synthetic corpus of realistic trainee replies
+  (English, Hinglish and Devanagari, varied length) for latency benchmarks.
+- LABELED_CORPUS: hand-labeled replies with the risk level a mentor would
+  expect, used to track precision/recall per risk level.
+- SCENARIO_LABELED_CORPUS: replies whose risk depends on the scenario being
+  simulated, keyed by scenario; checked against that scenario's rules.
+"""
+
+import random
+from typing import Dict, List, Tuple
+
+
+# ================================================
+# SYNTHETIC CORPUS (latency benchmarks)
+# ================================================
+
+NAMES = ["Ramesh Kumar", "Priya Sharma", "John Smith", "Anjali", "Mohammed Irfan", "Sunita Devi"]
+BANKS = ["SBI", "HDFC", "ICICI", "Axis", "Kotak", "PNB", "Bank of Baroda", "Canara", "Chase", "HSBC"]
+APPS = ["gpay", "paytm", "phonepe", "bhim upi", "google pay", "paypal"]
+DOCUMENTS = ["aadhaar", "pan card", "passport", "voter id", "driving licence"]
+SECRETS = ["otp", "cvv", "atm pin", "upi pin", "password", "card number", "account number"]
+
+FILLERS = [
+    "actually I am in the middle of something",
+    "my son usually handles these things",
+    "accha theek hai",
+    "main abhi office mein hoon",
+    "the network here is very bad",
+    "please speak slowly",
+    "मुझे समझ नहीं आ रहा",
+    "I just came back from the market",
+    "kal baat karte hain",
+    "my phone battery is low",
+    "yeh kya ho raha hai",
+    "I was sleeping when you called 😴",
+]
+
+TEMPLATES = {
+    "benign": [
+        "hello",
+        "who are you?",
+        "what is this about?",
+        "tell me more",
+        "kaun bol raha hai?",
+        "aap kahan se bol rahe ho",
+        "I don't have any documents right now",
+        "I have no money currently",
+        "नमस्ते, कौन?",
+        "which company did you say?",
+        "I will call you back later",
+        "my exam is in {year}",
+    ],
+    "hesitation": [
+        "is this safe?",
+        "not sure about this",
+        "sounds suspicious to me",
+        "how do i know this is real",
+        "can you verify who you are?",
+        "wait, let me think",
+        "ruko, let me think about it",
+        "I'm a bit worried about this",
+        "are you official? mujhe doubt hai",
+    ],
+    "compliance": [
+        "ok i am sending",
+        "i will send it now",
+        "let me transfer the amount",
+        "haan ok i will pay",
+        "sure i will do it",
+        "here you go",
+        "done",
+        "sent",
+        "ok sir",
+        "yes i confirm",
+        "theek hai i'll share it",
+    ],
+    "data_sharing": [
+        "my name is {name}",
+        "my {secret} is ready",
+        "the otp is {otp}",
+        "mera {document} number le lo",
+        "my date of birth is 12 march",
+        "i live in Lucknow near the station",
+        "my email is {first}@gmail.com",
+        "मेरा otp {otp} है",
+    ],
+    "numeric": [
+        "{account}",
+        "{card}",
+        "{otp}",
+        "{aadhaar}",
+        "number is {account}",
+        "ABCDE{digits4}F",
+    ],
+    "money": [
+        "{amount} rupees",
+        "Rs.{amount}",
+        "₹{amount} bhej dunga",
+        "{lakh},000",
+        "can I pay {amount} dollars",
+        "I only have {small}k",
+    ],
+    "financial": [
+        "{bank} bank",
+        "from my {app}",
+        "my account is in {bank}",
+        "{app} pe bhej doon?",
+        "to my savings",
+    ],
+}
+
+CATEGORIES = list(TEMPLATES)
+
+
+def _digits(rng: random.Random, n: int) -> str:
+    return str(rng.randint(1, 9)) + "".join(str(rng.randint(0, 9)) for _ in range(n - 1))
+
+
+def _fill(template: str, rng: random.Random) -> str:
+    name = rng.choice(NAMES)
+    return template.format(
+        name=name,
+        first=name.split()[0].lower(),
+        bank=rng.choice(BANKS),
+        app=rng.choice(APPS),
+        document=rng.choice(DOCUMENTS),
+        secret=rng.choice(SECRETS),
+        otp=_digits(rng, 6),
+        account=_digits(rng, rng.randint(9, 16)),
+        card=" ".join(_digits(rng, 4) for _ in range(4)),
+        aadhaar=f"{_digits(rng, 4)} {_digits(rng, 4)} {_digits(rng, 4)}",
+        digits4=_digits(rng, 4),
+        amount=rng.choice(["500", "2000", "5000", "10000", "45000"]),
+        lakh=rng.randint(1, 99),
+        small=rng.randint(1, 50),
+        year=rng.choice(["2024", "2025", "2026"]),
+    )
+
+
+def generate_corpus(size: int = 100_000, seed: int = 42) -> List[Tuple[str, str]]:
+    """
+    Generate `size` (message, category) pairs.
+
+    Categories are spread evenly; about half the messages are padded with
+    filler sentences so lengths range from a single word to a few hundred
+    characters.
+    """
+    rng = random.Random(seed)
+    corpus = []
+
+    for i in range(size):
+        category = CATEGORIES[i % len(CATEGORIES)]
+        message = _fill(rng.choice(TEMPLATES[category]), rng)
+
+        padding = rng.choice([0, 0, 1, 2, 4, 8])
+        if padding:
+            fillers = [rng.choice(FILLERS) for _ in range(padding)]
+            cut = rng.randint(0, padding)
+            message = ", ".join(fillers[:cut] + [message] + fillers[cut:])
+
+        corpus.append((message, category))
+
+    return corpus
+
+
+# ================================================
+# LABELED CORPUS (accuracy regression)
+# ================================================
+
+LABELED_CORPUS: List[Tuple[str, str]] = [
+    # Compliance intent
+    ("ok I will give you", "HIGH"),
+    ("ok i am sending", "HIGH"),
+    ("i will send it now", "HIGH"),
+    ("let me transfer", "HIGH"),
+    ("sure i will do it", "HIGH"),
+    ("here you go", "HIGH"),
+    ("take my details", "HIGH"),
+    ("just sent the files", "HIGH"),
+    ("yes i confirm", "HIGH"),
+    ("i am giving you my details", "HIGH"),
+    ("sending now", "HIGH"),
+    ("paid", "HIGH"),
+    ("haan ok i will pay", "HIGH"),
+    ("theek hai i'll share it", "HIGH"),
+    ("haan main bhej raha hoon", "HIGH"),
+    ("ok bhej diya", "HIGH"),
+    ("fine, check your inbox for the code", "HIGH"),
+    ("ok wait", "HIGH"),
+    ("ok sir", "HIGH"),
+    ("yes ji", "HIGH"),
+
+    # Data sharing
+    ("my name is John Smith", "HIGH"),
+    ("my aadhaar number", "HIGH"),
+    ("the otp is 123456", "HIGH"),
+    ("my pan card", "HIGH"),
+    ("account number", "HIGH"),
+    ("my ssn is 123-45-6789", "HIGH"),
+    ("my credit card number", "HIGH"),
+    ("cvv is 123", "HIGH"),
+    ("my date of birth is 12 march 1990", "HIGH"),
+    ("i live in Lucknow near the station", "HIGH"),
+    ("my email is priya@gmail.com", "HIGH"),
+    ("mera aadhaar le lo", "HIGH"),
+    ("मेरा otp 482913 है", "HIGH"),
+    ("my upi pin is 4321", "HIGH"),
+    ("password is ramesh@123", "HIGH"),
+
+    # Sensitive numbers
+    ("84567389290", "HIGH"),
+    ("4539 1488 0343 6467", "HIGH"),
+    ("2345 6789 0124", "HIGH"),
+    ("482913", "HIGH"),
+    ("ABCDE1234F", "HIGH"),
+    ("number is 30012345678", "HIGH"),
+    ("98765 43210", "HIGH"),
+    ("+91 98765 43210", "HIGH"),
+    ("call me at 98765-43210", "HIGH"),
+    ("it is 482913", "HIGH"),
+    ("it's 482913", "HIGH"),
+
+    # Evasions undone by normalization
+    ("my 0TP is 4 5 6 7 8 9", "HIGH"),
+    ("o.t.p 1 2 3 4 5 6", "HIGH"),
+    ("ＯＴＰ １２３４５６", "HIGH"),
+    ("code ४८२९१३ hai", "HIGH"),
+    ("p1n is 4-3-2-1", "HIGH"),
+    ("4539-1488-0343-6467", "HIGH"),
+
+    # Money
+    ("45,000", "HIGH"),
+    ("5000 rupees", "HIGH"),
+    ("Rs.10000", "HIGH"),
+    ("₹2000 bhej dunga", "HIGH"),
+    ("5,00,000", "HIGH"),
+    ("can I pay 500 dollars", "HIGH"),
+
+    # Financial identifiers
+    ("SBI", "HIGH"),
+    ("hdfc bank", "HIGH"),
+    ("from my gpay", "HIGH"),
+    ("paytm pe bhej doon?", "HIGH"),
+    ("my account is in ICICI", "HIGH"),
+
+    # Hesitation
+    ("is this safe?", "MEDIUM"),
+    ("not sure about this", "MEDIUM"),
+    ("sounds suspicious", "MEDIUM"),
+    ("how do i know this is real", "MEDIUM"),
+    ("i'm not sure about this", "MEDIUM"),
+    ("can you explain more?", "MEDIUM"),
+    ("is this safe to do?", "MEDIUM"),
+    ("wait, let me think", "MEDIUM"),
+    ("I'm a bit worried about this", "MEDIUM"),
+    ("can you verify who you are?", "MEDIUM"),
+    ("are you official?", "MEDIUM"),
+    ("mujhe doubt hai, ruko", "MEDIUM"),
+    ("sign me up i am not sure", "MEDIUM"),
+
+    # Low risk
+    ("hello", "LOW"),
+    ("what is this about?", "LOW"),
+    ("tell me more", "LOW"),
+    ("who are you?", "LOW"),
+    ("I don't have any documents", "LOW"),
+    ("I have no money currently", "LOW"),
+    ("kaun bol raha hai?", "LOW"),
+    ("नमस्ते, कौन?", "LOW"),
+    ("which company did you say?", "LOW"),
+    ("my exam is in 2024", "LOW"),
+    ("I was born in 1985 so I am old", "LOW"),
+    ("call me after 1430", "LOW"),
+    ("what's up i dont get it", "LOW"),
+    ("can you sign me up i am not interested", "LOW"),
+    ("I am not interested", "LOW"),
+    ("I will call the bank myself", "LOW"),
+    ("no, I won't share anything", "LOW"),
+]
+
+# Replies that are only risky (or only hesitant) inside one scenario
+SCENARIO_LABELED_CORPUS: Dict[str, List[Tuple[str, str]]] = {
+    "bank": [
+        ("i'll download the app you mentioned", "HIGH"),
+        ("installing anydesk now", "HIGH"),
+        ("please block the transaction", "HIGH"),
+        ("unblock my account please", "HIGH"),
+        ("what should i click on the link", "HIGH"),
+        ("ok i opened the link", "HIGH"),
+        ("my branch is in andheri", "LOW"),
+        ("i will visit my branch tomorrow", "LOW"),
+        ("banks never ask for this", "LOW"),
+    ],
+    "government": [
+        ("i'll come to the station", "HIGH"),
+        ("how can i settle the matter", "HIGH"),
+        ("please don't arrest me", "HIGH"),
+        ("i will pay the fine", "HIGH"),
+        ("what is the penalty amount", "HIGH"),
+        ("i won't tell anyone", "HIGH"),
+        ("which police station are you from", "MEDIUM"),
+        ("i will call the police myself", "LOW"),
+        ("send me the notice in writing", "LOW"),
+    ],
+    "job_offer": [
+        ("where do i pay the processing fee", "HIGH"),
+        ("attaching my resume now", "HIGH"),
+        ("i will join on monday", "HIGH"),
+        ("i will pay the registration fee", "HIGH"),
+        ("i accept the offer", "HIGH"),
+        ("ok i'll pay the security deposit", "HIGH"),
+        ("can i talk to the hr manager on video", "MEDIUM"),
+        ("what is the job role", "LOW"),
+        ("i applied on linkedin last week", "LOW"),
+    ],
+    "relative_emergency": [
+        ("how much do you need", "HIGH"),
+        ("don't worry i will arrange the money", "HIGH"),
+        ("i won't tell mom", "HIGH"),
+        ("which hospital are you in, i'll send money", "HIGH"),
+        ("send me the account, i'll transfer", "HIGH"),
+        ("let me call you on video first", "MEDIUM"),
+        ("call me from your own number", "MEDIUM"),
+        ("i'll ask dad about this", "LOW"),
+    ],
+    "lottery_offer": [
+        ("how do i claim the prize", "HIGH"),
+        ("i want to claim my prize", "HIGH"),
+        ("what is the tax amount i need to pay", "HIGH"),
+        ("where do i send the fee", "HIGH"),
+        ("yay i won!", "HIGH"),
+        ("i'll pay the processing fee", "HIGH"),
+        ("this sounds too good to be true", "MEDIUM"),
+        ("i never entered any lottery", "LOW"),
+        ("which company is this", "LOW"),
+    ],
+}
+
+RISK_LEVELS = ["HIGH", "MEDIUM", "LOW"]
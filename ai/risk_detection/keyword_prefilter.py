@@ -0,0 +1,277 @@
+"""
+Keyword prefilter for the regex risk rules.
+
+Most chat turns match no rule at all, yet every regex used to run on every
+message. This module derives, for each pattern, the literal keywords any match
+must contain (e.g. "otp", "transfer", a digit) straight from the regex syntax
+tree, builds one Aho-Corasick automaton over all of them, and scans each
+message once. Only patterns whose required keywords were all seen are
+evaluated; a message that satisfies no pattern skips the regex engine entirely.
+
+The derivation is conservative: a pattern is only skipped when it provably
+cannot match, so results are identical with the prefilter on or off.
+"""
+
+import re
+import time
+from typing import Dict, FrozenSet, List, Optional, Set
+
+try:
+    import re._parser as sre_parse  # Python 3.11+
+    from re._constants import (
+        LITERAL, SUBPATTERN, BRANCH, MAX_REPEAT, MIN_REPEAT, POSSESSIVE_REPEAT,
+        ATOMIC_GROUP, IN, CATEGORY, CATEGORY_DIGIT, ASSERT, AT,
+    )
+except ImportError:  # Python < 3.11
+    import sre_parse
+    from sre_constants import (
+        LITERAL, SUBPATTERN, BRANCH, MAX_REPEAT, MIN_REPEAT,
+        IN, CATEGORY, CATEGORY_DIGIT, ASSERT, AT,
+    )
+    POSSESSIVE_REPEAT = ATOMIC_GROUP = None
+
+
+# Stand-in keyword for "any decimal digit" (\d); messages are folded so every
+# digit becomes this character before scanning.
+DIGIT = "0"
+_DIGITS = re.compile(r"\d")
+
+# Characters that re.IGNORECASE treats as equal to an ASCII letter but that
+# str.lower() does not map onto it.
+_CASE_FIXES = str.maketrans({"\u0131": "i", "\u0130": "i", "\u017f": "s", "\u212a": "k"})
+
+_REPEATS = {MAX_REPEAT, MIN_REPEAT, POSSESSIVE_REPEAT} - {None}
+
+
+def fold(text: str) -> str:
+    """Normalize text the way the automaton expects: case-folded, digits as DIGIT."""
+    return _DIGITS.sub(DIGIT, text.translate(_CASE_FIXES).lower())
+
+
+# ================================================
+# REQUIRED-KEYWORD EXTRACTION
+# ================================================
+
+def _best_clause(clauses: List[FrozenSet[str]]) -> Optional[FrozenSet[str]]:
+    """Pick the most selective any-of clause: longest shortest keyword, non-digit first."""
+    if not clauses:
+        return None
+    return max(clauses, key=lambda c: (min(len(k) for k in c), DIGIT not in c, -len(c)))
+
+
+def _clauses(items) -> List[FrozenSet[str]]:
+    """
+    Keyword clauses for a parsed sequence: every returned any-of set must
+    have at least one member present in any text the sequence matches.
+    """
+    clauses = []
+    run = []
+
+    def close_run():
+        if run:
+            # Keywords are matched against fold(text), so fold them the same way (digits included)
+            clauses.append(frozenset([fold("".join(run))]))
+            run.clear()
+
+    for op, av in items:
+        if op is LITERAL:
+            run.append(chr(av))
+            continue
+        if op is AT:
+            # Zero-width (\b, ^, $): literals on either side stay adjacent
+            continue
+
+        close_run()
+
+        if op is SUBPATTERN:
+            clauses.extend(_clauses(av[-1]))
+        elif op is ATOMIC_GROUP:
+            clauses.extend(_clauses(av))
+        elif op is BRANCH:
+            alternatives = []
+            for branch in av[1]:
+                best = _best_clause(_clauses(branch))
+                if best is None:
+                    alternatives = None
+                    break
+                alternatives.append(best)
+            if alternatives:
+                clauses.append(frozenset().union(*alternatives))
+        elif op in _REPEATS:
+            low, _, body = av
+            if low >= 1:
+                clauses.extend(_clauses(body))
+        elif op is IN:
+            if av == [(CATEGORY, CATEGORY_DIGIT)]:
+                clauses.append(frozenset([DIGIT]))
+        elif op is ASSERT:
+            direction, body = av
+            # A positive lookahead/behind still has to find its text in the message
+            clauses.extend(_clauses(body))
+
+    close_run()
+    return clauses
+
+
+def required_keywords(pattern: str, flags: int = 0) -> List[FrozenSet[str]]:
+    """
+    Keyword clauses that any match of `pattern` must satisfy.
+
+    Returns an empty list when nothing can be guaranteed; such patterns are
+    always evaluated.
+    """
+    return _clauses(sre_parse.parse(pattern, flags))
+
+
+# ================================================
+# AHO-CORASICK AUTOMATON
+# ================================================
+
+class AhoCorasick:
+    """Multi-keyword matcher that reports every keyword found in one pass."""
+
+    def __init__(self, keywords):
+        self._goto: List[Dict[str, int]] = [{}]
+        outputs: List[Set[str]] = [set()]
+
+        for keyword in keywords:
+            state = 0
+            for ch in keyword:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    outputs.append(set())
+                state = next_state
+            outputs[state].add(keyword)
+
+        # Breadth-first failure links, then flatten into a full transition
+        # table so scanning never has to follow failure links.
+        fail = [0] * len(self._goto)
+        order = list(self._goto[0].values())
+        for state in order:
+            for ch, child in self._goto[state].items():
+                order.append(child)
+                fallback = fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                fail[child] = target if target != child else 0
+                outputs[child] |= outputs[fail[child]]
+
+        self._delta: List[Dict[str, int]] = [dict(self._goto[0])] + [None] * (len(self._goto) - 1)
+        for state in order:
+            row = dict(self._delta[fail[state]])
+            row.update(self._goto[state])
+            self._delta[state] = row
+        self._outputs = [frozenset(o) for o in outputs]
+
+    def find_all(self, text: str) -> Set[str]:
+        """Return the set of keywords occurring anywhere in `text`."""
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        found = set()
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                found |= outputs[state]
+        return found
+
+
+# ================================================
+# PREFILTER
+# ================================================
+
+class KeywordPrefilter:
+    """
+    Compiles named pattern categories and evaluates only the patterns whose
+    required keywords occur in the message.
+    """
+
+    def __init__(
+        self,
+        categories: Dict[str, List[str]],
+        flags: int = re.IGNORECASE,
+        category_flags: Optional[Dict[str, int]] = None
+    ):
+        self.enabled = True
+        self._patterns: Dict[str, List[tuple]] = {}
+        self._clauses: List[List[FrozenSet[str]]] = []
+        self._by_keyword: Dict[str, List[int]] = {}
+        self._unconditional: Set[int] = set()  # Patterns with no derivable keyword
+
+        for name, patterns in categories.items():
+            category_flag = (category_flags or {}).get(name, flags)
+            compiled = []
+            for pattern in patterns:
+                pattern_id = len(self._clauses)
+                clauses = required_keywords(pattern, category_flag)
+                self._clauses.append(clauses)
+                compiled.append((pattern_id, re.compile(pattern, category_flag)))
+                if not clauses:
+                    self._unconditional.add(pattern_id)
+                for keyword in set().union(*clauses):
+                    self._by_keyword.setdefault(keyword, []).append(pattern_id)
+            self._patterns[name] = compiled
+
+        self._automaton = AhoCorasick(sorted(self._by_keyword))
+        self.stats = {"messages": 0, "short_circuited": 0, "patterns_skipped": 0, "patterns_run": 0}
+
+    @property
+    def pattern_count(self) -> int:
+        return len(self._clauses)
+
+    def scan(self, text: str) -> Optional[Set[int]]:
+        """
+        Ids of the patterns that can match `text` (one pass over the text),
+        or None when the prefilter is disabled and everything must run.
+        """
+        if not self.enabled:
+            return None
+
+        seen = self._automaton.find_all(fold(text))
+        live = set(self._unconditional)
+        for keyword in seen:
+            for pattern_id in self._by_keyword[keyword]:
+                if pattern_id not in live and all(not c.isdisjoint(seen) for c in self._clauses[pattern_id]):
+                    live.add(pattern_id)
+
+        self.stats["messages"] += 1
+        if not live:
+            self.stats["short_circuited"] += 1
+        return live
+
+    @staticmethod
+    def nothing_can_match(live: Optional[Set[int]]) -> bool:
+        """True when scan() ruled out every pattern in every category."""
+        return live is not None and not live
+
+    def search(self, category: str, text: str, live: Optional[Set[int]], profiler=None) -> Optional[re.Match]:
+        """
+        First match of any live pattern in `category`, or None. With a
+        profiler (see profiler.py), each evaluated pattern is timed.
+        """
+        for pattern_id, compiled in self._patterns[category]:
+            if live is not None and pattern_id not in live:
+                self.stats["patterns_skipped"] += 1
+                continue
+            self.stats["patterns_run"] += 1
+            if profiler is None:
+                match = compiled.search(text)
+            else:
+                started = time.perf_counter_ns()
+                match = compiled.search(text)
+                profiler.record(category, compiled.pattern, time.perf_counter_ns() - started, match is not None, text)
+            if match:
+                return match
+        return None
+
+    def short_circuit_ratio(self) -> float:
+        messages = self.stats["messages"]
+        return self.stats["short_circuited"] / messages if messages else 0.0
+
+    def reset_stats(self):
+        for key in self.stats:
+            self.stats[key] = 0
@@ -0,0 +1,94 @@
+"""
+Shared normalization pass for risk detection.
+
+Every rule category runs against one normalized view of the message instead
+of re-lowercasing it per check. Normalization also undoes the cheap evasions
+scammers coach victims into (or that trainees try): full-width and other
+compatibility characters, non-ASCII digits, look-alike spellings such as
+"0TP" / "o.t.p", and digits typed with separators ("4 5 6 7").
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+
+class _DigitTable(dict):
+    """str.translate table mapping any Unicode decimal digit to ASCII, built lazily."""
+
+    def __missing__(self, codepoint: int) -> str:
+        char = chr(codepoint)
+        value = unicodedata.decimal(char, None)
+        self[codepoint] = str(value) if value is not None else char
+        return self[codepoint]
+
+
+_ASCII_DIGITS = _DigitTable()
+
+# Look-alike characters accepted for each letter of an obfuscated keyword
+_LOOKALIKES = {"o": "o0", "i": "i1!", "a": "a@4", "e": "e3", "s": "s5$"}
+# Letters may be split by punctuation ("o.t.p", "o-tp"); by whitespace only when every
+# letter is split the same way ("o t p"), so "up i" and "sto p in" stay separate words
+_SEPARATOR = r"[.\-_*]{0,2}"
+_SPACED_SEPARATOR = r"[.\-_*]?\s"
+
+# Short sensitive keywords people spell out or disguise
+OBFUSCATED_TERMS = ["otp", "pin", "cvv", "upi", "pan"]
+
+
+def _obfuscated_term(term: str) -> str:
+    parts = []
+    for ch in term:
+        lookalikes = _LOOKALIKES.get(ch, ch)
+        parts.append(f"[{re.escape(lookalikes)}]" if len(lookalikes) > 1 else re.escape(ch))
+    spaced = f"(?P<{term}_sep>{_SPACED_SEPARATOR})".join(parts[:2]) + "".join(
+        f"(?P={term}_sep){part}" for part in parts[2:]
+    )
+    return f"{_SEPARATOR.join(parts)}|{spaced}"
+
+
+_OBFUSCATION = re.compile(
+    r"(?<![a-z0-9])(?:" + "|".join(f"(?P<{t}>{_obfuscated_term(t)})" for t in OBFUSCATED_TERMS) + r")(?![a-z0-9])"
+)
+
+# "4 5 6 7", "1-2-3-4-5-6": single digits typed one at a time
+_SPACED_DIGITS = re.compile(r"(?<!\d)\d(?:[ .\-]\d(?!\d)){3,}")
+# "98765 43210", "+91 98765-43210", "0 9876543210": Indian mobile numbers, joined to their 10 digits
+_PHONE_DIGITS = re.compile(r"(?<![\d+])(?:\+91[ \-]?|91[ \-]|0[ \-]?)?([6-9]\d{4})[ \-]?(\d{5})(?!\d)")
+# "1234-5678-9012-3456", "1234 567 890": three or more 3-4 digit groups
+_GROUPED_DIGITS = re.compile(r"(?<!\d)\d{3,4}(?:[ \-]\d{3,4}(?!\d)){2,}")
+_DIGIT_SEPARATORS = str.maketrans("", "", " .-")
+
+
+def _join_digits(match: re.Match) -> str:
+    return match.group().translate(_DIGIT_SEPARATORS)
+
+
+def _join_phone(match: re.Match) -> str:
+    return match.group(1) + match.group(2)
+
+
+def _plain_term(match: re.Match) -> str:
+    return match.lastgroup
+
+
+@lru_cache(maxsize=4096)
+def normalize(text: str) -> str:
+    """
+    Normalized, lowercased view of a message used by every risk rule.
+
+    - NFKC (full-width / compatibility forms to their plain equivalents)
+    - any Unicode decimal digit (Devanagari, Arabic-Indic, ...) to ASCII
+    - disguised keywords ("0TP", "o.t.p", "p1n") to their plain spelling
+    - separated digits ("4 5 6 7", "1234-5678-9012-3456") joined up
+
+    Results are cached, so detect_risk and get_risk_explanation on the same
+    message share one pass.
+    """
+    if not text.isascii():
+        text = unicodedata.normalize("NFKC", text).translate(_ASCII_DIGITS)
+    text = text.strip().lower()
+    text = _OBFUSCATION.sub(_plain_term, text)
+    text = _SPACED_DIGITS.sub(_join_digits, text)
+    text = _PHONE_DIGITS.sub(_join_phone, text)
+    return _GROUPED_DIGITS.sub(_join_digits, text)
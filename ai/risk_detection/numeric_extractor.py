@@ -0,0 +1,172 @@
+"""
+Checksum-validated numeric extractor for risk detection.
+
+Finds every digit run in a (normalized) message in one pass and classifies
+it from its length, checksum and immediate context:
+
+- card:            13-19 digits passing the Luhn check
+- aadhaar:         12 digits, not starting with 0/1, passing Verhoeff
+- phone:           10 digits starting 6-9 (an Indian mobile number)
+- account_number:  any other run of 8+ digits
+- pan:             4 digits inside a PAN-shaped token (ABCDE1234F)
+- money:           amounts with a currency marker, unit or Indian grouping
+- otp:             4-8 digits next to an OTP/PIN/code mention, or sent alone;
+                   6 digits right after "is"/"it's" ("it is 482913")
+
+Anything else (years, times, small counts) is not sensitive, which keeps
+"my exam is in 2024" from triggering the mentor.
+"""
+
+import re
+from typing import List, Optional
+
+_NUMBER = re.compile(r"\d+(?:,\d+)*")
+_INDIAN_GROUPING = re.compile(r"\d{1,3}(?:,\d{2,3})+")
+_CURRENCY_BEFORE = re.compile(r"(?:(?<![a-z])rs\.?|₹|\$|(?<![a-z])inr|(?<![a-z])usd)\s*$")
+_UNIT_AFTER = re.compile(r"(?<!\s)\s*(?:rupees?|dollars?|lakhs?|lac|crores?|thousand|k|hundred)\b")
+_OTP_CONTEXT = re.compile(r"\b(?:otp|code|pin|cvv|password|passcode)\b")
+_BARE_NUMBER = re.compile(r"[\d,\s\-.]+")
+# "it is 482913", "it's 482913": a code given as an answer (years stay harmless at 4 digits)
+_ANSWER_BEFORE = re.compile(r"\b(?:is|it'?s)\s*$")
+
+_CONTEXT_WINDOW = 8  # Characters inspected on each side of a number
+
+
+# ================================================
+# CHECKSUMS
+# ================================================
+
+def luhn_valid(digits: str) -> bool:
+    """Luhn (mod 10) check used by payment card numbers."""
+    total = 0
+    for i, ch in enumerate(reversed(digits)):
+        d = ord(ch) - 48
+        if i % 2:
+            d *= 2
+            if d > 9:
+                d -= 9
+        total += d
+    return total % 10 == 0
+
+
+_VERHOEFF_D = [
+    [0, 1, 2, 3, 4, 5, 6, 7, 8, 9],
+    [1, 2, 3, 4, 0, 6, 7, 8, 9, 5],
+    [2, 3, 4, 0, 1, 7, 8, 9, 5, 6],
+    [3, 4, 0, 1, 2, 8, 9, 5, 6, 7],
+    [4, 0, 1, 2, 3, 9, 5, 6, 7, 8],
+    [5, 9, 8, 7, 6, 0, 4, 3, 2, 1],
+    [6, 5, 9, 8, 7, 1, 0, 4, 3, 2],
+    [7, 6, 5, 9, 8, 2, 1, 0, 4, 3],
+    [8, 7, 6, 5, 9, 3, 2, 1, 0, 4],
+    [9, 8, 7, 6, 5, 4, 3, 2, 1, 0],
+]
+_VERHOEFF_P = [
+    [0, 1, 2, 3, 4, 5, 6, 7, 8, 9],
+    [1, 5, 7, 6, 2, 8, 3, 0, 9, 4],
+    [5, 8, 0, 3, 7, 9, 6, 1, 4, 2],
+    [8, 9, 1, 6, 0, 4, 3, 5, 2, 7],
+    [9, 4, 5, 3, 1, 2, 6, 8, 7, 0],
+    [4, 2, 8, 6, 5, 7, 3, 9, 0, 1],
+    [2, 7, 9, 3, 8, 0, 6, 4, 1, 5],
+    [7, 0, 4, 6, 9, 1, 3, 2, 5, 8],
+]
+
+
+def verhoeff_valid(digits: str) -> bool:
+    """Verhoeff check used by Aadhaar numbers."""
+    check = 0
+    for i, ch in enumerate(reversed(digits)):
+        check = _VERHOEFF_D[check][_VERHOEFF_P[i % 8][ord(ch) - 48]]
+    return check == 0
+
+
+# ================================================
+# EXTRACTION
+# ================================================
+
+class NumericSpan:
+    """One digit run found in a message and what it looks like."""
+
+    __slots__ = ("start", "end", "digits", "kind")
+
+    def __init__(self, start: int, end: int, digits: str, kind: Optional[str]):
+        self.start = start
+        self.end = end
+        self.digits = digits
+        self.kind = kind
+
+    @property
+    def sensitive(self) -> bool:
+        return self.kind is not None
+
+    def __repr__(self):
+        return f"NumericSpan({self.start}, {self.end}, {self.digits!r}, {self.kind!r})"
+
+
+def _is_pan(text: str, start: int, end: int) -> bool:
+    """ABCDE1234F: five letters, the 4 digits, one letter, as a whole token."""
+    if start < 5 or end >= len(text):
+        return False
+    before = text[start - 5:start]
+    return (
+        before.isalpha() and before.isascii()
+        and text[end].isalpha() and text[end].isascii()
+        and (start == 5 or not text[start - 6].isalnum())
+        and (end + 1 == len(text) or not text[end + 1].isalnum())
+    )
+
+
+def _classify(text: str, start: int, end: int, raw: str, otp_context: bool, bare: bool) -> Optional[str]:
+    digits = raw.replace(",", "") if "," in raw else raw
+    length = len(digits)
+
+    if (
+        _CURRENCY_BEFORE.search(text, max(0, start - _CONTEXT_WINDOW), start)
+        or _UNIT_AFTER.match(text, end)
+        or ("," in raw and _INDIAN_GROUPING.fullmatch(raw))
+    ):
+        return "money"
+    if 13 <= length <= 19 and luhn_valid(digits):
+        return "card"
+    if length == 12 and digits[0] not in "01" and verhoeff_valid(digits):
+        return "aadhaar"
+    if length == 10 and digits[0] in "6789":
+        return "phone"
+    if length >= 8:
+        return "account_number"
+    if length == 4 and _is_pan(text, start, end):
+        return "pan"
+    if length >= 4 and (otp_context or bare):
+        return "otp"
+    if length == 6 and _ANSWER_BEFORE.search(text, max(0, start - _CONTEXT_WINDOW), start):
+        return "otp"
+    return None
+
+
+def extract_numbers(text: str) -> List[NumericSpan]:
+    """
+    Every digit run in `text` with its classification (kind None = harmless).
+
+    `text` should be the normalized view, so digits are ASCII, lowercase and
+    separated groups ("1234 5678 9012 3456") are already joined.
+    """
+    matches = list(_NUMBER.finditer(text))
+    if not matches:
+        return []
+
+    otp_context = _OTP_CONTEXT.search(text) is not None
+    bare = len(matches) == 1 and _BARE_NUMBER.fullmatch(text) is not None
+
+    return [
+        NumericSpan(m.start(), m.end(), m.group(), _classify(text, m.start(), m.end(), m.group(), otp_context, bare))
+        for m in matches
+    ]
+
+
+def find_sensitive_number(text: str) -> Optional[NumericSpan]:
+    """First sensitive number in `text`, or None."""
+    for span in extract_numbers(text):
+        if span.kind is not None:
+            return span
+    return None
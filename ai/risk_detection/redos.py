@@ -0,0 +1,447 @@
+"""
+ReDoS checks for risk rule patterns.
+
+Covers every rule pack pattern plus the engine's own module-level regexes.
+Two layers, both run in CI and on every rule-pack reload:
+
+1. Static analysis of each pattern's syntax tree:
+   - error:   nested unbounded quantifiers, e.g. (\\w+\\s*)+
+   - error:   alternation inside an unbounded repeat whose branches can start
+              with the same character, e.g. (\\w|\\w\\w)+
+   - warning: two unbounded repeats that can consume the same characters with
+              only optional items between them, e.g. \\s*.*\\s* (polynomial)
+   - warning: unbounded repeats inside a lookaround, e.g. (?=.*otp)
+2. Fuzzing: adversarial strings built from the pattern's own literals and
+   repeat bodies are searched under a per-call time budget.
+
+Usage:
+    python -m ai.risk_detection.redos                   # active rule pack
+    python -m ai.risk_detection.redos rules.json --max-length 5000 --budget-ms 20
+"""
+
+import argparse
+import itertools
+import re
+import string
+import sys
+import time
+from typing import Dict, Iterable, List, Optional
+
+from ai.risk_detection.keyword_prefilter import (
+    sre_parse, LITERAL, SUBPATTERN, BRANCH, MAX_REPEAT, MIN_REPEAT, POSSESSIVE_REPEAT,
+    ATOMIC_GROUP, IN, CATEGORY, ASSERT, AT, required_keywords,
+)
+
+try:
+    from re._constants import (
+        ANY, NOT_LITERAL, RANGE, NEGATE, ASSERT_NOT, MAXREPEAT,
+        AT_BEGINNING, AT_BEGINNING_LINE, AT_BEGINNING_STRING,
+        CATEGORY_DIGIT, CATEGORY_NOT_DIGIT, CATEGORY_SPACE, CATEGORY_NOT_SPACE,
+        CATEGORY_WORD, CATEGORY_NOT_WORD,
+    )
+except ImportError:  # Python < 3.11
+    from sre_constants import (
+        ANY, NOT_LITERAL, RANGE, NEGATE, ASSERT_NOT, MAXREPEAT,
+        AT_BEGINNING, AT_BEGINNING_LINE, AT_BEGINNING_STRING,
+        CATEGORY_DIGIT, CATEGORY_NOT_DIGIT, CATEGORY_SPACE, CATEGORY_NOT_SPACE,
+        CATEGORY_WORD, CATEGORY_NOT_WORD,
+    )
+
+_REPEATS = {MAX_REPEAT, MIN_REPEAT, POSSESSIVE_REPEAT} - {None}
+_LINE_STARTS = {AT_BEGINNING, AT_BEGINNING_LINE, AT_BEGINNING_STRING}
+
+# Characters used to approximate character classes when testing for overlap
+PROBE_ALPHABET = string.ascii_lowercase + string.digits + " \t\n.,:;!?'\"-_@#$%&*/()+=₹é१"
+
+_CATEGORY_TESTS = {
+    CATEGORY_DIGIT: str.isdigit,
+    CATEGORY_NOT_DIGIT: lambda ch: not ch.isdigit(),
+    CATEGORY_SPACE: str.isspace,
+    CATEGORY_NOT_SPACE: lambda ch: not ch.isspace(),
+    CATEGORY_WORD: lambda ch: ch.isalnum() or ch == "_",
+    CATEGORY_NOT_WORD: lambda ch: not (ch.isalnum() or ch == "_"),
+}
+
+
+class ReDoSFinding:
+    """One problem found in one pattern."""
+
+    def __init__(self, pattern: str, severity: str, message: str, category: str = ""):
+        self.pattern = pattern
+        self.severity = severity  # "error" or "warning"
+        self.message = message
+        self.category = category
+
+    def __str__(self):
+        where = f"{self.category}: " if self.category else ""
+        return f"[{self.severity}] {where}{self.pattern} - {self.message}"
+
+
+# ================================================
+# STATIC ANALYSIS
+# ================================================
+
+def _class_chars(items) -> frozenset:
+    """Probe characters matched by the body of an IN (character class) node."""
+    negate = False
+    matched = set()
+    for op, av in items:
+        if op is NEGATE:
+            negate = True
+        elif op is LITERAL:
+            matched.add(chr(av))
+        elif op is RANGE:
+            matched.update(ch for ch in PROBE_ALPHABET if av[0] <= ord(ch) <= av[1])
+        elif op is CATEGORY and av in _CATEGORY_TESTS:
+            matched.update(ch for ch in PROBE_ALPHABET if _CATEGORY_TESTS[av](ch))
+    if negate:
+        return frozenset(PROBE_ALPHABET) - matched
+    return frozenset(matched)
+
+
+def _chars(items) -> frozenset:
+    """Every probe character a sequence can consume anywhere."""
+    result = set()
+    for op, av in items:
+        if op is LITERAL:
+            result.add(chr(av))
+        elif op is NOT_LITERAL or op is ANY:
+            result.update(PROBE_ALPHABET)
+        elif op is IN:
+            result |= _class_chars(av)
+        elif op is SUBPATTERN:
+            result |= _chars(av[-1])
+        elif op is ATOMIC_GROUP:
+            result |= _chars(av)
+        elif op is BRANCH:
+            for branch in av[1]:
+                result |= _chars(branch)
+        elif op in _REPEATS:
+            result |= _chars(av[2])
+    return frozenset(result)
+
+
+def _nullable(items) -> bool:
+    """Whether a sequence can match the empty string."""
+    for op, av in items:
+        if op is AT or op is ASSERT or op is ASSERT_NOT:
+            continue
+        if op is SUBPATTERN and _nullable(av[-1]):
+            continue
+        if op is ATOMIC_GROUP and _nullable(av):
+            continue
+        if op is BRANCH and any(_nullable(branch) for branch in av[1]):
+            continue
+        if op in _REPEATS and (av[0] == 0 or _nullable(av[2])):
+            continue
+        return False
+    return True
+
+
+def _first(items) -> frozenset:
+    """Probe characters a non-empty match of the sequence can start with."""
+    result = set()
+    for op, av in items:
+        if op is LITERAL:
+            result.add(chr(av))
+            return frozenset(result)
+        if op is NOT_LITERAL or op is ANY:
+            return frozenset(result | set(PROBE_ALPHABET))
+        if op is IN:
+            return frozenset(result | _class_chars(av))
+        if op is SUBPATTERN:
+            result |= _first(av[-1])
+            if not _nullable(av[-1]):
+                return frozenset(result)
+        elif op is ATOMIC_GROUP:
+            result |= _first(av)
+            if not _nullable(av):
+                return frozenset(result)
+        elif op is BRANCH:
+            for branch in av[1]:
+                result |= _first(branch)
+            if not any(_nullable(branch) for branch in av[1]):
+                return frozenset(result)
+        elif op in _REPEATS:
+            result |= _first(av[2])
+            if av[0] > 0 and not _nullable(av[2]):
+                return frozenset(result)
+    return frozenset(result)
+
+
+def _is_unbounded(op, av) -> bool:
+    return op in _REPEATS and av[1] == MAXREPEAT
+
+
+def _contains_unbounded(items) -> bool:
+    for op, av in items:
+        if _is_unbounded(op, av):
+            return True
+        if op is SUBPATTERN and _contains_unbounded(av[-1]):
+            return True
+        if op is ATOMIC_GROUP and _contains_unbounded(av):
+            return True
+        if op is BRANCH and any(_contains_unbounded(branch) for branch in av[1]):
+            return True
+        if op in _REPEATS and _contains_unbounded(av[2]):
+            return True
+    return False
+
+
+def _unbounded_chars(items) -> frozenset:
+    """Characters consumed by unbounded repeats anywhere inside a sequence."""
+    result = set()
+    for op, av in items:
+        if _is_unbounded(op, av):
+            result |= _chars(av[2])
+        elif op is SUBPATTERN:
+            result |= _unbounded_chars(av[-1])
+        elif op is ATOMIC_GROUP:
+            result |= _unbounded_chars(av)
+        elif op is BRANCH:
+            for branch in av[1]:
+                result |= _unbounded_chars(branch)
+        elif op in _REPEATS:
+            result |= _unbounded_chars(av[2])
+    return frozenset(result)
+
+
+def _walk(items, findings: List[str], warnings: List[str], repeat_first: Optional[frozenset] = None):
+    """
+    Collect findings for a parsed sequence. `repeat_first` is the first-char
+    set of the innermost enclosing repeat body (None outside repeats).
+    """
+    previous_unbounded: Optional[frozenset] = None
+    anchored = False  # Directly after ^ / \A, where a lookaround runs once per line
+
+    for op, av in items:
+        if _is_unbounded(op, av):
+            body = av[2]
+            # (a+)+ is exponential; (,\d+)* is not, because every iteration
+            # must start with a character the inner repeat cannot consume
+            if op is not POSSESSIVE_REPEAT and _unbounded_chars(body) & _first(body):
+                findings.append("nested unbounded quantifiers (exponential backtracking)")
+            if previous_unbounded is not None and previous_unbounded & _first(body):
+                warnings.append("adjacent unbounded repeats can consume the same characters (polynomial backtracking)")
+            previous_unbounded = _chars(body)
+            anchored = False
+            _walk(body, findings, warnings, _first(body))
+            continue
+
+        if op is BRANCH:
+            if repeat_first is not None:
+                firsts = [_first(branch) for branch in av[1]]
+                overlapping = any(a & b for a, b in itertools.combinations(firsts, 2))
+                # An empty alternative lets the next iteration start where another alternative would
+                if any(_nullable(branch) for branch in av[1]):
+                    overlapping = overlapping or any(first & repeat_first for first in firsts)
+                if overlapping:
+                    findings.append("alternation inside a repeat has branches starting with the same character")
+            for branch in av[1]:
+                _walk(branch, findings, warnings, repeat_first)
+        elif op is SUBPATTERN:
+            _walk(av[-1], findings, warnings, repeat_first)
+        elif op is ATOMIC_GROUP:
+            _walk(av, findings, warnings, repeat_first)
+        elif op in _REPEATS:
+            _walk(av[2], findings, warnings, _first(av[2]) if av[1] > 1 else repeat_first)
+        elif op is ASSERT or op is ASSERT_NOT:
+            if _contains_unbounded(av[1]) and not anchored:
+                warnings.append("unbounded repeat inside a lookaround rescans the message at every position")
+            _walk(av[1], findings, warnings, repeat_first)
+
+        anchored = op is AT and av in _LINE_STARTS
+
+        # Only optional, zero-width or nullable items keep two repeats "adjacent"
+        if op is AT or op is ASSERT or op is ASSERT_NOT:
+            continue
+        if op in _REPEATS and av[0] == 0:
+            continue
+        if not _nullable([(op, av)]):
+            previous_unbounded = None
+
+
+def analyze_pattern(pattern: str, flags: int = re.IGNORECASE, category: str = "") -> List[ReDoSFinding]:
+    """Static ReDoS findings for one pattern (empty when it looks safe)."""
+    errors: List[str] = []
+    warnings: List[str] = []
+    _walk(sre_parse.parse(pattern, flags), errors, warnings)
+    return (
+        [ReDoSFinding(pattern, "error", message, category) for message in dict.fromkeys(errors)]
+        + [ReDoSFinding(pattern, "warning", message, category) for message in dict.fromkeys(warnings)]
+    )
+
+
+# ================================================
+# FUZZING
+# ================================================
+
+def _seed_chunks(pattern: str, flags: int) -> List[str]:
+    """Literals and repeat-body characters the pattern itself is built from."""
+    chunks = {keyword for clause in required_keywords(pattern, flags) for keyword in clause}
+    chunks.discard("0")
+    chunks.update(["0", " ", "a", "ok ", "i will ", ", "])
+
+    def collect(items):
+        for op, av in items:
+            if op in _REPEATS:
+                chars = sorted(_chars(av[2]))
+                chunks.update(chars[:3] + chars[-2:])
+                collect(av[2])
+            elif op is SUBPATTERN:
+                collect(av[-1])
+            elif op is ATOMIC_GROUP:
+                collect(av)
+            elif op is BRANCH:
+                for branch in av[1]:
+                    collect(branch)
+            elif op is ASSERT or op is ASSERT_NOT:
+                collect(av[1])
+
+    collect(sre_parse.parse(pattern, flags))
+    return sorted(chunks)
+
+
+def _input_lengths(max_length: int) -> List[int]:
+    """
+    Small steps first, so an exponential pattern blows the budget on a short
+    input instead of hanging the checker on a long one.
+    """
+    lengths = list(range(8, min(max_length, 64) + 1, 4))
+    length = 64
+    while length < max_length:
+        length = min(max_length, int(length * 1.5))
+        lengths.append(length)
+    return lengths
+
+
+def _pump(unit: str, length: int) -> str:
+    return (unit * (length // len(unit) + 1))[:length - 1] + "\x00"
+
+
+def adversarial_inputs(pattern: str, max_length: int = 2000, flags: int = re.IGNORECASE) -> Iterable[str]:
+    """
+    Pumped strings that try to maximize backtracking, each ending in a
+    mismatch, in increasing length.
+    """
+    chunks = _seed_chunks(pattern, flags)
+    units = chunks + [a + b for a, b in itertools.permutations(chunks, 2)]
+    for length in _input_lengths(max_length):
+        for unit in units:
+            yield _pump(unit, length)
+
+
+def _search_ms(compiled: re.Pattern, text: str) -> float:
+    started = time.perf_counter()
+    compiled.search(text)
+    return (time.perf_counter() - started) * 1000
+
+
+def fuzz_pattern(
+    pattern: str,
+    max_length: int = 2000,
+    budget_ms: float = 10.0,
+    time_limit_seconds: float = 1.0,
+    flags: int = re.IGNORECASE,
+    category: str = ""
+) -> List[ReDoSFinding]:
+    """
+    Search adversarial inputs until `time_limit_seconds` runs out; any single
+    search slower than `budget_ms` is an error.
+    """
+    compiled = re.compile(pattern, flags)
+    deadline = time.perf_counter() + time_limit_seconds
+    for text in adversarial_inputs(pattern, max_length, flags):
+        elapsed_ms = _search_ms(compiled, text)
+        if elapsed_ms > budget_ms:
+            # Re-time before failing so a GC pause or scheduler hiccup is not reported
+            elapsed_ms = min(elapsed_ms, _search_ms(compiled, text), _search_ms(compiled, text))
+        if elapsed_ms > budget_ms:
+            return [ReDoSFinding(
+                pattern, "error",
+                f"search took {elapsed_ms:.1f} ms on a {len(text)}-char input starting {text[:40]!r} "
+                f"(budget {budget_ms} ms)",
+                category
+            )]
+        if time.perf_counter() > deadline:
+            break
+    return []
+
+
+def check_categories(
+    categories: Dict[str, List[str]],
+    fuzz: bool = True,
+    max_length: int = 2000,
+    budget_ms: float = 10.0,
+    time_limit_seconds: float = 1.0,
+    only: Optional[set] = None,
+    analyze: bool = True
+) -> List[ReDoSFinding]:
+    """
+    Static analysis and/or fuzzing for every pattern in a rule pack (or just
+    the patterns in `only`).
+    """
+    findings = []
+    for category, patterns in categories.items():
+        for pattern in patterns:
+            if only is not None and pattern not in only:
+                continue
+            if analyze:
+                findings.extend(analyze_pattern(pattern, category=category))
+            if fuzz:
+                findings.extend(fuzz_pattern(
+                    pattern, max_length, budget_ms, time_limit_seconds, category=category
+                ))
+    return findings
+
+
+def module_patterns() -> Dict[str, List[str]]:
+    """Module-level compiled regexes of the risk engine itself, by module."""
+    from ai.risk_detection import keyword_prefilter, normalization, numeric_extractor
+
+    found = {}
+    for module in (keyword_prefilter, normalization, numeric_extractor):
+        patterns = [value.pattern for value in vars(module).values() if isinstance(value, re.Pattern)]
+        if patterns:
+            found[module.__name__.rsplit(".", 1)[-1]] = patterns
+    return found
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from ai.risk_detection.rule_pack import RULE_PACK_PATH, load_rule_pack
+
+    parser = argparse.ArgumentParser(description="Check risk rule packs for ReDoS-prone patterns.")
+    parser.add_argument("packs", nargs="*", default=[RULE_PACK_PATH], help="Rule pack files")
+    parser.add_argument("--max-length", type=int, default=2000, help="Length of fuzzed inputs")
+    parser.add_argument("--budget-ms", type=float, default=10.0, help="Slowest allowed single search")
+    parser.add_argument("--time-limit", type=float, default=1.0, help="Fuzzing seconds per pattern")
+    parser.add_argument("--no-fuzz", action="store_true", help="Static analysis only")
+    parser.add_argument("--strict", action="store_true", help="Treat warnings as failures")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for path in args.packs:
+        pack = load_rule_pack(path)
+        categories = dict(pack["categories"])
+        for scenario, extra in pack.get("scenarios", {}).items():
+            categories.update({f"{scenario}:{name}": patterns for name, patterns in extra.items()})
+        findings = check_categories(
+            categories, not args.no_fuzz, args.max_length, args.budget_ms, args.time_limit
+        )
+        print(f"{path} (version {pack['version']}): {len(findings)} finding(s)")
+        for finding in findings:
+            print(f"  {finding}")
+        if any(f.severity == "error" or args.strict for f in findings):
+            failed = True
+
+    findings = check_categories(module_patterns(), not args.no_fuzz, args.max_length, args.budget_ms, args.time_limit)
+    print(f"engine modules: {len(findings)} finding(s)")
+    for finding in findings:
+        print(f"  {finding}")
+    if any(f.severity == "error" or args.strict for f in findings):
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
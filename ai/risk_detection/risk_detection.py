@@ -5,190 +5,87 @@ Detects ANY risky user response using pattern matching and semantic analysis.
 CRITICAL: Backend code enforces mentoring, NOT the LLM.
 """
 
-import re
-from typing import Optional, Tuple
+import os
+import time
+from typing import Callable, List, Optional, Tuple
+
+from ai.risk_detection.corpus import LABELED_CORPUS, SCENARIO_LABELED_CORPUS
+from ai.risk_detection.normalization import normalize
+from ai.risk_detection.numeric_extractor import find_sensitive_number
+from ai.risk_detection.profiler import PatternProfiler, pattern_profiler
+from ai.risk_detection.redos import check_categories
+from ai.risk_detection.rule_pack import RuleMatcher, RulePackManager
 
 
 # ================================================
-# UNIVERSAL RISK PATTERNS (NOT scenario-specific)
+# UNIVERSAL RISK RULES (NOT scenario-specific)
 # ================================================
+# Pattern categories (data_sharing, financial, compliance, implicit_compliance,
+# hesitation) live in a versioned rule pack, rules/default.json unless
+# RISK_RULE_PACK points elsewhere. All categories sit behind one keyword
+# prefilter and run against the same normalized (lowercased) view of the
+# message. Numbers are handled by the checksum-validated numeric extractor.
+# A pack may add scenario-specific rules ("i won" only matters in a lottery
+# scam); detect_risk evaluates universal + current-scenario rules only.
 
-# Intent patterns using regex for flexible matching
-COMPLIANCE_INTENT_PATTERNS = [
-    # Agreement patterns
-    r'\b(ok|okay|yes|sure|fine|alright|agreed|ya|yea|yeah)\b.*\b(i will|i am|i\'ll|let me|sending|give|transfer|pay|share)',
-    r'\b(i will|i am|i\'ll|let me)\b.*\b(send|give|transfer|pay|share|provide|do it)',
-    r'\b(sending|giving|transferring|paying|sharing)\b.*\b(now|it|you|this|that)',
-    r'\bhere\s*(you\s*go|it\s*is|is\s*my|are\s*my)',
-    r'\btake\s*(my|this|it)',
-    r'\b(done|sent|shared|transferred|paid|given)\b',
-    
-    # Confirmation patterns
-    r'\b(yes|ok|okay|sure)\s*(i\s*)?(confirm|agree|accept|understand)',
-    r'\bi\s*(confirm|agree|accept)',
-    r'\b(confirmed|agreed|accepted)\b',
-]
-
-# Data sharing patterns
-DATA_SHARING_PATTERNS = [
-    # Personal identifiers - flexible matching
-    r'\b(my|the)\s*(name|full\s*name)\s*(is|:)',
-    r'\b(dob|date\s*of\s*birth|birthday)\b',
-    r'\b(aadhaar|aadhar|adhaar)\b',
-    r'\b(pan\s*(card|number)?|pancard)\b',
-    r'\b(passport|voter\s*id|driving\s*licen[cs]e)\b',
-    r'\bssn|social\s*security\b',
-    
-    # Financial data - flexible matching
-    r'\b(otp|one\s*time\s*password)\b',
-    r'\b(cvv|cvc|security\s*code)\b',
-    r'\b(pin|atm\s*pin|upi\s*pin)\b',
-    r'\b(account\s*(number|no|#)?|a/c\s*(no|number)?)\b',
-    r'\b(card\s*(number|no|#)?|credit\s*card|debit\s*card)\b',
-    r'\b(ifsc|routing\s*number|swift)\b',
-    r'\b(password|pwd|passcode)\b',
-    r'\bexpiry|valid\s*(till|thru|through)\b',
-    
-    # Contact/address
-    r'\b(my|the)\s*(address|phone|mobile|email)\s*(is|:)',
-    r'\bi\s*live\s*(at|in)\b',
-]
-
-# Numeric patterns indicating sensitive data
-SENSITIVE_NUMERIC_PATTERNS = [
-    r'\b\d{8,}\b',  # Account numbers (8+ digits)
-    r'\b\d{4}\s*\d{4}\s*\d{4}\s*\d{4}\b',  # Card numbers
-    r'\b\d{3,4}\s*\d{4}\s*\d{4}\b',  # Aadhaar-like
-    r'\b\d{4,6}\b(?=.*\b(otp|code|pin)\b)',  # OTP/PIN context
-    r'\b[A-Z]{5}\d{4}[A-Z]\b',  # PAN format
-]
-
-# Money patterns
-MONEY_PATTERNS = [
-    r'\b\d{1,3}(?:,\d{2,3})+\b',  # Indian format: 45,000 or 5,00,000
-    r'(?:rs\.?|₹|\$|inr|usd)\s*\d+',  # Currency symbols
-    r'\b\d+\s*(?:rupees?|dollars?|lakhs?|lac|crores?|thousand|k|hundred)\b',
-    r'\b\d{4,}\b',  # Large numbers (4+ digits)
-]
-
-# Bank and payment identifiers
-FINANCIAL_IDENTIFIERS = [
-    # Indian banks
-    r'\b(sbi|hdfc|icici|axis|kotak|pnb|bob|idbi|canara|union\s*bank)\b',
-    r'\b(state\s*bank|punjab\s*national|bank\s*of\s*(baroda|india))\b',
-    r'\b(yes\s*bank|indusind|federal\s*bank|rbl|bandhan)\b',
-    
-    # International banks
-    r'\b(chase|wells\s*fargo|citi|citibank|hsbc|barclays)\b',
-    r'\bbank\s*of\s*america\b',
-    
-    # Payment apps
-    r'\b(gpay|google\s*pay|paytm|phonepe|bhim|upi)\b',
-    r'\b(paypal|venmo|cash\s*app)\b',
-    
-    # Generic
-    r'\b(my|from\s*my|to\s*my)\s*(bank|account|savings)\b',
-]
-
-# Hesitation patterns (MEDIUM risk)
-HESITATION_PATTERNS = [
-    r'\b(not\s*sure|unsure|confused|don\'t\s*understand)\b',
-    r'\b(is\s*this|are\s*you)\s*(safe|real|legit|genuine|official|true)\b',
-    r'\b(can\s*you|could\s*you)\s*(explain|verify|prove|confirm)\b',
-    r'\b(why|how)\s*(do\s*you|should\s*i)\s*(need|trust|believe)\b',
-    r'\b(sounds?|seems?|looks?)\s*(suspicious|fishy|fake|odd|strange|weird)\b',
-    r'\b(wait|hold\s*on|let\s*me\s*think|give\s*me\s*time)\b',
-    r'\b(bit|little|somewhat)\s*(worried|concerned|hesitant)\b',
-    r'\bhow\s*(do|can)\s*i\s*(know|verify|check|confirm)\b',
-]
-
-
-def _check_patterns(text: str, patterns: list) -> bool:
-    """Check if any pattern matches the text."""
-    for pattern in patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            return True
-    return False
-
-
-def _detect_implicit_compliance(text: str) -> bool:
-    """
-    Detect implicit compliance even without explicit keywords.
-    Use semantic patterns to catch phrases like:
-    - "ok" followed by any positive action
-    - Short affirmative responses in risky context
-    """
-    text_lower = text.lower().strip()
-    
-    # Very short affirmative responses (1-3 words) that indicate compliance
-    short_affirmatives = [
-        r'^(ok|okay|yes|sure|fine|alright|done|sent|ya|yea|yeah)\.?$',
-        r'^(ok|okay|yes|sure)\s+(sir|ma\'?am|boss|bro|ji)\.?$',
-        r'^(i\s*will|i\'ll|let\s*me|sending|ok\s*wait)\.?$',
-    ]
-    
-    for pattern in short_affirmatives:
-        if re.match(pattern, text_lower):
-            return True
-    
-    return False
 
+def _has_digit(text: str) -> bool:
+    """Cheap guard for the numeric extractor (normalized text has ASCII digits)."""
+    return any(ch in text for ch in "0123456789")
 
-def detect_risk(user_message: str, scenario: Optional[str] = None) -> str:
-    """
-    Universal risk detection engine.
-    
-    Returns: "LOW", "MEDIUM", or "HIGH"
-    
-    CRITICAL: This function MUST be called BEFORE any LLM call.
-    If this returns "HIGH", the LLM must NOT be called.
-    """
-    
-    text = user_message.strip()
-    text_lower = text.lower()
+
+def _timed(profiler: Optional[PatternProfiler], name: str, func, text: str):
+    """Call func(text), recording it as a pseudo-pattern when profiling."""
+    if profiler is None:
+        return func(text)
+    started = time.perf_counter_ns()
+    result = func(text)
+    profiler.record("engine", name, time.perf_counter_ns() - started, bool(result), text)
+    return result
+
+
+def _detect(text: str, matcher: RuleMatcher, profiler: Optional[PatternProfiler] = None) -> str:
+    """Risk level of an already normalized message under one rule matcher."""
+    prefilter = matcher.prefilter
     
     # Empty or very short non-risky messages
     if len(text) < 2:
         return "LOW"
     
+    # One linear keyword scan decides which rules can possibly match
+    live = _timed(profiler, "keyword_scan", prefilter.scan, text)
+    if prefilter.nothing_can_match(live) and not _has_digit(text):
+        return "LOW"
+    
     # ================================================
     # HIGH RISK CHECKS (in order of priority)
     # ================================================
     
     # 1. Explicit data sharing patterns
-    if _check_patterns(text_lower, DATA_SHARING_PATTERNS):
+    if prefilter.search("data_sharing", text, live, profiler):
         return "HIGH"
     
-    # 2. Sensitive numeric data
-    if _check_patterns(text, SENSITIVE_NUMERIC_PATTERNS):
+    # 2. Sensitive numbers and money amounts (one checksum-validated pass)
+    if _timed(profiler, "numeric_extractor", find_sensitive_number, text):
         return "HIGH"
     
-    # 3. Money amounts
-    if _check_patterns(text_lower, MONEY_PATTERNS):
+    # 3. Financial identifiers (bank names, payment apps)
+    if prefilter.search("financial", text, live, profiler):
         return "HIGH"
     
-    # 4. Financial identifiers (bank names, payment apps)
-    if _check_patterns(text_lower, FINANCIAL_IDENTIFIERS):
+    # 4. Compliance intent patterns
+    if prefilter.search("compliance", text, live, profiler):
         return "HIGH"
     
-    # 5. Compliance intent patterns
-    if _check_patterns(text_lower, COMPLIANCE_INTENT_PATTERNS):
-        return "HIGH"
-    
-    # 6. Implicit compliance (short affirmatives)
-    if _detect_implicit_compliance(text):
-        return "HIGH"
-    
-    # 7. Contains what looks like actual sensitive data
-    # Raw numbers that could be account/card/OTP
-    if re.search(r'\b\d{6,}\b', text):  # 6+ digit numbers
+    # 5. Implicit compliance (short affirmatives)
+    if prefilter.search("implicit_compliance", text, live, profiler):
         return "HIGH"
     
     # ================================================
     # MEDIUM RISK CHECKS
     # ================================================
     
-    if _check_patterns(text_lower, HESITATION_PATTERNS):
+    if prefilter.search("hesitation", text, live, profiler):
         return "MEDIUM"
     
     # ================================================
@@ -198,30 +95,183 @@ def detect_risk(user_message: str, scenario: Optional[str] = None) -> str:
     return "LOW"
 
 
-def get_risk_explanation(user_message: str, risk_level: str) -> Tuple[str, list]:
+def _regressions(candidate: RuleMatcher, active: Optional[RuleMatcher], corpus) -> List[str]:
+    problems = []
+    for message, expected in corpus:
+        text = normalize(message)
+        got = _detect(text, candidate)
+        if got != expected and (active is None or _detect(text, active) == expected):
+            problems.append(f"'{message}' -> {got} (expected: {expected})")
+    return problems
+
+
+def validate_rule_matcher(candidate: RuleMatcher, active: Optional[RuleMatcher] = None) -> List[str]:
+    """
+    Check a freshly compiled rule pack before it goes live:
+    - static ReDoS analysis of every pattern, plus fuzzing of patterns the
+      active pack does not already have (errors only)
+    - the labeled regression corpus: any message the active pack gets right
+      but the candidate gets wrong is a problem; with no active pack every
+      miss is
+    - the same for every scenario with its own rules, over the labeled
+      corpus plus that scenario's labeled replies
+    """
+    def all_categories(matcher: RuleMatcher):
+        categories = dict(matcher.categories)
+        for scenario, extra in matcher.scenario_rules.items():
+            categories.update({f"{scenario}:{name}": patterns for name, patterns in extra.items()})
+        return categories
+
+    categories = all_categories(candidate)
+    known = None
+    if active is not None:
+        known = {p for patterns in all_categories(active).values() for p in patterns}
+    new_patterns = {
+        p for patterns in categories.values() for p in patterns
+        if known is None or p not in known
+    }
+    problems = [
+        str(finding) for finding in check_categories(categories, fuzz=False)
+        + check_categories(categories, time_limit_seconds=0.2, only=new_patterns, analyze=False)
+        if finding.severity == "error"
+    ]
+    problems += _regressions(candidate, active, LABELED_CORPUS)
+    for scenario in candidate.scenario_rules:
+        scenario_active = active.for_scenario(scenario) if active is not None else None
+        corpus = LABELED_CORPUS + SCENARIO_LABELED_CORPUS.get(scenario, [])
+        problems += [
+            f"[{scenario}] {problem}"
+            for problem in _regressions(candidate.for_scenario(scenario), scenario_active, corpus)
+        ]
+    return problems
+
+
+# Active rule pack; swapped atomically by reloads (see rule_pack.py)
+rule_packs = RulePackManager(validator=validate_rule_matcher)
+
+
+# ================================================
+# OPTIONAL SEMANTIC CLASSIFIER
+# ================================================
+# A hashed linear model (semantic_classifier.py) catches paraphrases the
+# rules miss. Off unless RISK_CLASSIFIER_MODEL names a trained model; it can
+# only raise a rules verdict, and only when at least this confident.
+RISK_CLASSIFIER_THRESHOLD = float(os.getenv("RISK_CLASSIFIER_THRESHOLD", "0.9"))
+_LEVEL_RANK = {"LOW": 0, "MEDIUM": 1, "HIGH": 2}
+
+
+def load_semantic_executor(path: Optional[str] = None):
+    """MicroBatchExecutor for the model at `path` (or RISK_CLASSIFIER_MODEL), None when off."""
+    path = path or os.getenv("RISK_CLASSIFIER_MODEL")
+    if not path:
+        return None
+    try:
+        from ai.risk_detection.semantic_classifier import MicroBatchExecutor, SemanticClassifier
+        return MicroBatchExecutor(
+            SemanticClassifier.load(path),
+            max_batch=int(os.getenv("RISK_CLASSIFIER_MAX_BATCH", "256"))
+        )
+    except (ImportError, OSError, KeyError, ValueError) as e:
+        print(f"RISK CLASSIFIER DISABLED: {e}")
+        return None
+
+
+semantic_executor = load_semantic_executor()
+
+# Further slow checks run after the rules, e.g. an external rule service:
+# detector(normalized text, current level) -> level. Like the classifier
+# they can only raise the level.
+secondary_detectors: List[Callable[[str, str], str]] = []
+
+
+def has_secondary_detectors() -> bool:
+    return semantic_executor is not None or bool(secondary_detectors)
+
+
+def _secondary(text: str, risk: str, profiler: Optional[PatternProfiler] = None) -> str:
+    """Raise a rules verdict with the slower detectors (classifier first)."""
+    if risk == "HIGH" or len(text) < 2:
+        return risk
+    
+    # Paraphrases the rules miss
+    if semantic_executor is not None:
+        label, confidence = _timed(profiler, "semantic_classifier", semantic_executor.classify, text)
+        if confidence >= RISK_CLASSIFIER_THRESHOLD and _LEVEL_RANK.get(label, 0) > _LEVEL_RANK[risk]:
+            risk = label
+    
+    for detector in secondary_detectors:
+        if risk == "HIGH":
+            break
+        raised = detector(text, risk)
+        if _LEVEL_RANK.get(raised, 0) > _LEVEL_RANK[risk]:
+            risk = raised
+    return risk
+
+
+def detect_risk(user_message: str, scenario: Optional[str] = None, secondary: bool = True) -> str:
+    """
+    Universal risk detection engine.
+    
+    Returns: "LOW", "MEDIUM", or "HIGH"
+    
+    CRITICAL: This function MUST be called BEFORE any LLM call.
+    If this returns "HIGH", the LLM must NOT be called.
+    
+    `scenario` (a key from ai/prompts/scenarios.py) adds that scenario's
+    rules to the universal ones; None or an unknown key uses universal only.
+    
+    `secondary=False` runs only the fast rules pass; the caller must then
+    run detect_secondary_risk() before showing any LLM output.
+    """
+    profiler = pattern_profiler if pattern_profiler.should_sample() else None
+    text = normalize(user_message)
+    risk = _detect(text, rule_packs.active.for_scenario(scenario), profiler)
+    if secondary:
+        risk = _secondary(text, risk, profiler)
+    return risk
+
+
+def detect_secondary_risk(user_message: str, risk: str) -> str:
+    """Second half of detect_risk(secondary=False): the slower detectors."""
+    return _secondary(normalize(user_message), risk)
+
+
+def get_risk_explanation(user_message: str, risk_level: str, scenario: Optional[str] = None) -> Tuple[str, list]:
     """
     Get explanation of why message was flagged.
     Returns (category, matched_patterns)
     """
-    text = user_message.lower()
+    text = normalize(user_message)
+    prefilter = rule_packs.active.for_scenario(scenario).prefilter
+    live = prefilter.scan(text)
     
     checks = [
-        ("Data Sharing", DATA_SHARING_PATTERNS),
-        ("Compliance Intent", COMPLIANCE_INTENT_PATTERNS),
-        ("Financial Info", FINANCIAL_IDENTIFIERS),
-        ("Money Amount", MONEY_PATTERNS),
-        ("Sensitive Number", SENSITIVE_NUMERIC_PATTERNS),
-        ("Hesitation", HESITATION_PATTERNS),
+        ("Data Sharing", "data_sharing"),
+        ("Compliance Intent", "compliance"),
+        ("Financial Info", "financial"),
     ]
     
-    for category, patterns in checks:
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return category, [match.group()]
+    for label, category in checks:
+        match = prefilter.search(category, text, live)
+        if match:
+            return label, [match.group()]
+    
+    number = find_sensitive_number(text)
+    if number:
+        label = "Money Amount" if number.kind == "money" else "Sensitive Number"
+        return label, [number.digits]
+    
+    match = prefilter.search("hesitation", text, live)
+    if match:
+        return "Hesitation", [match.group()]
+    
+    if prefilter.search("implicit_compliance", text, live):
+        return "Implicit Compliance", [text]
     
-    if _detect_implicit_compliance(user_message):
-        return "Implicit Compliance", [user_message.strip()]
+    if semantic_executor is not None:
+        label, confidence = semantic_executor.classify(text)
+        if label != "LOW" and confidence >= RISK_CLASSIFIER_THRESHOLD:
+            return "Semantic Match", [f"{label} ({confidence:.2f})"]
     
     return "General", []
 
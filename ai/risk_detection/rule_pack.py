@@ -0,0 +1,237 @@
+"""
+Versioned, hot-reloadable risk rule packs.
+
+A rule pack is a JSON (or YAML, when PyYAML is installed) file:
+
+    {
+      "version": "2026.10.1",
+      "categories": {
+        "data_sharing": ["\\\\b(otp|one\\\\s*time\\\\s*password)\\\\b", ...],
+        "financial": [...],
+        "compliance": [...],
+        "implicit_compliance": [...],
+        "hesitation": [...]
+      },
+      "scenarios": {
+        "lottery_offer": {"compliance": ["\\bi\\s+(won|win)\\b", ...]},
+        ...
+      }
+    }
+
+"categories" are universal. The optional "scenarios" section adds rules that
+only make sense inside one simulation scenario (keys from
+ai/prompts/scenarios.py); RuleMatcher.for_scenario() compiles the universal
+plus scenario rules for a scenario the first time it is asked for.
+
+RulePackManager compiles a pack into a RuleMatcher off the request path,
+validates it against the labeled regression corpus and only then swaps it in
+with a single reference assignment. detect_risk reads the active matcher once
+per call, so in-flight calls finish on the matcher they started with.
+
+Usage (check a pack before shipping it):
+    python -m ai.risk_detection.rule_pack path/to/rules.json
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from ai.prompts.scenarios import SCENARIOS
+from ai.risk_detection.keyword_prefilter import KeywordPrefilter
+
+DEFAULT_RULE_PACK = Path(__file__).resolve().parent / "rules" / "default.json"
+RULE_PACK_PATH = os.getenv("RISK_RULE_PACK", str(DEFAULT_RULE_PACK))
+
+# Categories detect_risk consults; a pack must define every one of them
+REQUIRED_CATEGORIES = ["data_sharing", "financial", "compliance", "implicit_compliance", "hesitation"]
+
+
+class RulePackError(ValueError):
+    """Raised when a rule pack cannot be loaded, compiled or validated."""
+
+
+def load_rule_pack(path: str) -> dict:
+    """Read and structurally check a rule pack file."""
+    with open(path, encoding="utf-8") as f:
+        if str(path).endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise RulePackError("PyYAML is required for YAML rule packs (pip install pyyaml)")
+            pack = yaml.safe_load(f)
+        else:
+            pack = json.load(f)
+
+    if not isinstance(pack, dict) or not pack.get("version"):
+        raise RulePackError(f"{path}: rule pack needs a 'version'")
+    categories = pack.get("categories")
+    if not isinstance(categories, dict):
+        raise RulePackError(f"{path}: rule pack needs a 'categories' mapping")
+    missing = [name for name in REQUIRED_CATEGORIES if name not in categories]
+    if missing:
+        raise RulePackError(f"{path}: missing categories {missing}")
+    for name, patterns in categories.items():
+        if not isinstance(patterns, list) or not all(isinstance(p, str) for p in patterns):
+            raise RulePackError(f"{path}: category '{name}' must be a list of regex strings")
+
+    scenarios = pack.get("scenarios", {})
+    if not isinstance(scenarios, dict):
+        raise RulePackError(f"{path}: 'scenarios' must map scenario keys to categories")
+    for key, extra in scenarios.items():
+        if key not in SCENARIOS:
+            raise RulePackError(f"{path}: unknown scenario '{key}' (known: {sorted(SCENARIOS)})")
+        if not isinstance(extra, dict):
+            raise RulePackError(f"{path}: scenario '{key}' must map categories to patterns")
+        for name, patterns in extra.items():
+            if name not in REQUIRED_CATEGORIES:
+                raise RulePackError(f"{path}: scenario '{key}' has unknown category '{name}'")
+            if not isinstance(patterns, list) or not all(isinstance(p, str) for p in patterns):
+                raise RulePackError(f"{path}: scenario '{key}' category '{name}' must be a list of regex strings")
+    return pack
+
+
+class RuleMatcher:
+    """
+    An immutable compiled rule pack.
+
+    The universal categories are compiled up front. Scenario matchers
+    (universal plus that scenario's rules) are compiled on first use by
+    for_scenario() and cached on this instance, so a reload starts fresh.
+    """
+
+    def __init__(self, pack: dict, source: str = "", scenario: Optional[str] = None):
+        started = time.perf_counter()
+        try:
+            self.prefilter = KeywordPrefilter(pack["categories"])
+        except Exception as e:
+            raise RulePackError(f"{source or 'rule pack'}: {e}")
+        self.version = str(pack["version"])
+        self.source = source
+        self.scenario = scenario
+        self.categories = {name: list(patterns) for name, patterns in pack["categories"].items()}
+        self.scenario_rules: Dict[str, Dict[str, List[str]]] = {
+            key: {name: list(patterns) for name, patterns in extra.items()}
+            for key, extra in pack.get("scenarios", {}).items()
+        } if scenario is None else {}
+        self.compile_ms = round((time.perf_counter() - started) * 1000, 2)
+        self.compiled_at = time.time()
+        self._scenario_matchers: Dict[str, "RuleMatcher"] = {}
+        self._scenario_lock = threading.Lock()
+
+    def scenario_categories(self, scenario: str) -> Dict[str, List[str]]:
+        """Universal categories with the scenario's extra patterns appended."""
+        extra = self.scenario_rules.get(scenario, {})
+        return {name: patterns + extra.get(name, []) for name, patterns in self.categories.items()}
+
+    def for_scenario(self, scenario: Optional[str]) -> "RuleMatcher":
+        """
+        Matcher for one scenario. Scenarios without their own rules (and
+        None) share this universal matcher.
+        """
+        if scenario not in self.scenario_rules:
+            return self
+        matcher = self._scenario_matchers.get(scenario)
+        if matcher is None:
+            with self._scenario_lock:
+                matcher = self._scenario_matchers.get(scenario)
+                if matcher is None:
+                    pack = {"version": self.version, "categories": self.scenario_categories(scenario)}
+                    matcher = RuleMatcher(pack, source=self.source, scenario=scenario)
+                    self._scenario_matchers[scenario] = matcher
+        return matcher
+
+    @property
+    def compiled_scenarios(self) -> List[str]:
+        return sorted(self._scenario_matchers)
+
+
+class RulePackManager:
+    """
+    Owns the active RuleMatcher and replaces it when the pack file changes.
+
+    `validator(candidate, active)` returns a list of problems; a non-empty
+    list rejects the candidate and keeps the active matcher.
+    """
+
+    def __init__(self, path: str = RULE_PACK_PATH, validator: Optional[Callable] = None):
+        self.path = path
+        self.validator = validator
+        self._lock = threading.Lock()  # Serializes reloads, never taken by readers
+        self._mtime = self._current_mtime()
+        self.active = RuleMatcher(load_rule_pack(path), source=str(path))
+        self.stats = {"reloads": 0, "rejected": 0, "last_error": None}
+
+    def _current_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def reload(self, path: Optional[str] = None) -> dict:
+        """
+        Compile, validate and swap in a rule pack (blocking; run it off the
+        event loop). Returns {"swapped": bool, "version": str, "problems": [...]}.
+        """
+        with self._lock:
+            path = path or self.path
+            self._mtime = self._current_mtime()
+            try:
+                candidate = RuleMatcher(load_rule_pack(path), source=str(path))
+                problems = self.validator(candidate, self.active) if self.validator else []
+            except Exception as e:
+                problems = [str(e)]
+                candidate = None
+
+            if problems:
+                self.stats["rejected"] += 1
+                self.stats["last_error"] = problems[0]
+                print(f"RULE PACK REJECTED: {problems[0]}")
+                return {"swapped": False, "version": self.active.version, "problems": problems}
+
+            self.path = path
+            self.active = candidate
+            self.stats["reloads"] += 1
+            self.stats["last_error"] = None
+            return {"swapped": True, "version": candidate.version, "problems": []}
+
+    def reload_if_changed(self) -> Optional[dict]:
+        """Reload when the pack file's mtime moved; None when unchanged."""
+        if self._current_mtime() == self._mtime:
+            return None
+        return self.reload()
+
+    def get_stats(self) -> Dict[str, object]:
+        active = self.active
+        return {
+            "version": active.version,
+            "source": active.source,
+            "compile_ms": active.compile_ms,
+            "compiled_at": active.compiled_at,
+            "patterns": active.prefilter.pattern_count,
+            "scenarios": sorted(active.scenario_rules),
+            "compiled_scenarios": active.compiled_scenarios,
+            **self.stats,
+        }
+
+
+if __name__ == "__main__":
+    from ai.risk_detection.risk_detection import rule_packs, validate_rule_matcher
+
+    for pack_path in sys.argv[1:] or [RULE_PACK_PATH]:
+        try:
+            matcher = RuleMatcher(load_rule_pack(pack_path), source=pack_path)
+            problems: List[str] = validate_rule_matcher(matcher, rule_packs.active)
+        except (OSError, ValueError) as e:
+            matcher, problems = None, [str(e)]
+        if problems:
+            print(f"✗ {pack_path}")
+            for problem in problems:
+                print(f"  {problem}")
+            sys.exit(1)
+        print(f"✓ {pack_path} (version {matcher.version}, {matcher.prefilter.pattern_count} patterns, "
+              f"{len(matcher.scenario_rules)} scenario rule sets, "
+              f"compiled in {matcher.compile_ms} ms)")
@@ -0,0 +1,475 @@
+"""
+Lightweight CPU semantic risk classifier.
+
+Regex rules miss paraphrases ("fine, check your inbox for the code") and an
+LLM call per message is far too slow for a pre-LLM gate. This is a
+hashing-vectorizer + multinomial logistic regression model:
+
+- features: word unigrams, word bigrams and character trigrams of each word,
+  hashed (CRC32, signed) into a fixed number of buckets and L2-normalized,
+  so there is no vocabulary to ship or keep in sync
+- model: one weight row per bucket and a bias per risk level, stored as a
+  .npz file; inference is pure NumPy
+- MicroBatchExecutor: concurrent callers hand their feature vectors to
+  whichever caller is currently scoring, which scores the whole batch with
+  one sparse-times-dense product instead of one per message
+
+It runs alongside the regex rules (see detect_risk) and can only raise a
+risk level. NumPy is an optional dependency, needed only when
+RISK_CLASSIFIER_MODEL points at a trained model.
+
+Usage:
+    python -m ai.risk_detection.semantic_classifier train --include-corpus \\
+        --transcripts turns.jsonl --output risk_model.npz
+    python -m ai.risk_detection.semantic_classifier eval --model risk_model.npz
+    python -m ai.risk_detection.semantic_classifier bench --model risk_model.npz --sessions 1000
+
+Transcripts are JSONL or CSV rows with the message in "user_message" (or
+"message") and the level in "label" (human-reviewed) or "risk" - the shape
+of an exported simulation_turns table.
+"""
+
+import argparse
+import csv
+import json
+import math
+import random
+import re
+import statistics
+import threading
+import time
+import zlib
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ai.risk_detection.corpus import LABELED_CORPUS, RISK_LEVELS, SCENARIO_LABELED_CORPUS, generate_corpus
+from ai.risk_detection.normalization import normalize
+
+DEFAULT_FEATURES = 2 ** 16
+MODEL_FORMAT = 1
+
+_TOKEN = re.compile(r"\w+")
+
+# Risk level of each synthetic corpus category (training with --include-corpus)
+CORPUS_CATEGORY_LEVELS = {
+    "benign": "LOW",
+    "hesitation": "MEDIUM",
+    "compliance": "HIGH",
+    "data_sharing": "HIGH",
+    "numeric": "HIGH",
+    "money": "HIGH",
+    "financial": "HIGH",
+}
+
+
+# ================================================
+# FEATURES
+# ================================================
+
+@lru_cache(maxsize=65536)
+def _hashed(gram: str, mask: int) -> Tuple[int, float]:
+    h = zlib.crc32(gram.encode("utf-8"))
+    return h & mask, (1.0 if h & 0x80000000 else -1.0)
+
+
+@lru_cache(maxsize=65536)
+def _word_features(word: str, mask: int) -> Tuple[Tuple[int, float], ...]:
+    """Unigram and character trigram buckets of one word (words repeat a lot)."""
+    padded = f" {word} "
+    grams = ["w:" + word] + ["c:" + padded[i:i + 3] for i in range(len(padded) - 2)]
+    return tuple(_hashed(gram, mask) for gram in grams)
+
+
+def featurize(text: str, n_features: int = DEFAULT_FEATURES) -> Tuple[List[int], List[float]]:
+    """
+    Hashed, L2-normalized sparse feature vector of an already normalized
+    message as (bucket indices, values).
+    """
+    mask = n_features - 1
+    counts: Dict[int, float] = {}
+    previous = "<s>"
+    for word in _TOKEN.findall(text):
+        for index, sign in _word_features(word, mask):
+            counts[index] = counts.get(index, 0.0) + sign
+        index, sign = _hashed("b:" + previous + " " + word, mask)
+        counts[index] = counts.get(index, 0.0) + sign
+        previous = word
+    index, sign = _hashed("bias", mask)  # Keeps every row non-empty
+    counts[index] = counts.get(index, 0.0) + sign
+
+    values = list(counts.values())
+    norm = math.sqrt(sum(v * v for v in values)) or 1.0
+    return list(counts), [v / norm for v in values]
+
+
+def _stack(rows: List[Tuple[List[int], List[float]]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Concatenate sparse rows into (indices, values, row start offsets) arrays."""
+    offsets = np.zeros(len(rows), dtype=np.int64)
+    indices: List[int] = []
+    values: List[float] = []
+    for i, (row_indices, row_values) in enumerate(rows):
+        offsets[i] = len(indices)
+        indices += row_indices
+        values += row_values
+    return np.array(indices, dtype=np.int64), np.array(values, dtype=np.float32), offsets
+
+
+def _softmax(scores: np.ndarray) -> np.ndarray:
+    scores = scores - scores.max(axis=1, keepdims=True)
+    np.exp(scores, out=scores)
+    scores /= scores.sum(axis=1, keepdims=True)
+    return scores
+
+
+# ================================================
+# MODEL
+# ================================================
+
+class SemanticClassifier:
+    """Hashed linear model over risk levels; immutable once loaded."""
+
+    def __init__(self, weights: np.ndarray, bias: np.ndarray, labels: List[str], version: str = ""):
+        if weights.shape[0] & (weights.shape[0] - 1):
+            raise ValueError("number of hashed features must be a power of two")
+        self.weights = np.ascontiguousarray(weights, dtype=np.float32)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        self.labels = list(labels)
+        self.version = version
+        self.n_features = weights.shape[0]
+
+    @classmethod
+    def load(cls, path: str) -> "SemanticClassifier":
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["format"]) != MODEL_FORMAT:
+                raise ValueError(f"{path}: unsupported model format {int(data['format'])}")
+            return cls(data["weights"], data["bias"], [str(l) for l in data["labels"]], str(data["version"]))
+
+    def save(self, path: str):
+        np.savez_compressed(
+            path, format=MODEL_FORMAT, weights=self.weights, bias=self.bias,
+            labels=np.array(self.labels), version=np.array(self.version)
+        )
+
+    def featurize(self, text: str) -> Tuple[List[int], List[float]]:
+        return featurize(text, self.n_features)
+
+    def score_rows(self, rows: List[Tuple[List[int], List[float]]]) -> np.ndarray:
+        """Class probabilities for featurized rows: one gather and segmented sum for the batch."""
+        indices, values, offsets = _stack(rows)
+        contributions = self.weights[indices] * values[:, None]
+        scores = np.add.reduceat(contributions, offsets, axis=0) + self.bias
+        return _softmax(scores)
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        return self.score_rows([self.featurize(normalize(text)) for text in texts])
+
+    def classify(self, text: str) -> Tuple[str, float]:
+        """(risk level, probability) for one raw message."""
+        probabilities = self.score_rows([self.featurize(normalize(text))])[0]
+        best = int(probabilities.argmax())
+        return self.labels[best], float(probabilities[best])
+
+
+def train(
+    examples: List[Tuple[str, str]],
+    n_features: int = DEFAULT_FEATURES,
+    epochs: int = 30,
+    learning_rate: float = 0.5,
+    l2: float = 1e-5,
+    batch_size: int = 256,
+    seed: int = 42,
+    version: str = ""
+) -> SemanticClassifier:
+    """
+    Fit a softmax regression with mini-batch gradient descent. Classes are
+    weighted by inverse frequency so a LOW-heavy transcript dump does not
+    drown out HIGH.
+    """
+    labels = [level for level in RISK_LEVELS if any(label == level for _, label in examples)]
+    label_index = {label: i for i, label in enumerate(labels)}
+    rows = [featurize(normalize(message), n_features) for message, _ in examples]
+    targets = np.array([label_index[label] for _, label in examples], dtype=np.int64)
+
+    counts = np.bincount(targets, minlength=len(labels)).astype(np.float32)
+    class_weight = len(targets) / (len(labels) * np.maximum(counts, 1))
+
+    weights = np.zeros((n_features, len(labels)), dtype=np.float32)
+    bias = np.zeros(len(labels), dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    order = np.arange(len(rows))
+
+    for _ in range(epochs):
+        rng.shuffle(order)
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            indices, values, offsets = _stack([rows[i] for i in batch])
+            owners = np.repeat(np.arange(len(batch)), np.diff(np.append(offsets, len(indices))))
+
+            scores = np.add.reduceat(weights[indices] * values[:, None], offsets, axis=0) + bias
+            errors = _softmax(scores)
+            errors[np.arange(len(batch)), targets[batch]] -= 1.0
+            errors *= class_weight[targets[batch]][:, None] / len(batch)
+
+            gradient = np.zeros_like(weights)
+            np.add.at(gradient, indices, values[:, None] * errors[owners])
+            touched = np.unique(indices)
+            gradient[touched] += l2 * weights[touched]
+            weights -= learning_rate * gradient
+            bias -= learning_rate * errors.sum(axis=0)
+
+    return SemanticClassifier(weights, bias, labels, version or time.strftime("%Y.%m.%d"))
+
+
+# ================================================
+# MICRO-BATCHING
+# ================================================
+
+class _Request:
+    __slots__ = ("row", "result", "error", "done", "event")
+
+    def __init__(self, row):
+        self.row = row
+        self.result = None
+        self.error = None
+        self.done = False
+        self.event = threading.Event()
+
+
+class MicroBatchExecutor:
+    """
+    Groups concurrent classify() calls into one scoring pass.
+
+    No background thread: callers featurize their own message, queue it, and
+    the first caller to find nobody scoring becomes the leader. The leader
+    scores everything queued (up to max_batch per pass) until its own
+    request is answered, then hands leadership to the oldest waiter. A lone
+    caller therefore pays no hand-off latency, and under load the batch size
+    grows with the queue.
+    """
+
+    def __init__(self, classifier: SemanticClassifier, max_batch: int = 256):
+        self.classifier = classifier
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._pending: List[_Request] = []
+        self._scoring = False
+        self.stats = {"requests": 0, "batches": 0, "largest_batch": 0}
+
+    def classify(self, text: str) -> Tuple[str, float]:
+        """(risk level, probability) for an already normalized message."""
+        request = _Request(self.classifier.featurize(text))
+        with self._lock:
+            self._pending.append(request)
+            lead = not self._scoring
+            self._scoring = True
+
+        if not lead:
+            request.event.wait()
+        # Woken without an answer means leadership was handed to us
+        while not request.done:
+            self._score_next_batch()
+
+        with self._lock:
+            if self._pending:
+                self._pending[0].event.set()
+            else:
+                self._scoring = False
+
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _score_next_batch(self):
+        with self._lock:
+            batch = self._pending[:self.max_batch]
+            del self._pending[:self.max_batch]
+        try:
+            probabilities = self.classifier.score_rows([r.row for r in batch])
+            labels = self.classifier.labels
+            for request, row in zip(batch, probabilities):
+                best = int(row.argmax())
+                request.result = (labels[best], float(row[best]))
+        except Exception as e:
+            for request in batch:
+                request.error = e
+
+        with self._lock:
+            self.stats["requests"] += len(batch)
+            self.stats["batches"] += 1
+            self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+        for request in batch:
+            request.done = True
+            request.event.set()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+        stats["mean_batch"] = round(stats["requests"] / stats["batches"], 2) if stats["batches"] else 0.0
+        stats["model_version"] = self.classifier.version
+        return stats
+
+
+# ================================================
+# CLI
+# ================================================
+
+def load_transcripts(path: str) -> List[Tuple[str, str]]:
+    """Labeled (message, level) pairs from a JSONL or CSV transcript export."""
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    examples = []
+    for row in rows:
+        message = row.get("user_message") or row.get("message")
+        label = (row.get("label") or row.get("risk") or "").upper()
+        if message and label in RISK_LEVELS:
+            examples.append((message, label))
+    return examples
+
+
+def corpus_examples(size: int, seed: int = 42) -> List[Tuple[str, str]]:
+    """Synthetic corpus plus the hand-labeled corpora as training examples."""
+    examples = [(message, CORPUS_CATEGORY_LEVELS[category]) for message, category in generate_corpus(size, seed)]
+    examples += LABELED_CORPUS
+    for labeled in SCENARIO_LABELED_CORPUS.values():
+        examples += labeled
+    return examples
+
+
+def evaluate(classifier: SemanticClassifier, examples: List[Tuple[str, str]]) -> dict:
+    """Accuracy and per-level recall on labeled examples."""
+    predicted = classifier.predict_proba([message for message, _ in examples]).argmax(axis=1)
+    hits: Dict[str, List[bool]] = {level: [] for level in RISK_LEVELS}
+    for (_, expected), index in zip(examples, predicted):
+        hits[expected].append(classifier.labels[index] == expected)
+    correct = sum(sum(values) for values in hits.values())
+    return {
+        "accuracy": round(correct / len(examples), 3) if examples else 0.0,
+        "recall": {level: round(sum(values) / len(values), 3) for level, values in hits.items() if values},
+        "count": len(examples),
+    }
+
+
+def benchmark(
+    classifier: SemanticClassifier,
+    sessions: int = 1000,
+    messages_per_session: int = 10,
+    batching: bool = True,
+    seed: int = 42
+) -> dict:
+    """
+    One thread per simulated session, all classifying at once. Latency is
+    the wall time of each classify call including waiting for a batch.
+    """
+    corpus = [normalize(message) for message, _ in generate_corpus(sessions * messages_per_session, seed)]
+    executor = MicroBatchExecutor(classifier)
+    if batching:
+        classify = executor.classify
+    else:
+        lock = threading.Lock()  # Unbatched: one message per scoring pass
+
+        def classify(text):
+            row = classifier.featurize(text)
+            with lock:
+                return classifier.score_rows([row])[0]
+
+    latencies: List[float] = []
+    clock = {}
+    # Timing starts once every thread exists, so thread start-up is excluded
+    barrier = threading.Barrier(sessions, action=lambda: clock.setdefault("started", time.perf_counter()))
+
+    def session(index: int):
+        own = []
+        barrier.wait()
+        for text in corpus[index::sessions]:
+            started = time.perf_counter()
+            classify(text)
+            own.append(time.perf_counter() - started)
+        latencies.extend(own)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - clock["started"]
+
+    latencies.sort()
+    report = {
+        "sessions": sessions,
+        "messages": len(latencies),
+        "msgs_per_sec": round(len(latencies) / elapsed),
+        "us_per_msg": round(elapsed / len(latencies) * 1e6, 2),
+        "p50_us": round(statistics.median(latencies) * 1e6, 2),
+        "p99_us": round(latencies[int(0.99 * (len(latencies) - 1))] * 1e6, 2),
+    }
+    if batching:
+        report["batching"] = executor.get_stats()
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Train, evaluate and benchmark the semantic risk classifier.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train_parser = commands.add_parser("train", help="Fit a model from labeled transcripts")
+    train_parser.add_argument("--transcripts", nargs="*", default=[], help="JSONL/CSV transcript exports")
+    train_parser.add_argument("--include-corpus", action="store_true", help="Add the synthetic and labeled corpora")
+    train_parser.add_argument("--corpus-size", type=int, default=20_000)
+    train_parser.add_argument("--features", type=int, default=DEFAULT_FEATURES, help="Hashed features (power of two)")
+    train_parser.add_argument("--epochs", type=int, default=30)
+    train_parser.add_argument("--holdout", type=float, default=0.1, help="Fraction held out for evaluation")
+    train_parser.add_argument("--seed", type=int, default=42)
+    train_parser.add_argument("--output", required=True)
+
+    eval_parser = commands.add_parser("eval", help="Score a model on labeled data")
+    eval_parser.add_argument("--model", required=True)
+    eval_parser.add_argument("--transcripts", nargs="*", default=[])
+
+    bench_parser = commands.add_parser("bench", help="Latency with many concurrent sessions")
+    bench_parser.add_argument("--model", required=True)
+    bench_parser.add_argument("--sessions", type=int, default=1000)
+    bench_parser.add_argument("--messages", type=int, default=10, help="Messages per session")
+    args = parser.parse_args(argv)
+
+    if args.command == "train":
+        examples = []
+        for path in args.transcripts:
+            examples += load_transcripts(path)
+        if args.include_corpus:
+            examples += corpus_examples(args.corpus_size, args.seed)
+        if not examples:
+            parser.error("no training examples (pass --transcripts and/or --include-corpus)")
+        random.Random(args.seed).shuffle(examples)
+        held = int(len(examples) * args.holdout)
+        holdout, training = examples[:held], examples[held:]
+
+        started = time.perf_counter()
+        classifier = train(training, args.features, args.epochs, seed=args.seed)
+        print(f"Trained on {len(training)} examples in {time.perf_counter() - started:.1f}s")
+        if holdout:
+            print(f"Holdout: {evaluate(classifier, holdout)}")
+        classifier.save(args.output)
+        print(f"Saved {args.output} (version {classifier.version})")
+
+    elif args.command == "eval":
+        classifier = SemanticClassifier.load(args.model)
+        examples = list(LABELED_CORPUS)
+        for path in args.transcripts:
+            examples += load_transcripts(path)
+        print(evaluate(classifier, examples))
+
+    else:
+        classifier = SemanticClassifier.load(args.model)
+        for batching in (False, True):
+            report = benchmark(classifier, args.sessions, args.messages, batching)
+            print(f"{'batched' if batching else 'unbatched':<10} {report}")
+
+
+if __name__ == "__main__":
+    main()
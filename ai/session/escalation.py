@@ -0,0 +1,67 @@
+"""
+Escalation stage of one simulation session.
+
+Every scenario's escalation_pattern is a list of steps (create urgency ->
+establish authority -> ask for verification -> ...). EscalationTracker
+keeps which step the scammer is on, so the simulator prompt can carry
+just that step instead of the whole scenario:
+
+- each scammer message spends one turn at the current stage; after
+  STAGE_TURNS turns the scammer moves on (gradual pressure)
+- a HIGH risk verdict means the trainee complied, so the scammer moves on
+  at once
+- a MEDIUM verdict means the trainee hesitated, so the next scammer
+  message works the same step again without counting towards moving on
+- the last stage holds until the session ends
+"""
+
+import os
+
+STAGE_TURNS = int(os.getenv("ESCALATION_STAGE_TURNS", "2"))
+
+
+class EscalationTracker:
+    """Current step of the scenario's escalation pattern."""
+
+    def __init__(self, stages: int, stage_turns: int = STAGE_TURNS):
+        self.stages = max(1, stages)
+        self.stage_turns = max(1, stage_turns)
+        self.reset()
+
+    def observe_scammer(self):
+        """A scammer message was sent at the current stage."""
+        if self.holding:
+            self.holding = False
+            return
+        self.turns_at_stage += 1
+        if self.turns_at_stage >= self.stage_turns:
+            self._advance("turns")
+
+    def observe_user(self, risk: str):
+        """A trainee reply was judged `risk`."""
+        if risk == "HIGH":
+            self._advance("complied")
+        elif risk == "MEDIUM":
+            self.holding = True
+
+    def _advance(self, reason: str):
+        if self.stage < self.stages - 1:
+            self.stage += 1
+            self.turns_at_stage = 0
+            self.holding = False
+            self.last_reason = reason
+
+    def reset(self):
+        self.stage = 0
+        self.turns_at_stage = 0
+        self.holding = False
+        self.last_reason = None
+
+    def snapshot(self) -> dict:
+        return {
+            "stage": self.stage,
+            "stages": self.stages,
+            "turns_at_stage": self.turns_at_stage,
+            "holding": self.holding,
+            "last_reason": self.last_reason,
+        }
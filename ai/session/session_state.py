@@ -15,6 +15,9 @@ class SimulationSession:
         self.scenario = scenario
         self.state = SimulationState.SIMULATING
         self.history = ""
+        # Rolling summary of the first `summarized_lines` history lines
+        self.summary = ""
+        self.summarized_lines = 0
 
     def add_message(self, role: str, message: str):
         self.history += f"\n{role}: {message}"
@@ -28,3 +31,5 @@ class SimulationSession:
     def reset(self):
         self.state = SimulationState.ENDED
         self.history = ""
+        self.summary = ""
+        self.summarized_lines = 0
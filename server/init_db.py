@@ -10,6 +10,8 @@ if str(BASE_DIR) not in sys.path:
 
 from src.app.database import engine, Base
 from src.app.models.user import User  # Import all models to ensure they are registered
+from src.app.models.transcript import SimulationTurn
+from src.app.models.analytics import TrainingStats
 
 async def init_db():
     print("Connecting to PostgreSQL...")
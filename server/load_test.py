@@ -0,0 +1,290 @@
+"""
+End-to-end load test for the simulation API.
+
+Starts a deterministic fake Ollama, launches the API server against it,
+mints JWTs with the server's own secret and drives many virtual trainees
+through start -> message -> (mentor -> continue) -> retry flows.
+
+Usage:
+    python load_test.py --users 2000 --concurrency 200
+    python load_test.py --users 500 --latency-ms 300 --tokens-per-sec 25 --output load.json
+    python load_test.py --users 2000 --fake-backends 3  # least-loaded routing over 3 fake Ollamas
+    python load_test.py --url http://127.0.0.1:8000 --ollama-url http://127.0.0.1:11435  # existing server
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import List, Optional
+
+import httpx
+
+# Add the server directory and project root to sys.path
+BASE_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BASE_DIR.parent
+for path in (str(BASE_DIR), str(PROJECT_ROOT)):
+    if path not in sys.path:
+        sys.path.append(path)
+
+from ai.llm.stub_ollama import StubOllamaServer, StubOllamaConfig
+from ai.risk_detection.corpus import generate_corpus
+
+PERSONAS = ["STUDENT", "JOB_SEEKER", "SENIOR_CITIZEN", "TEENAGER", "GENERAL_USER"]
+SCENARIOS = ["BANK", "GOVERNMENT", "JOB", "EMERGENCY", "lottery_offer"]
+
+
+def _percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))]
+
+
+def _rss_bytes(pid: int) -> Optional[int]:
+    """Resident set size of a local process (Linux only)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+class LoadStats:
+    """Per-endpoint latency samples and error counts."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.modes = defaultdict(int)
+        self.flows_completed = 0
+        self.peak_sessions = 0
+        self.peak_session_bytes = 0
+        self.peak_rss = 0
+
+    def report(self, elapsed: float) -> dict:
+        endpoints = {}
+        for endpoint, values in sorted(self.latencies.items()):
+            values.sort()
+            endpoints[endpoint] = {
+                "count": len(values),
+                "errors": self.errors[endpoint],
+                "p50_ms": round(_percentile(values, 50) * 1000, 1),
+                "p95_ms": round(_percentile(values, 95) * 1000, 1),
+                "p99_ms": round(_percentile(values, 99) * 1000, 1),
+                "max_ms": round(values[-1] * 1000, 1),
+            }
+        requests_total = sum(len(v) for v in self.latencies.values())
+        return {
+            "elapsed_seconds": round(elapsed, 2),
+            "requests": requests_total,
+            "requests_per_second": round(requests_total / elapsed, 1) if elapsed else 0.0,
+            "flows_completed": self.flows_completed,
+            "flows_per_second": round(self.flows_completed / elapsed, 2) if elapsed else 0.0,
+            "modes": dict(self.modes),
+            "endpoints": endpoints,
+            "peak_active_sessions": self.peak_sessions,
+            "peak_session_store_bytes": self.peak_session_bytes,
+            "peak_server_rss_bytes": self.peak_rss,
+        }
+
+
+async def _call(client: httpx.AsyncClient, stats: LoadStats, endpoint: str, body: dict) -> Optional[dict]:
+    started = time.perf_counter()
+    try:
+        response = await client.post(f"/api/v1/simulation/{endpoint}", json=body)
+        stats.latencies[endpoint].append(time.perf_counter() - started)
+        if response.status_code != 200:
+            stats.errors[endpoint] += 1
+            return None
+        data = response.json()
+        stats.modes[data.get("mode")] += 1
+        return data
+    except httpx.HTTPError:
+        stats.latencies[endpoint].append(time.perf_counter() - started)
+        stats.errors[endpoint] += 1
+        return None
+
+
+async def virtual_user(client: httpx.AsyncClient, stats: LoadStats, rng: random.Random, messages: list, turns: int):
+    """One trainee: start a session, chat, acknowledge mentor screens, then retry."""
+    started = await _call(client, stats, "start", {
+        "persona": rng.choice(PERSONAS),
+        "age": rng.randint(16, 75),
+        "scenario": rng.choice(SCENARIOS),
+    })
+    if not started or not started.get("session_id"):
+        return
+
+    session_id = started["session_id"]
+    for _ in range(turns):
+        reply = await _call(client, stats, "message", {"session_id": session_id, "message": rng.choice(messages)})
+        if reply and reply.get("mode") == "MENTOR":
+            await _call(client, stats, "continue", {"session_id": session_id})
+
+    await _call(client, stats, "retry", {"session_id": session_id})
+    stats.flows_completed += 1
+
+
+async def _sample_memory(client: httpx.AsyncClient, stats: LoadStats, server_pid: Optional[int], interval: float):
+    while True:
+        try:
+            response = await client.get("/api/v1/simulation/active-sessions")
+            data = response.json()
+            stats.peak_sessions = max(stats.peak_sessions, data.get("active_sessions", 0))
+            stats.peak_session_bytes = max(stats.peak_session_bytes, data.get("approx_memory_bytes", 0))
+        except httpx.HTTPError:
+            pass
+        if server_pid:
+            stats.peak_rss = max(stats.peak_rss, _rss_bytes(server_pid) or 0)
+        await asyncio.sleep(interval)
+
+
+async def run_load(base_url: str, token: str, args, server_pid: Optional[int]) -> dict:
+    rng = random.Random(args.seed)
+    messages = [message for message, _ in generate_corpus(5000, args.seed)]
+    stats = LoadStats()
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    limits = httpx.Limits(max_connections=args.concurrency + 5, max_keepalive_connections=args.concurrency + 5)
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        headers={"Authorization": f"Bearer {token}"},
+        timeout=args.timeout,
+        limits=limits
+    ) as client:
+        sampler = asyncio.create_task(_sample_memory(client, stats, server_pid, 0.5))
+
+        async def guarded(seed: int):
+            async with semaphore:
+                await virtual_user(client, stats, random.Random(seed), messages, args.turns)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(guarded(rng.random()) for _ in range(args.users)))
+        elapsed = time.perf_counter() - started
+
+        sampler.cancel()
+        await asyncio.gather(sampler, return_exceptions=True)
+
+    return stats.report(elapsed)
+
+
+def _wait_for_server(base_url: str, process: subprocess.Popen, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("API server exited during startup")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("API server did not become healthy in time")
+
+
+def _print_report(report: dict, stubs: List[StubOllamaServer]):
+    print("=" * 72)
+    print(
+        f"{report['flows_completed']} flows, {report['requests']} requests in {report['elapsed_seconds']}s "
+        f"({report['requests_per_second']} req/s, {report['flows_per_second']} flows/s)"
+    )
+    print("=" * 72)
+    print(f"{'ENDPOINT':<12}{'COUNT':>8}{'ERRORS':>8}{'P50 ms':>10}{'P95 ms':>10}{'P99 ms':>10}{'MAX ms':>10}")
+    for endpoint, row in report["endpoints"].items():
+        print(
+            f"{endpoint:<12}{row['count']:>8}{row['errors']:>8}{row['p50_ms']:>10}"
+            f"{row['p95_ms']:>10}{row['p99_ms']:>10}{row['max_ms']:>10}"
+        )
+    print("=" * 72)
+    print(f"Response modes:        {report['modes']}")
+    print(f"Peak active sessions:  {report['peak_active_sessions']}")
+    print(f"Peak session store:    {report['peak_session_store_bytes'] / 1024:.1f} KiB")
+    if report["peak_server_rss_bytes"]:
+        print(f"Peak server RSS:       {report['peak_server_rss_bytes'] / 1024 / 1024:.1f} MiB")
+    for stub in stubs:
+        print(f"Fake Ollama {stub.url}: {stub.stats}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive concurrent simulation flows against the API.")
+    parser.add_argument("--users", type=int, default=1000, help="Virtual trainees to run")
+    parser.add_argument("--concurrency", type=int, default=100, help="Trainees active at once")
+    parser.add_argument("--turns", type=int, default=5, help="Messages per trainee")
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="Fake Ollama fixed latency")
+    parser.add_argument("--tokens-per-sec", type=float, default=50.0, help="Fake Ollama generation speed")
+    parser.add_argument("--default-tokens", type=int, default=40, help="Fake Ollama reply length")
+    parser.add_argument("--fake-backends", type=int, default=1, help="Fake Ollama servers to route across")
+    parser.add_argument("--port", type=int, default=8100, help="Port for the spawned API server")
+    parser.add_argument("--url", help="Target an already running API server instead of spawning one")
+    parser.add_argument("--ollama-url", help="Use this Ollama instead of the built-in fake")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args()
+
+    stubs = []
+    ollama_url = args.ollama_url
+    if not ollama_url:
+        stubs = [
+            StubOllamaServer(config=StubOllamaConfig(
+                args.latency_ms, args.tokens_per_sec, args.default_tokens
+            )).start()
+            for _ in range(max(1, args.fake_backends))
+        ]
+        ollama_url = ",".join(stub.url for stub in stubs)
+
+    # Spawned server and this process must agree on the JWT secret
+    os.environ.setdefault("JWT_SECRET_KEY", "load-test-secret")
+    from src.app.security.jwt import create_access_token
+    token = create_access_token({"sub": "1", "email": "loadtest@cyberguardian.ai", "provider": "local"})
+
+    process = None
+    base_url = args.url
+    workdir = tempfile.mkdtemp(prefix="cyberguardian-load-")
+    try:
+        if not base_url:
+            base_url = f"http://127.0.0.1:{args.port}"
+            env = {
+                **os.environ,
+                "OLLAMA_URL": ollama_url,
+                "PYTHONPATH": os.pathsep.join(filter(None, [str(PROJECT_ROOT), os.environ.get("PYTHONPATH")])),
+                "DATABASE_URL": f"sqlite+aiosqlite:///{workdir}/load.db",
+                "ACCOUNT_PURGE_ENABLED": "false",
+            }
+            subprocess.run([sys.executable, "init_db.py"], cwd=BASE_DIR, env=env, check=True, stdout=subprocess.DEVNULL)
+            process = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "src.app.main:app",
+                 "--host", "127.0.0.1", "--port", str(args.port), "--log-level", "warning"],
+                cwd=BASE_DIR,
+                env=env,
+                stdout=subprocess.DEVNULL
+            )
+            _wait_for_server(base_url, process)
+
+        print(f"Driving {args.users} trainees ({args.concurrency} concurrent) against {base_url}")
+        report = asyncio.run(run_load(base_url, token, args, process.pid if process else None))
+        _print_report(report, stubs)
+
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump({**report, "fake_ollama": [stub.stats for stub in stubs]}, f, indent=2)
+    finally:
+        if process:
+            process.terminate()
+            process.wait(timeout=10)
+        for stub in stubs:
+            stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Purge expired, unverified accounts and stale verification tokens.
+Run this script from cron or by hand; the server also runs it periodically.
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add the server directory to sys.path so we can import from src
+BASE_DIR = Path(__file__).resolve().parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from src.app.database import engine
+from src.app.security.config import settings
+from src.app.services.account_cleanup import UnverifiedAccountPurger
+
+
+async def purge(batch_size: int, retention_hours: int, dry_run: bool):
+    purger = UnverifiedAccountPurger(batch_size=batch_size, retention_hours=retention_hours)
+    print(f"Purging unverified accounts expired more than {retention_hours}h ago...")
+    report = await purger.purge_once(dry_run=dry_run)
+
+    action = "Would delete" if dry_run else "Deleted"
+    print(f"{action} {report['deleted']} unverified users")
+    print(f"{'Would clear' if dry_run else 'Cleared'} {report['tokens_cleared']} stale tokens")
+    print(f"Finished in {report['seconds']}s ({report['rows_per_second']} rows/s)")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=settings.ACCOUNT_PURGE_BATCH_SIZE)
+    parser.add_argument("--retention-hours", type=int, default=settings.UNVERIFIED_ACCOUNT_RETENTION_HOURS)
+    parser.add_argument("--dry-run", action="store_true", help="Count matching rows without modifying them")
+    args = parser.parse_args()
+
+    asyncio.run(purge(args.batch_size, args.retention_hours, args.dry_run))
@@ -2,3 +2,4 @@
 
 from .simulation import router as simulation_router
 from .auth import router as auth_router
+from .analytics import router as analytics_router
@@ -0,0 +1,27 @@
+"""
+Training analytics API routes.
+Serves incrementally maintained counters; never scans raw transcripts.
+"""
+
+from fastapi import APIRouter, Depends
+
+from ...schemas.analytics import AnalyticsResponse
+from ...services.training_analytics import training_analytics
+from ...security.jwt import require_auth
+
+router = APIRouter()
+
+
+@router.get("", response_model=AnalyticsResponse)
+async def get_analytics(user: dict = Depends(require_auth)):
+    """
+    Get training analytics for the current user and for every
+    (persona, scenario) pair.
+    """
+    user_id = user.get("id")
+    user_id = int(user_id) if user_id and str(user_id).isdigit() else None
+
+    return AnalyticsResponse(
+        user=training_analytics.get_user_stats(user_id),
+        scenarios=training_analytics.get_scenario_stats()
+    )
@@ -3,6 +3,11 @@ Simulation API routes.
 Handles scam simulation sessions with the local Ollama + Mistral model.
 """
 
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
 from fastapi import APIRouter, HTTPException, Depends
 
 from ...schemas.simulation import (
@@ -14,11 +19,24 @@ from ...schemas.simulation import (
     RiskLevel
 )
 from ...services.session_store import session_store
+from ...services.transcript_writer import transcript_writer
+from ...services.training_analytics import training_analytics
+from ...security.config import settings
 
 from ...security.jwt import require_auth
 
 router = APIRouter(dependencies=[Depends(require_auth)])
 
+# Turns block on the LLM; they wait in the LLM scheduler, not on the event loop
+_turn_executor = ThreadPoolExecutor(
+    max_workers=settings.SIMULATION_WORKER_THREADS,
+    thread_name_prefix="simulation-turn"
+)
+
+
+async def _run_turn(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_turn_executor, fn, *args)
+
 
 # Mapping from frontend values to backend values
 PERSONA_MAP = {
@@ -49,8 +67,42 @@ SCENARIO_MAP = {
 }
 
 
+def _user_id(user: dict) -> Optional[int]:
+    user_id = user.get("id")
+    return int(user_id) if user_id and str(user_id).isdigit() else None
+
+
+def _record_turn(
+    session_id: str,
+    user: dict,
+    controller,
+    user_message: Optional[str],
+    result: dict,
+    started: float
+):
+    """Record a finished turn for analytics and transcript persistence (non-blocking)."""
+    if user_message is not None:
+        training_analytics.record_turn(session_id, result.get("risk"), result.get("mode", "SIMULATOR"))
+
+    if not settings.TRANSCRIPTS_ENABLED:
+        return
+
+    transcript_writer.record(
+        session_id=session_id,
+        user_id=_user_id(user),
+        persona=controller.persona,
+        scenario=controller.scenario,
+        turn_index=controller.get_session_info()["message_count"],
+        user_message=user_message,
+        response_message=result.get("message"),
+        mode=result.get("mode", "SIMULATOR"),
+        risk=result.get("risk"),
+        latency_ms=round((time.perf_counter() - started) * 1000, 2)
+    )
+
+
 @router.post("/start", response_model=SimulationResponse)
-async def start_simulation(request: StartSimulationRequest):
+async def start_simulation(request: StartSimulationRequest, user: dict = Depends(require_auth)):
     """
     Start a new simulation session.
     Returns session_id and initial scammer message.
@@ -66,20 +118,24 @@ async def start_simulation(request: StartSimulationRequest):
     if not controller:
         raise HTTPException(status_code=500, detail="Failed to create session")
     
-    # Generate initial scammer message
-    # We'll send an empty "start" to get the first message
-    result = controller.user_message("Hello")
+    training_analytics.start_session(session_id, _user_id(user), persona, scenario)
+    
+    # Generate initial scammer message (opening profile; identical openings are coalesced)
+    started = time.perf_counter()
+    result = await _run_turn(controller.start_simulation)
+    _record_turn(session_id, user, controller, None, result, started)
     
     return SimulationResponse(
         mode=SimulationMode.SIMULATOR,
         message=result.get("message", ""),
         risk=RiskLevel.LOW if result.get("risk") == "LOW" else None,
-        session_id=session_id
+        session_id=session_id,
+        fallback=result.get("fallback", False)
     )
 
 
 @router.post("/message", response_model=SimulationResponse)
-async def send_message(request: MessageRequest):
+async def send_message(request: MessageRequest, user: dict = Depends(require_auth)):
     """
     Send a user message and get the scammer/mentor response.
     """
@@ -89,7 +145,9 @@ async def send_message(request: MessageRequest):
         raise HTTPException(status_code=404, detail="Session not found")
     
     # Process user message
-    result = controller.user_message(request.message)
+    started = time.perf_counter()
+    result = await _run_turn(controller.user_message, request.message)
+    _record_turn(request.session_id, user, controller, request.message, result, started)
     
     # Map mode
     mode_str = result.get("mode", "SIMULATOR")
@@ -114,7 +172,8 @@ async def send_message(request: MessageRequest):
         mode=mode,
         message=result.get("message", ""),
         risk=risk,
-        session_id=request.session_id
+        session_id=request.session_id,
+        fallback=result.get("fallback", False)
     )
 
 
@@ -151,6 +210,7 @@ async def retry_simulation(request: SessionRequest):
     
     # Delete the old session
     session_store.delete_session(request.session_id)
+    training_analytics.end_session(request.session_id)
     
     return SimulationResponse(
         mode=SimulationMode.ENDED,
@@ -164,4 +224,7 @@ async def get_active_sessions():
     """
     Get the count of active simulation sessions (for monitoring).
     """
-    return {"active_sessions": session_store.get_active_count()}
+    return {
+        "active_sessions": session_store.get_active_count(),
+        "approx_memory_bytes": session_store.get_memory_estimate()
+    }
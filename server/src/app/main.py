@@ -3,19 +3,67 @@ CyberGuardian AI - FastAPI Backend Server
 Main entry point for the API server.
 """
 
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, Query
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
 from .api.v1.simulation import router as simulation_router
 from .api.v1.auth import router as auth_router
+from .api.v1.analytics import router as analytics_router
 from .security.config import settings
+from .security.jwt import require_auth
+from .services.account_cleanup import account_purger, start_purge_job
+from .services.transcript_writer import transcript_writer
+from .services.training_analytics import training_analytics, start_analytics_job
+from .services.rule_reloader import rule_packs, start_rule_reload_job
+from .services.llm_health import llm_pool, start_llm_health_job
+from .services.model_warmup import model_warmer, start_model_warmup_job
+from ai.risk_detection.profiler import pattern_profiler
+from ai.risk_detection.risk_detection import semantic_executor
+from ai.controller.simulation_controller import (
+    speculation_stats, fallback_stats, prompt_token_stats, stage_prompt_stats, summary_stats
+)
+from ai.llm.ollama_client import llm_breaker, llm_coalescer, llm_scheduler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background jobs on startup and stop them on shutdown."""
+    background_tasks = []
+    if settings.ACCOUNT_PURGE_ENABLED:
+        background_tasks.append(start_purge_job(account_purger))
+    if settings.TRANSCRIPTS_ENABLED:
+        transcript_writer.start()
+
+    try:
+        await training_analytics.load()
+    except Exception as e:
+        print(f"ANALYTICS LOAD ERROR: {str(e)}")
+    background_tasks.append(start_analytics_job(training_analytics))
+    if settings.RISK_RULES_RELOAD_INTERVAL_SECONDS > 0:
+        background_tasks.append(start_rule_reload_job())
+    if settings.LLM_HEALTH_CHECK_INTERVAL_SECONDS > 0:
+        background_tasks.append(start_llm_health_job())
+    if settings.MODEL_WARMUP_ENABLED:
+        background_tasks.append(start_model_warmup_job())
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await transcript_writer.stop()
+
 
 app = FastAPI(
     title="CyberGuardian AI",
     description="AI-powered scam simulation and training platform",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Session middleware for OAuth state management
@@ -61,6 +109,7 @@ app.add_middleware(
 # Include routers
 app.include_router(simulation_router, prefix="/api/v1/simulation", tags=["Simulation"])
 app.include_router(auth_router, prefix="/api/v1/auth", tags=["Authentication"])
+app.include_router(analytics_router, prefix="/api/v1/analytics", tags=["Analytics"])
 
 
 @app.get("/")
@@ -71,3 +120,48 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/ready")
+async def readiness():
+    """Ready once every configured model is resident on every healthy LLM backend."""
+    if not settings.MODEL_WARMUP_ENABLED:
+        return {"status": "ready", "models": None}
+    stats = model_warmer.get_stats()
+    if not stats["ready"]:
+        return JSONResponse(status_code=503, content={"status": "warming", "models": stats["models"]})
+    return {"status": "ready", "models": stats["models"]}
+
+
+@app.get("/metrics")
+async def metrics():
+    """Operational counters for background jobs."""
+    return {
+        "account_purge": account_purger.stats,
+        "transcripts": transcript_writer.get_stats(),
+        "risk_rules": rule_packs.get_stats(),
+        "risk_classifier": semantic_executor.get_stats() if semantic_executor else None,
+        "speculation": speculation_stats,
+        "llm_backends": llm_pool.get_stats(),
+        "llm_coalescing": llm_coalescer.get_stats(),
+        "llm_scheduler": llm_scheduler.get_stats(),
+        "llm_circuit": llm_breaker.get_stats(),
+        "llm_fallbacks": fallback_stats,
+        "prompt_tokens": prompt_token_stats,
+        "prompt_tokens_by_stage": stage_prompt_stats,
+        "history_summary": summary_stats,
+        "model_warmup": model_warmer.get_stats()
+    }
+
+
+@app.get("/metrics/risk-profile", dependencies=[Depends(require_auth)])
+async def risk_profile(top: int = Query(20, ge=1, le=200)):
+    """Per-pattern cost of sampled detect_risk calls (RISK_PROFILE_SAMPLE_RATE)."""
+    return pattern_profiler.report(top)
+
+
+@app.post("/metrics/risk-profile/reset", dependencies=[Depends(require_auth)])
+async def reset_risk_profile():
+    """Clear the sampled per-pattern costs."""
+    pattern_profiler.reset()
+    return {"status": "reset"}
@@ -0,0 +1,27 @@
+from datetime import datetime
+from sqlalchemy import String, DateTime, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..database import Base
+
+class TrainingStats(Base):
+    """Aggregated training counters for one user or one (persona, scenario) pair."""
+    __tablename__ = "training_stats"
+
+    scope: Mapped[str] = mapped_column(String(20), primary_key=True)  # user, scenario
+    key: Mapped[str] = mapped_column(String(120), primary_key=True)  # user id or "persona:scenario"
+    
+    sessions: Mapped[int] = mapped_column(Integer, default=0)
+    turns: Mapped[int] = mapped_column(Integer, default=0)
+    high_turns: Mapped[int] = mapped_column(Integer, default=0)
+    medium_turns: Mapped[int] = mapped_column(Integer, default=0)
+    mentor_triggers: Mapped[int] = mapped_column(Integer, default=0)
+    
+    # Sessions that reached HIGH risk and the summed turns it took to get there
+    sessions_with_high: Mapped[int] = mapped_column(Integer, default=0)
+    turns_to_first_high_total: Mapped[int] = mapped_column(Integer, default=0)
+    
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<TrainingStats {self.scope}:{self.key}>"
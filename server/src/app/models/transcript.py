@@ -0,0 +1,30 @@
+from datetime import datetime
+from sqlalchemy import String, DateTime, Integer, Float, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..database import Base
+
+class SimulationTurn(Base):
+    """One persisted exchange of a simulation transcript."""
+    __tablename__ = "simulation_turns"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    session_id: Mapped[str] = mapped_column(String(36), index=True, nullable=False)
+    user_id: Mapped[int] = mapped_column(Integer, index=True, nullable=True)
+    
+    persona: Mapped[str] = mapped_column(String(50), nullable=False)
+    scenario: Mapped[str] = mapped_column(String(50), nullable=False)
+    
+    # Turn content
+    turn_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    user_message: Mapped[str] = mapped_column(Text, nullable=True)  # Null for the opening message
+    response_message: Mapped[str] = mapped_column(Text, nullable=True)
+    mode: Mapped[str] = mapped_column(String(20), nullable=False)  # SIMULATOR, MENTOR, ENDED
+    risk: Mapped[str] = mapped_column(String(10), nullable=True)  # LOW, MEDIUM, HIGH
+    
+    # Timings
+    latency_ms: Mapped[float] = mapped_column(Float, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<SimulationTurn {self.session_id}#{self.turn_index}>"
@@ -0,0 +1,33 @@
+"""
+Pydantic schemas for training analytics endpoints.
+"""
+
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class TrainingStatsResponse(BaseModel):
+    """Aggregated training counters and derived rates."""
+    sessions: int
+    turns: int
+    high_turns: int
+    medium_turns: int
+    mentor_triggers: int
+    sessions_with_high: int
+    turns_to_first_high_total: int
+    high_rate: float
+    medium_rate: float
+    fall_rate: float  # Share of sessions that reached HIGH risk
+    avg_turns_to_first_high: Optional[float] = None
+
+
+class ScenarioStatsResponse(TrainingStatsResponse):
+    """Training counters for one (persona, scenario) pair."""
+    persona: str
+    scenario: str
+
+
+class AnalyticsResponse(BaseModel):
+    """Dashboard payload: the caller's own stats plus per-scenario aggregates."""
+    user: TrainingStatsResponse
+    scenarios: List[ScenarioStatsResponse]
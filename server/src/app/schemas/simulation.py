@@ -45,3 +45,4 @@ class SimulationResponse(BaseModel):
     session_id: Optional[str] = None
     manipulation_tactic: Optional[str] = None
     guidance: Optional[str] = None
+    fallback: bool = False  # Templated reply; the LLM was down or over budget
@@ -48,6 +48,34 @@ class OAuthSettings:
     
     # Email Verification Settings
     EMAIL_VERIFICATION_EXPIRY_MINUTES: int = int(os.getenv("EMAIL_VERIFICATION_EXPIRY_MINUTES", "15"))
+    
+    # Unverified Account Purge Settings
+    ACCOUNT_PURGE_ENABLED: bool = os.getenv("ACCOUNT_PURGE_ENABLED", "true").lower() == "true"
+    ACCOUNT_PURGE_INTERVAL_MINUTES: int = int(os.getenv("ACCOUNT_PURGE_INTERVAL_MINUTES", "60"))
+    ACCOUNT_PURGE_BATCH_SIZE: int = int(os.getenv("ACCOUNT_PURGE_BATCH_SIZE", "500"))
+    UNVERIFIED_ACCOUNT_RETENTION_HOURS: int = int(os.getenv("UNVERIFIED_ACCOUNT_RETENTION_HOURS", "72"))
+    
+    # Simulation Transcript Persistence
+    TRANSCRIPTS_ENABLED: bool = os.getenv("TRANSCRIPTS_ENABLED", "true").lower() == "true"
+    TRANSCRIPT_FLUSH_INTERVAL_MS: int = int(os.getenv("TRANSCRIPT_FLUSH_INTERVAL_MS", "200"))
+    TRANSCRIPT_BATCH_SIZE: int = int(os.getenv("TRANSCRIPT_BATCH_SIZE", "500"))
+    TRANSCRIPT_QUEUE_SIZE: int = int(os.getenv("TRANSCRIPT_QUEUE_SIZE", "50000"))
+    
+    # Training Analytics
+    ANALYTICS_FLUSH_INTERVAL_SECONDS: int = int(os.getenv("ANALYTICS_FLUSH_INTERVAL_SECONDS", "30"))
+    # Analytics forgets sessions with no turn for this long (abandoned without /retry)
+    ANALYTICS_SESSION_TTL_SECONDS: int = int(os.getenv("ANALYTICS_SESSION_TTL_SECONDS", "3600"))
+    
+    # Risk Rule Packs (RISK_RULE_PACK selects the file; 0 disables hot reload)
+    RISK_RULES_RELOAD_INTERVAL_SECONDS: int = int(os.getenv("RISK_RULES_RELOAD_INTERVAL_SECONDS", "10"))
+    
+    # LLM Backend Pool (OLLAMA_URL may list several endpoints; 0 disables health checks)
+    LLM_HEALTH_CHECK_INTERVAL_SECONDS: int = int(os.getenv("LLM_HEALTH_CHECK_INTERVAL_SECONDS", "5"))
+    # Model Warmup (preload at startup; residency check / idle ping interval)
+    MODEL_WARMUP_ENABLED: bool = os.getenv("MODEL_WARMUP_ENABLED", "true").lower() == "true"
+    MODEL_KEEPALIVE_CHECK_SECONDS: int = int(os.getenv("MODEL_KEEPALIVE_CHECK_SECONDS", "30"))
+    # Threads running simulation turns (each mostly waits on the LLM scheduler)
+    SIMULATION_WORKER_THREADS: int = int(os.getenv("SIMULATION_WORKER_THREADS", "256"))
 
 
 # Global settings instance
@@ -0,0 +1,179 @@
+"""
+Account Cleanup Service for CyberGuardian AI.
+Purges expired, never-verified signups and stale verification tokens.
+
+The purge walks the users table in primary-key order (keyset pagination) and
+commits every chunk in its own short transaction, so no long-held locks are
+taken on the users table or its unique email index.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..models.user import User
+from ..database import AsyncSessionLocal
+from ..security.config import settings
+
+
+class UnverifiedAccountPurger:
+    """
+    Deletes local accounts whose email was never verified and whose
+    verification code expired more than `retention_hours` ago.
+
+    Verified accounts never carry a verification token, so any leftover
+    token on a verified account is cleared in the same pass.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        batch_size: int = settings.ACCOUNT_PURGE_BATCH_SIZE,
+        retention_hours: int = settings.UNVERIFIED_ACCOUNT_RETENTION_HOURS,
+        batch_pause_seconds: float = 0.05
+    ):
+        self._session_factory = session_factory
+        self.batch_size = batch_size
+        self.retention_hours = retention_hours
+        self.batch_pause_seconds = batch_pause_seconds
+        self.stats = {
+            "runs": 0,
+            "last_run_at": None,
+            "last_run_seconds": 0.0,
+            "last_rows_per_second": 0.0,
+            "last_deleted": 0,
+            "last_tokens_cleared": 0,
+            "total_deleted": 0,
+            "total_tokens_cleared": 0,
+            "last_error": None,
+        }
+
+    def _expired_unverified(self, cutoff: datetime):
+        return (
+            User.email_verified.is_(False)
+            & (User.provider == "local")
+            & User.email_verification_expires_at.is_not(None)
+            & (User.email_verification_expires_at < cutoff)
+        )
+
+    def _stale_token(self):
+        return User.email_verified.is_(True) & User.email_verification_token.is_not(None)
+
+    async def _next_chunk(self, db: AsyncSession, condition, last_id: int) -> list:
+        result = await db.execute(
+            select(User.id)
+            .where(User.id > last_id, condition)
+            .order_by(User.id)
+            .limit(self.batch_size)
+        )
+        return list(result.scalars())
+
+    async def _sweep(self, condition, apply_chunk, dry_run: bool) -> int:
+        """Walk matching rows chunk by chunk, one short transaction per chunk."""
+        processed = 0
+        last_id = 0
+
+        while True:
+            async with self._session_factory() as db:
+                ids = await self._next_chunk(db, condition, last_id)
+                if not ids:
+                    break
+
+                if dry_run:
+                    processed += len(ids)
+                else:
+                    # Re-apply the condition so a user who verified between
+                    # the select and the write is left untouched.
+                    result = await db.execute(apply_chunk(ids, condition))
+                    await db.commit()
+                    processed += result.rowcount
+
+            last_id = ids[-1]
+            if len(ids) < self.batch_size:
+                break
+            await asyncio.sleep(self.batch_pause_seconds)
+
+        return processed
+
+    async def purge_once(self, dry_run: bool = False) -> dict:
+        """
+        Run a single purge pass.
+
+        Returns:
+            dict with deleted/cleared row counts and throughput for this pass
+        """
+        started = time.perf_counter()
+        cutoff = datetime.utcnow() - timedelta(hours=self.retention_hours)
+
+        deleted = await self._sweep(
+            self._expired_unverified(cutoff),
+            lambda ids, condition: delete(User)
+                .where(User.id.in_(ids), condition)
+                .execution_options(synchronize_session=False),
+            dry_run
+        )
+        tokens_cleared = await self._sweep(
+            self._stale_token(),
+            lambda ids, condition: update(User)
+                .where(User.id.in_(ids), condition)
+                .values(email_verification_token=None, email_verification_expires_at=None)
+                .execution_options(synchronize_session=False),
+            dry_run
+        )
+
+        elapsed = time.perf_counter() - started
+        rows = deleted + tokens_cleared
+        report = {
+            "deleted": deleted,
+            "tokens_cleared": tokens_cleared,
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(rows / elapsed, 1) if elapsed > 0 else 0.0,
+            "dry_run": dry_run,
+        }
+
+        if not dry_run:
+            self.stats["runs"] += 1
+            self.stats["last_run_at"] = datetime.utcnow().isoformat()
+            self.stats["last_run_seconds"] = report["seconds"]
+            self.stats["last_rows_per_second"] = report["rows_per_second"]
+            self.stats["last_deleted"] = deleted
+            self.stats["last_tokens_cleared"] = tokens_cleared
+            self.stats["total_deleted"] += deleted
+            self.stats["total_tokens_cleared"] += tokens_cleared
+            self.stats["last_error"] = None
+
+        return report
+
+    async def run_forever(self, interval_seconds: float):
+        """Purge on a fixed interval until cancelled."""
+        while True:
+            try:
+                report = await self.purge_once()
+                if report["deleted"] or report["tokens_cleared"]:
+                    print(
+                        f"Account purge: deleted {report['deleted']} unverified users, "
+                        f"cleared {report['tokens_cleared']} stale tokens "
+                        f"({report['rows_per_second']} rows/s)"
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["last_error"] = str(e)
+                print(f"ACCOUNT PURGE ERROR: {str(e)}")
+            await asyncio.sleep(interval_seconds)
+
+
+# Global purger instance used by the app lifespan
+account_purger = UnverifiedAccountPurger()
+
+
+def start_purge_job(purger: Optional[UnverifiedAccountPurger] = None) -> asyncio.Task:
+    """Schedule the periodic purge on the running event loop."""
+    purger = purger or account_purger
+    return asyncio.create_task(
+        purger.run_forever(settings.ACCOUNT_PURGE_INTERVAL_MINUTES * 60)
+    )
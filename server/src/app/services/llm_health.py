@@ -0,0 +1,25 @@
+"""
+LLM Backend Health Checker for CyberGuardian AI.
+Probes every endpoint in the LLM backend pool on an interval, ejecting the
+ones that stop answering and readmitting them once they recover.
+"""
+
+import asyncio
+
+from ai.llm.ollama_client import llm_pool
+from ..security.config import settings
+
+
+async def watch_llm_backends(interval_seconds: float):
+    """Health-check the backend pool on a fixed interval until cancelled."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(llm_pool.check_health)
+        except Exception as e:
+            print(f"LLM HEALTH CHECK ERROR: {str(e)}")
+
+
+def start_llm_health_job() -> asyncio.Task:
+    """Schedule backend health checks on the running event loop."""
+    return asyncio.create_task(watch_llm_backends(settings.LLM_HEALTH_CHECK_INTERVAL_SECONDS))
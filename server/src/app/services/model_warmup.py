@@ -0,0 +1,35 @@
+"""
+Model Warmup Job for CyberGuardian AI.
+Preloads the configured models on every LLM backend at startup, then keeps
+them resident: residency is re-checked on an interval and a backend is
+pinged only when it has been idle long enough for its keep_alive to lapse.
+"""
+
+import asyncio
+
+from ai.llm.ollama_client import llm_pool, llm_scheduler
+from ai.llm.warmup import WARM_MODELS, ModelWarmer
+from ..security.config import settings
+
+model_warmer = ModelWarmer(llm_pool, WARM_MODELS, scheduler=llm_scheduler)
+
+
+async def keep_models_warm(interval_seconds: float):
+    """Warm every model once, then refresh idle backends until cancelled."""
+    try:
+        await asyncio.to_thread(model_warmer.warm)
+    except Exception as e:
+        print(f"MODEL WARMUP ERROR: {str(e)}")
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(model_warmer.check_resident)
+            await asyncio.to_thread(model_warmer.ping_idle)
+        except Exception as e:
+            print(f"MODEL KEEP-ALIVE ERROR: {str(e)}")
+
+
+def start_model_warmup_job() -> asyncio.Task:
+    """Schedule warmup and keep-alive on the running event loop."""
+    return asyncio.create_task(keep_models_warm(settings.MODEL_KEEPALIVE_CHECK_SECONDS))
@@ -0,0 +1,30 @@
+"""
+Risk Rule Pack Reloader for CyberGuardian AI.
+Polls the active rule pack file and hot-swaps it when it changes.
+
+Compilation and corpus validation run in a worker thread, so in-flight
+detect_risk calls (and the event loop) never wait on a reload; a pack that
+fails validation is rejected and the previous one stays active.
+"""
+
+import asyncio
+
+from ai.risk_detection.risk_detection import rule_packs
+from ..security.config import settings
+
+
+async def watch_rule_pack(interval_seconds: float):
+    """Check the rule pack for changes on a fixed interval until cancelled."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            result = await asyncio.to_thread(rule_packs.reload_if_changed)
+            if result and result["swapped"]:
+                print(f"RULE PACK RELOADED: version {result['version']}")
+        except Exception as e:
+            print(f"RULE PACK RELOAD ERROR: {str(e)}")
+
+
+def start_rule_reload_job() -> asyncio.Task:
+    """Schedule rule pack polling on the running event loop."""
+    return asyncio.create_task(watch_rule_pack(settings.RISK_RULES_RELOAD_INTERVAL_SECONDS))
@@ -31,7 +31,7 @@ class SessionStore:
         Create a new simulation session and return the session_id.
         """
         session_id = str(uuid.uuid4())
-        controller = SimulationController(persona, age, scenario)
+        controller = SimulationController(persona, age, scenario, session_id)
         self._sessions[session_id] = controller
         return session_id
     
@@ -55,6 +55,17 @@ class SessionStore:
         Get the number of active sessions.
         """
         return len(self._sessions)
+    
+    def get_memory_estimate(self) -> int:
+        """
+        Approximate bytes held by stored sessions (prompts and histories).
+        """
+        total = sys.getsizeof(self._sessions)
+        for session_id, controller in list(self._sessions.items()):
+            total += sys.getsizeof(session_id)
+            total += sum(sys.getsizeof(value) for value in vars(controller).values())
+            total += sum(sys.getsizeof(value) for value in vars(controller.session).values())
+        return total
 
 
 # Global session store instance
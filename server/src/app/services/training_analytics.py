@@ -0,0 +1,222 @@
+"""
+Training Analytics Service for CyberGuardian AI.
+Maintains per-user and per-(persona, scenario) counters incrementally.
+
+Every turn updates a handful of in-memory counters in O(1); the increments
+since the last flush are added to the training_stats table periodically
+(UPDATE ... SET col = col + delta), so dashboards never have to scan raw
+transcripts, and several workers, or a worker whose load() failed, never
+overwrite each other's totals.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from ..models.analytics import TrainingStats
+from ..database import AsyncSessionLocal
+from ..security.config import settings
+
+COUNTER_FIELDS = (
+    "sessions",
+    "turns",
+    "high_turns",
+    "medium_turns",
+    "mentor_triggers",
+    "sessions_with_high",
+    "turns_to_first_high_total",
+)
+
+
+def _empty_counters() -> dict:
+    return {field: 0 for field in COUNTER_FIELDS}
+
+
+def summarize(counters: dict) -> dict:
+    """Derive dashboard rates from raw counters."""
+    turns = counters["turns"]
+    sessions = counters["sessions"]
+    with_high = counters["sessions_with_high"]
+    return {
+        **counters,
+        "high_rate": round(counters["high_turns"] / turns, 4) if turns else 0.0,
+        "medium_rate": round(counters["medium_turns"] / turns, 4) if turns else 0.0,
+        "fall_rate": round(with_high / sessions, 4) if sessions else 0.0,
+        "avg_turns_to_first_high": (
+            round(counters["turns_to_first_high_total"] / with_high, 2) if with_high else None
+        ),
+    }
+
+
+class TrainingAnalytics:
+    """Incremental training counters with periodic persistence."""
+
+    def __init__(self, session_factory: async_sessionmaker = AsyncSessionLocal):
+        self._session_factory = session_factory
+        # Totals for reads, and the increments not yet written to the database
+        self._counters: Dict[Tuple[str, str], dict] = {}
+        self._pending: Dict[Tuple[str, str], dict] = {}
+        # Live sessions only: session_id -> [user key, scenario key, turns, reached HIGH, last seen]
+        self._sessions: Dict[str, list] = {}
+
+    def _add(self, scope: str, key: str, field: str, amount: int = 1):
+        for counters in (self._counters, self._pending):
+            bucket = counters.get((scope, key))
+            if bucket is None:
+                bucket = counters[(scope, key)] = _empty_counters()
+            bucket[field] += amount
+
+    def start_session(self, session_id: str, user_id: Optional[int], persona: str, scenario: str):
+        user_key = str(user_id) if user_id is not None else None
+        scenario_key = f"{persona}:{scenario}"
+        self._sessions[session_id] = [user_key, scenario_key, 0, False, time.monotonic()]
+
+        self._add("scenario", scenario_key, "sessions")
+        if user_key is not None:
+            self._add("user", user_key, "sessions")
+
+    def record_turn(self, session_id: str, risk: Optional[str], mode: str):
+        """Fold one user turn into the counters. O(1)."""
+        session = self._sessions.get(session_id)
+        if session is None:
+            return
+        if risk is None:
+            # No verdict: a message sent while the mentor screen pauses the session, or after it ended
+            if mode == "ENDED":
+                self.end_session(session_id)
+            return
+
+        user_key, scenario_key, turns, reached_high, _ = session
+        session[2] = turns = turns + 1
+        session[4] = time.monotonic()
+
+        scopes = [("scenario", scenario_key)]
+        if user_key is not None:
+            scopes.append(("user", user_key))
+
+        first_high = risk == "HIGH" and not reached_high
+        if first_high:
+            session[3] = True
+
+        for scope, key in scopes:
+            self._add(scope, key, "turns")
+            if risk == "HIGH":
+                self._add(scope, key, "high_turns")
+            elif risk == "MEDIUM":
+                self._add(scope, key, "medium_turns")
+            if mode == "MENTOR" and risk == "HIGH":
+                self._add(scope, key, "mentor_triggers")
+            if first_high:
+                self._add(scope, key, "sessions_with_high")
+                self._add(scope, key, "turns_to_first_high_total", turns)
+
+        if mode == "ENDED":
+            self.end_session(session_id)
+
+    def end_session(self, session_id: str):
+        self._sessions.pop(session_id, None)
+
+    def evict_idle(self, ttl_seconds: float) -> int:
+        """Forget sessions with no turn for `ttl_seconds` (abandoned without /retry). Returns sessions evicted."""
+        cutoff = time.monotonic() - ttl_seconds
+        idle = [session_id for session_id, session in self._sessions.items() if session[4] < cutoff]
+        for session_id in idle:
+            del self._sessions[session_id]
+        return len(idle)
+
+    def get_user_stats(self, user_id: Optional[int]) -> dict:
+        return summarize(self._counters.get(("user", str(user_id)), _empty_counters()))
+
+    def get_scenario_stats(self) -> list:
+        stats = []
+        for (scope, key), counters in sorted(self._counters.items()):
+            if scope != "scenario":
+                continue
+            persona, scenario = key.split(":", 1)
+            stats.append({"persona": persona, "scenario": scenario, **summarize(counters)})
+        return stats
+
+    async def load(self):
+        """
+        Read persisted totals (including other workers' increments); totals
+        for reads become the persisted values plus increments not yet flushed.
+        """
+        async with self._session_factory() as db:
+            result = await db.execute(select(TrainingStats))
+            counters = {
+                (row.scope, row.key): {field: getattr(row, field) or 0 for field in COUNTER_FIELDS}
+                for row in result.scalars()
+            }
+        for key, pending in self._pending.items():
+            totals = counters.setdefault(key, _empty_counters())
+            for field in COUNTER_FIELDS:
+                totals[field] += pending[field]
+        self._counters = counters
+
+    async def flush(self) -> int:
+        """Add the increments since the last flush to the stored rows. Returns rows written."""
+        if not self._pending:
+            return 0
+
+        pending, self._pending = self._pending, {}
+        try:
+            async with self._session_factory() as db:
+                for (scope, key), deltas in pending.items():
+                    result = await db.execute(
+                        update(TrainingStats)
+                        .where(TrainingStats.scope == scope, TrainingStats.key == key)
+                        .values(
+                            updated_at=datetime.utcnow(),
+                            **{field: getattr(TrainingStats, field) + deltas[field] for field in COUNTER_FIELDS}
+                        )
+                    )
+                    if result.rowcount == 0:
+                        await db.execute(insert(TrainingStats).values(
+                            scope=scope, key=key, updated_at=datetime.utcnow(), **deltas
+                        ))
+                await db.commit()
+        except Exception:
+            # Put the increments back so the next flush retries them
+            for key, deltas in pending.items():
+                current = self._pending.setdefault(key, _empty_counters())
+                for field in COUNTER_FIELDS:
+                    current[field] += deltas[field]
+            raise
+        return len(pending)
+
+    async def run_forever(self, interval_seconds: float, session_ttl_seconds: float = 3600):
+        """
+        Flush and refresh totals on a fixed interval until cancelled, then
+        flush once more. Sessions idle for `session_ttl_seconds` are dropped.
+        """
+        try:
+            while True:
+                await asyncio.sleep(interval_seconds)
+                self.evict_idle(session_ttl_seconds)
+                try:
+                    await self.flush()
+                    await self.load()
+                except Exception as e:
+                    print(f"ANALYTICS FLUSH ERROR: {str(e)}")
+        finally:
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"ANALYTICS FLUSH ERROR: {str(e)}")
+
+
+# Global analytics instance
+training_analytics = TrainingAnalytics()
+
+
+def start_analytics_job(analytics: Optional[TrainingAnalytics] = None) -> asyncio.Task:
+    """Schedule periodic persistence on the running event loop."""
+    analytics = analytics or training_analytics
+    return asyncio.create_task(analytics.run_forever(
+        settings.ANALYTICS_FLUSH_INTERVAL_SECONDS,
+        settings.ANALYTICS_SESSION_TTL_SECONDS
+    ))
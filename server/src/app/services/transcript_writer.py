@@ -0,0 +1,150 @@
+"""
+Batched transcript writer for CyberGuardian AI.
+Persists simulation turns without adding database latency to the chat routes.
+
+Routes enqueue rows with `record()`, which never awaits the database. A single
+background task coalesces queued rows and flushes them with one multi-row
+INSERT every `flush_interval_ms` or as soon as `batch_size` rows are waiting.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from ..models.transcript import SimulationTurn
+from ..database import AsyncSessionLocal
+from ..security.config import settings
+
+# Queue sentinel that tells the flush loop to drain and exit
+_STOP = object()
+
+
+class TranscriptWriter:
+    """Coalesces simulation turns and writes them in batches."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        flush_interval_ms: int = settings.TRANSCRIPT_FLUSH_INTERVAL_MS,
+        batch_size: int = settings.TRANSCRIPT_BATCH_SIZE,
+        max_queue_size: int = settings.TRANSCRIPT_QUEUE_SIZE
+    ):
+        self._session_factory = session_factory
+        self.flush_interval = flush_interval_ms / 1000
+        self.batch_size = batch_size
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.stats = {
+            "rows_written": 0,
+            "batches_written": 0,
+            "rows_dropped": 0,
+            "write_errors": 0,
+            "last_batch_size": 0,
+            "last_flush_ms": 0.0,
+        }
+
+    def record(
+        self,
+        session_id: str,
+        user_id: Optional[int],
+        persona: str,
+        scenario: str,
+        turn_index: int,
+        user_message: Optional[str],
+        response_message: Optional[str],
+        mode: str,
+        risk: Optional[str],
+        latency_ms: Optional[float]
+    ) -> bool:
+        """
+        Queue one turn for persistence. Never blocks.
+
+        Returns:
+            False if the queue is full and the turn was dropped
+        """
+        row = {
+            "session_id": session_id,
+            "user_id": user_id,
+            "persona": persona,
+            "scenario": scenario,
+            "turn_index": turn_index,
+            "user_message": user_message,
+            "response_message": response_message,
+            "mode": mode,
+            "risk": risk,
+            "latency_ms": latency_ms,
+            "created_at": datetime.utcnow(),
+        }
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except asyncio.QueueFull:
+            self.stats["rows_dropped"] += 1
+            return False
+
+    def get_stats(self) -> dict:
+        return {**self.stats, "queue_depth": self._queue.qsize()}
+
+    async def _collect_batch(self) -> list:
+        """Wait for the first row, then gather more until the deadline or batch size."""
+        batch = []
+        item = await self._queue.get()
+        deadline = time.monotonic() + self.flush_interval
+
+        while item is not _STOP:
+            batch.append(item)
+            remaining = deadline - time.monotonic()
+            if len(batch) >= self.batch_size or remaining <= 0:
+                return batch
+            try:
+                item = await asyncio.wait_for(self._queue.get(), remaining)
+            except asyncio.TimeoutError:
+                return batch
+
+        self._stopping = True
+        return batch
+
+    async def _write(self, batch: list):
+        started = time.perf_counter()
+        try:
+            async with self._session_factory() as db:
+                await db.execute(insert(SimulationTurn).values(batch))
+                await db.commit()
+        except Exception as e:
+            self.stats["write_errors"] += 1
+            self.stats["rows_dropped"] += len(batch)
+            print(f"TRANSCRIPT WRITE ERROR: {str(e)}")
+            return
+
+        self.stats["rows_written"] += len(batch)
+        self.stats["batches_written"] += 1
+        self.stats["last_batch_size"] = len(batch)
+        self.stats["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    async def _run(self):
+        while not self._stopping:
+            batch = await self._collect_batch()
+            if batch:
+                await self._write(batch)
+
+    def start(self):
+        """Start the background flush loop on the running event loop."""
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Flush everything still queued, then stop the flush loop."""
+        if self._task is not None:
+            await self._queue.put(_STOP)
+            await self._task
+            self._task = None
+
+
+# Global transcript writer instance
+transcript_writer = TranscriptWriter()
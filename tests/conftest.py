@@ -0,0 +1,32 @@
+"""
+Shared fixtures for the test suite.
+
+`stub` starts a StubOllamaServer and points call_ollama at it. Modules
+that need a different backend (slower, rambling, cold-loading) override
+`stub_config`; everything else about the stub lives here.
+"""
+import sys
+import os
+
+import pytest
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from ai.llm import ollama_client
+from ai.llm.backend_pool import BackendPool
+from ai.llm.stub_ollama import StubOllamaConfig, StubOllamaServer
+
+
+@pytest.fixture
+def stub_config():
+    return StubOllamaConfig(latency_ms=10, tokens_per_sec=1000)
+
+
+@pytest.fixture
+def stub(monkeypatch, stub_config):
+    server = StubOllamaServer(config=stub_config).start()
+    monkeypatch.setattr(ollama_client, "llm_pool", BackendPool([server.url]))
+    yield server
+    server.stop()
@@ -0,0 +1,117 @@
+"""
+Tests for the unverified account purge job.
+Run with: python -m pytest tests/test_account_cleanup.py -v
+"""
+import asyncio
+import sys
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("aiosqlite")
+
+# Add server directory to path
+server_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'server'))
+sys.path.insert(0, server_root)
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from src.app.database import Base
+from src.app.models.user import User
+from src.app.services.account_cleanup import UnverifiedAccountPurger
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+async def _setup(tmp_path, users):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'users.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with factory() as db:
+        db.add_all(users)
+        await db.commit()
+    return engine, factory
+
+
+async def _emails(factory):
+    async with factory() as db:
+        result = await db.execute(select(User.email).order_by(User.id))
+        return list(result.scalars())
+
+
+def _unverified(email, expired_hours_ago):
+    return User(
+        email=email,
+        email_verified=False,
+        provider="local",
+        email_verification_token="123456",
+        email_verification_expires_at=datetime.utcnow() - timedelta(hours=expired_hours_ago),
+    )
+
+
+class TestUnverifiedAccountPurge:
+    """Test that only expired, unverified local accounts are removed."""
+
+    def test_deletes_expired_unverified_in_chunks(self, tmp_path):
+        users = [_unverified(f"old{i}@example.com", 100) for i in range(7)]
+        users.append(_unverified("recent@example.com", 1))
+        users.append(User(email="verified@example.com", email_verified=True, provider="local"))
+
+        async def scenario():
+            engine, factory = await _setup(tmp_path, users)
+            purger = UnverifiedAccountPurger(factory, batch_size=3, retention_hours=72, batch_pause_seconds=0)
+            report = await purger.purge_once()
+            emails = await _emails(factory)
+            await engine.dispose()
+            return report, emails, purger.stats
+
+        report, emails, stats = _run(scenario())
+
+        assert report["deleted"] == 7
+        assert emails == ["recent@example.com", "verified@example.com"]
+        assert stats["total_deleted"] == 7
+        assert stats["runs"] == 1
+
+    def test_clears_stale_tokens_on_verified_accounts(self, tmp_path):
+        stale = User(
+            email="stale@example.com",
+            email_verified=True,
+            provider="local",
+            email_verification_token="654321",
+            email_verification_expires_at=datetime.utcnow(),
+        )
+
+        async def scenario():
+            engine, factory = await _setup(tmp_path, [stale])
+            purger = UnverifiedAccountPurger(factory, batch_size=10, retention_hours=72)
+            report = await purger.purge_once()
+            async with factory() as db:
+                user = (await db.execute(select(User))).scalar_one()
+            await engine.dispose()
+            return report, user
+
+        report, user = _run(scenario())
+
+        assert report["tokens_cleared"] == 1
+        assert user.email_verification_token is None
+        assert user.email_verification_expires_at is None
+
+    def test_dry_run_does_not_modify(self, tmp_path):
+        async def scenario():
+            engine, factory = await _setup(tmp_path, [_unverified("old@example.com", 100)])
+            purger = UnverifiedAccountPurger(factory, batch_size=10, retention_hours=72)
+            report = await purger.purge_once(dry_run=True)
+            emails = await _emails(factory)
+            await engine.dispose()
+            return report, emails
+
+        report, emails = _run(scenario())
+
+        assert report["deleted"] == 1
+        assert emails == ["old@example.com"]
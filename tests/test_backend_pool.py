@@ -0,0 +1,146 @@
+"""
+Tests for least-loaded routing across several LLM backends.
+Run with: python -m pytest tests/test_backend_pool.py -v
+"""
+import os
+import socket
+import sys
+import threading
+
+import pytest
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from ai.llm import ollama_client
+from ai.llm.backend_pool import OPENAI_API, BackendPool, LLMBackend
+from ai.llm.ollama_client import LLMUnavailable, call_ollama
+from ai.llm.stub_ollama import StubOllamaConfig, StubOllamaServer
+
+
+@pytest.fixture
+def stubs():
+    servers = []
+
+    def start(**config):
+        config = {"default_tokens": 10, "tokens_per_sec": 1000, **config}
+        server = StubOllamaServer(config=StubOllamaConfig(**config)).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def use_pool(monkeypatch, urls, **kwargs):
+    pool = BackendPool(urls, **kwargs)
+    monkeypatch.setattr(ollama_client, "llm_pool", pool)
+    return pool
+
+
+def closed_port_url():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{s.getsockname()[1]}"
+
+
+class TestRouting:
+    """Test backend selection."""
+
+    def test_parse_backend_spec(self):
+        assert LLMBackend.parse("http://a:11434/").url == "http://a:11434"
+        backend = LLMBackend.parse(" openai+http://b:8000")
+        assert (backend.url, backend.api) == ("http://b:8000", OPENAI_API)
+
+    def test_prefers_idle_then_fast(self):
+        pool = BackendPool(["http://a", "http://b"])
+        first = pool.acquire()
+        second = pool.acquire()
+        assert first is not second  # Unknown latency: spread by in-flight count
+        pool.release(first, 0.05)
+        pool.release(second, 0.5)
+        assert pool.acquire() is first
+
+    def test_busy_fast_backend_yields_to_idle_slow_one(self):
+        pool = BackendPool(["http://fast", "http://slow"])
+        fast, slow = pool.backends
+        fast.latency_ewma, slow.latency_ewma = 0.1, 0.25
+        fast.in_flight = 3
+        assert pool.acquire() is slow
+
+    def test_slow_backend_gets_less_traffic(self, stubs, monkeypatch):
+        fast = [stubs(latency_ms=10, tokens_per_sec=500) for _ in range(2)]
+        slow = stubs(latency_ms=150, tokens_per_sec=50)
+        use_pool(monkeypatch, [s.url for s in fast] + [slow.url])
+
+        def worker():
+            for _ in range(6):
+                call_ollama("hello")
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sum(s.stats["requests"] for s in fast + [slow]) == 48
+        assert slow.stats["requests"] < min(s.stats["requests"] for s in fast) / 2
+
+
+class TestHealth:
+    """Test failover, ejection and readmission."""
+
+    def test_unreachable_backend_fails_over(self, stubs, monkeypatch):
+        server = stubs()
+        pool = use_pool(monkeypatch, [closed_port_url(), server.url], max_failures=1)
+        pool.backends[1].latency_ewma = 1.0  # Route to the dead one first
+
+        assert call_ollama("hello")
+        assert pool.stats["failovers"] == 1
+        assert not pool.backends[0].healthy
+        call_ollama("hello")
+        assert server.stats["requests"] == 2
+
+    def test_server_errors_eject_and_health_check_readmits(self, stubs, monkeypatch):
+        down = stubs(available=False)
+        up = stubs()
+        pool = use_pool(monkeypatch, [down.url, up.url], max_failures=2)
+
+        for _ in range(6):
+            assert call_ollama("hello")
+        assert not pool.backends[0].healthy
+        assert pool.backends[0].errors == 2
+
+        assert pool.check_health() == {down.url: False, up.url: True}
+        down.config.available = True
+        assert pool.check_health() == {down.url: True, up.url: True}
+        assert pool.stats["readmissions"] == 1
+
+    def test_all_backends_down_raises(self, stubs, monkeypatch):
+        use_pool(monkeypatch, [stubs(available=False).url, closed_port_url()])
+        with pytest.raises(LLMUnavailable):
+            call_ollama("hello")
+
+    def test_client_errors_do_not_eject(self, monkeypatch):
+        pool = use_pool(monkeypatch, ["http://a"], max_failures=1)
+        monkeypatch.setattr(ollama_client, "_call_ollama", lambda *args: {}["missing"])
+        with pytest.raises(KeyError):
+            call_ollama("hello")
+        assert pool.backends[0].healthy
+        assert pool.backends[0].in_flight == 0
+
+
+class TestOpenAICompatible:
+    """Test OpenAI-compatible completion servers in the pool."""
+
+    def test_same_reply_as_ollama(self, stubs, monkeypatch):
+        server = stubs()
+        use_pool(monkeypatch, [server.url])
+        expected = call_ollama("hello", profile="scammer_turn")
+
+        pool = use_pool(monkeypatch, [f"openai+{server.url}"])
+        assert call_ollama("hello", profile="scammer_turn") == expected
+        assert call_ollama("hello", threading.Event(), "scammer_turn") == expected
+        assert pool.check_health() == {server.url: True}
@@ -0,0 +1,113 @@
+"""
+Tests for the LLM record/replay cassette.
+Run with: python -m pytest tests/test_cassette.py -v
+"""
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from ai.llm import ollama_client
+from ai.llm.backend_pool import BackendPool
+from ai.llm.cassette import RECORD, REPLAY, Cassette, CassetteMiss, run_conversation_flows
+from ai.llm.circuit_breaker import CircuitBreaker
+from ai.llm.ollama_client import GenerationCancelled, LLMUnavailable, call_ollama
+from ai.llm.stub_ollama import StubOllamaConfig
+
+
+@pytest.fixture
+def stub_config():
+    return StubOllamaConfig(latency_ms=20, tokens_per_sec=1000)
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    """Nothing listens here; any network call fails."""
+    monkeypatch.setattr(ollama_client, "llm_pool", BackendPool(["http://127.0.0.1:9"]))
+    monkeypatch.setattr(ollama_client, "llm_breaker", CircuitBreaker(failure_threshold=1000))
+
+
+def use_cassette(monkeypatch, path, mode, latency_scale=0.0):
+    cassette = Cassette(str(path), mode, latency_scale)
+    monkeypatch.setattr(ollama_client, "llm_cassette", cassette)
+    return cassette
+
+
+class TestCassette:
+    """Test recording and replaying single calls."""
+
+    @pytest.mark.parametrize("name", ["calls.jsonl", "calls.jsonl.gz"])
+    def test_record_then_replay_offline(self, stub, monkeypatch, tmp_path, name):
+        use_cassette(monkeypatch, tmp_path / name, RECORD)
+        recorded = [call_ollama(f"prompt {i}", profile="scammer_turn") for i in range(3)]
+        stub.stop()
+
+        monkeypatch.setattr(ollama_client, "llm_pool", BackendPool(["http://127.0.0.1:9"]))
+        cassette = use_cassette(monkeypatch, tmp_path / name, REPLAY)
+        assert [call_ollama(f"prompt {i}", profile="scammer_turn") for i in range(3)] == recorded
+        assert cassette.get_stats()["replayed"] == 3
+
+    def test_key_includes_profile(self, stub, monkeypatch, tmp_path):
+        use_cassette(monkeypatch, tmp_path / "calls.jsonl", RECORD)
+        call_ollama("hello", profile="scammer_turn")
+        use_cassette(monkeypatch, tmp_path / "calls.jsonl", REPLAY)
+        with pytest.raises(CassetteMiss):
+            call_ollama("hello", profile="mentor")
+
+    def test_repeated_prompt_replays_in_order(self, monkeypatch, offline, tmp_path):
+        cassette = use_cassette(monkeypatch, tmp_path / "calls.jsonl", REPLAY)
+        for reply in ("first", "second"):
+            cassette.record("k", "opening", reply, 1.0)
+        assert [cassette.replay("k") for _ in range(3)] == ["first", "second", "first"]
+
+    def test_unavailable_is_replayed(self, stub, monkeypatch, tmp_path):
+        monkeypatch.setattr(ollama_client, "llm_breaker", CircuitBreaker(failure_threshold=1000))
+        use_cassette(monkeypatch, tmp_path / "calls.jsonl", RECORD)
+        stub.config.available = False
+        with pytest.raises(LLMUnavailable):
+            call_ollama("hello", profile="scammer_turn")
+
+        use_cassette(monkeypatch, tmp_path / "calls.jsonl", REPLAY)
+        with pytest.raises(LLMUnavailable):
+            call_ollama("hello", profile="scammer_turn")
+
+    def test_latency_scale(self, monkeypatch, offline, tmp_path):
+        cassette = use_cassette(monkeypatch, tmp_path / "calls.jsonl", REPLAY, latency_scale=0.5)
+        cassette.record("k", None, "reply", 200.0)
+        started = time.perf_counter()
+        cassette.replay("k")
+        assert 0.09 <= time.perf_counter() - started < 0.2
+
+    def test_cancel_interrupts_replay(self, stub, monkeypatch, tmp_path):
+        use_cassette(monkeypatch, tmp_path / "calls.jsonl", RECORD)
+        call_ollama("hello", profile="scammer_turn")
+        cassette = use_cassette(monkeypatch, tmp_path / "calls.jsonl", REPLAY, latency_scale=100)
+        cancel = threading.Event()
+        threading.Timer(0.05, cancel.set).start()
+        with pytest.raises(GenerationCancelled):
+            call_ollama("hello", cancel, profile="scammer_turn")
+        assert cassette.get_stats()["replayed"] == 0
+
+
+class TestConversationFlows:
+    """Test full controller flows replaying offline."""
+
+    def test_flows_replay_identically(self, stub, monkeypatch, tmp_path):
+        path = tmp_path / "flows.jsonl.gz"
+        use_cassette(monkeypatch, path, RECORD)
+        recorded = run_conversation_flows(sessions=4)
+        requests_recorded = stub.stats["requests"]
+        stub.stop()
+
+        monkeypatch.setattr(ollama_client, "llm_pool", BackendPool(["http://127.0.0.1:9"]))
+        cassette = use_cassette(monkeypatch, path, REPLAY)
+        replayed = run_conversation_flows(sessions=4)
+        assert replayed["digest"] == recorded["digest"]
+        assert cassette.get_stats()["misses"] == 0
+        assert requests_recorded > 0
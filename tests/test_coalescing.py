@@ -0,0 +1,113 @@
+"""
+Tests for in-flight coalescing of identical LLM requests.
+Run with: python -m pytest tests/test_coalescing.py -v
+"""
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from ai.llm import ollama_client
+from ai.llm.coalescing import Coalescer
+from ai.llm.ollama_client import call_ollama
+from ai.llm.stub_ollama import StubOllamaConfig
+from ai.prompts.prompt_builder import build_initial_message_prompt
+
+
+@pytest.fixture
+def stub_config():
+    return StubOllamaConfig(latency_ms=300, tokens_per_sec=1000)
+
+
+@pytest.fixture(autouse=True)
+def coalescer(monkeypatch):
+    coalescer = Coalescer()
+    monkeypatch.setattr(ollama_client, "llm_coalescer", coalescer)
+    return coalescer
+
+
+def run_concurrently(count, fn):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(i):
+        barrier.wait()
+        results[i] = fn()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestCoalescer:
+    """Test the singleflight primitive."""
+
+    def test_concurrent_calls_share_one_run(self):
+        coalescer = Coalescer()
+        runs = []
+
+        def slow():
+            runs.append(1)
+            time.sleep(0.2)
+            return "reply"
+
+        assert run_concurrently(10, lambda: coalescer.do("key", slow)) == ["reply"] * 10
+        assert len(runs) == 1
+        stats = coalescer.get_stats()
+        assert stats["coalesced"] == 9
+        assert stats["dedup_ratio"] == 0.9
+        assert stats["in_flight"] == 0
+
+    def test_errors_reach_every_waiter(self):
+        coalescer = Coalescer()
+
+        def broken():
+            time.sleep(0.1)
+            raise RuntimeError("backend down")
+
+        def call():
+            try:
+                coalescer.do("key", broken)
+            except RuntimeError as e:
+                return str(e)
+
+        assert run_concurrently(5, call) == ["backend down"] * 5
+
+    def test_finished_results_are_not_cached(self):
+        coalescer = Coalescer()
+        coalescer.do("key", lambda: "first")
+        assert coalescer.do("key", lambda: "second") == "second"
+
+
+class TestOllamaClient:
+    """Test coalescing per generation profile."""
+
+    def test_classroom_start_fires_one_generation(self, stub):
+        prompt = build_initial_message_prompt("student", 20, "bank")
+        replies = run_concurrently(40, lambda: call_ollama(prompt, profile="opening"))
+
+        assert len(set(replies)) == 1
+        assert stub.stats["requests"] == 1
+        assert ollama_client.llm_coalescer.get_stats()["dedup_ratio"] == pytest.approx(39 / 40)
+
+    def test_scammer_turns_are_not_coalesced(self, stub):
+        run_concurrently(5, lambda: call_ollama("same prompt", profile="scammer_turn"))
+        assert stub.stats["requests"] == 5
+
+    def test_different_prompts_are_not_coalesced(self, stub):
+        run_concurrently(2, lambda: call_ollama(f"prompt {threading.get_ident()}", profile="opening"))
+        assert stub.stats["requests"] == 2
+
+    def test_can_be_disabled(self, stub, monkeypatch):
+        monkeypatch.setattr(ollama_client, "LLM_COALESCING", False)
+        run_concurrently(5, lambda: call_ollama("same prompt", profile="opening"))
+        assert stub.stats["requests"] == 5
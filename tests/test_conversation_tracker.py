@@ -0,0 +1,137 @@
+"""
+Tests for conversation-aware incremental risk tracking.
+Run with: python -m pytest tests/test_conversation_tracker.py -v
+"""
+import os
+import sys
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from ai.controller import simulation_controller
+from ai.controller.simulation_controller import SimulationController
+from ai.risk_detection.conversation_tracker import ConversationRiskTracker, classify_ask
+from ai.risk_detection.risk_detection import detect_risk
+
+
+def fake_ollama(prompt, *args, **kwargs):
+    return "Sir, please share the OTP"
+
+
+def reply(tracker, message):
+    return tracker.observe_user(message, detect_risk(message))
+
+
+class TestClassifyAsk:
+    """Test recognition of what the scammer asked for."""
+
+    def test_asks(self):
+        assert classify_ask("Please share the OTP sent to your phone") == "otp"
+        assert classify_ask("What is the CVV on the back?") == "cvv"
+        assert classify_ask("Tell me your 16 digit card number") == "card"
+        assert classify_ask("Pay Rs 499 fee to release the parcel") == "payment"
+
+    def test_most_specific_ask_wins(self):
+        assert classify_ask("Your card is blocked. Share the OTP to unblock it") == "otp"
+        assert classify_ask("Share your bank account details so we can deposit your winnings") == "account"
+        assert classify_ask("Send the OTP and pay the fee") == "otp"
+
+    def test_no_ask(self):
+        assert classify_ask("Hello, I am calling from your bank") is None
+
+
+class TestAnsweredAsk:
+    """Test numbers judged against the scammer's last ask."""
+
+    def test_number_after_otp_ask(self):
+        tracker = ConversationRiskTracker()
+        assert reply(tracker, "it's 4821 i think") == "LOW"
+        tracker.observe_scammer("Please share the OTP now")
+        assert reply(tracker, "it's 4821 i think") == "HIGH"
+        assert tracker.last_reason == "answered_otp"
+
+    def test_three_digits_after_cvv_ask(self):
+        tracker = ConversationRiskTracker()
+        tracker.observe_scammer("What is the CVV?")
+        assert reply(tracker, "its 123") == "HIGH"
+
+    def test_wrong_shape_not_escalated(self):
+        tracker = ConversationRiskTracker()
+        tracker.observe_scammer("Please share the OTP now")
+        assert reply(tracker, "give me 10 minutes") == "LOW"
+
+    def test_payment_needs_an_amount(self):
+        tracker = ConversationRiskTracker()
+        tracker.observe_scammer("Pay the verification fee now")
+        assert reply(tracker, "i was born in 1985") == "LOW"
+        for message in ["ok sent ₹2,000", "500 rupees", "done, 1500 paid"]:
+            tracker.observe_scammer("Pay the verification fee now")
+            assert tracker.observe_user(message, "LOW") == "HIGH"
+            assert tracker.last_reason == "answered_payment"
+
+    def test_never_lowers_risk(self):
+        tracker = ConversationRiskTracker()
+        assert tracker.observe_user("whatever", "HIGH") == "HIGH"
+        assert tracker.observe_user("is this safe?", "MEDIUM") == "MEDIUM"
+
+
+class TestSplitLeaks:
+    """Test numbers typed across several replies."""
+
+    def test_card_across_two_replies(self):
+        tracker = ConversationRiskTracker()
+        tracker.observe_scammer("Read me the numbers on your card")
+        assert reply(tracker, "4539 1488") == "LOW"
+        assert reply(tracker, "0343 6467") == "HIGH"
+        assert tracker.last_reason == "split_card"
+
+    def test_otp_digit_by_digit(self):
+        tracker = ConversationRiskTracker()
+        tracker.observe_scammer("Tell me the code")
+        assert reply(tracker, "48") == "LOW"
+        assert reply(tracker, "21") == "HIGH"
+        assert tracker.last_reason == "split_otp"
+
+    def test_text_reply_breaks_the_buffer(self):
+        tracker = ConversationRiskTracker()
+        tracker.observe_scammer("Read me the numbers on your card")
+        reply(tracker, "4539 1488")
+        reply(tracker, "wait, why do you need this")
+        assert reply(tracker, "0343 6467") == "LOW"
+
+    def test_years_in_chat_not_buffered(self):
+        tracker = ConversationRiskTracker()
+        tracker.observe_scammer("How are you today?")
+        for message in ["i was born in 1985", "my son in 2010", "we moved in 2019"]:
+            assert reply(tracker, message) == "LOW"
+        assert tracker.snapshot()["buffered_digits"] == 0
+
+    def test_buffer_is_bounded(self):
+        tracker = ConversationRiskTracker()
+        tracker.observe_scammer("Read me the numbers on your card")
+        for _ in range(50):
+            reply(tracker, "12")
+        assert tracker.snapshot()["buffered_digits"] <= 19
+
+
+class TestControllerIntegration:
+    """Test the tracker wired into SimulationController."""
+
+    def test_escalates_to_mentor(self, monkeypatch):
+        monkeypatch.setattr(simulation_controller, "call_ollama", fake_ollama)
+        monkeypatch.setattr(simulation_controller, "run_mentor", lambda **kwargs: "mentor")
+        controller = SimulationController("student", 20, "bank")
+        controller.start_simulation()
+
+        result = controller.user_message("it's 4821 i think")
+        assert result["mode"] == "MENTOR"
+        assert result["risk"] == "HIGH"
+        assert controller.get_session_info()["risk_context"]["last_reason"] == "answered_otp"
+
+    def test_retry_resets_state(self, monkeypatch):
+        monkeypatch.setattr(simulation_controller, "call_ollama", fake_ollama)
+        controller = SimulationController("student", 20, "bank")
+        controller.start_simulation()
+        controller.retry_simulation()
+        assert controller.risk_tracker.last_ask is None
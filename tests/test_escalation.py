@@ -0,0 +1,155 @@
+"""
+Tests for the escalation stage tracker and stage-sliced simulator prompts.
+Run with: python -m pytest tests/test_escalation.py -v
+"""
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from ai.controller import simulation_controller
+from ai.controller.simulation_controller import SimulationController
+from ai.llm.tokens import count_tokens
+from ai.prompts.personas import PERSONAS
+from ai.prompts.prompt_builder import build_simulator_prompt, build_stage_prompt, measure_stage_prompts
+from ai.prompts.scenarios import SCENARIOS
+from ai.risk_detection import risk_detection
+from ai.session.escalation import EscalationTracker
+
+
+class FakeOllama:
+    def __init__(self):
+        self.prompts = []
+
+    def __call__(self, prompt, cancel_event=None, profile=None, user=None):
+        self.prompts.append(prompt)
+        return "Sir, please confirm your account details now"
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    fake = FakeOllama()
+    monkeypatch.setattr(simulation_controller, "call_ollama", fake)
+    monkeypatch.setattr(simulation_controller, "run_mentor", lambda **kwargs: "mentor")
+    monkeypatch.setattr(simulation_controller, "stage_prompt_stats", {})
+    return fake
+
+
+class TestEscalationTracker:
+    """Test stage transitions."""
+
+    def test_turns_advance_and_last_stage_holds(self):
+        tracker = EscalationTracker(3, stage_turns=2)
+        for expected in (0, 1, 1, 2, 2, 2):
+            tracker.observe_scammer()
+            assert tracker.stage == expected
+        assert tracker.last_reason == "turns"
+
+    def test_compliance_advances_at_once(self):
+        tracker = EscalationTracker(5, stage_turns=2)
+        tracker.observe_user("HIGH")
+        assert tracker.stage == 1
+        assert tracker.last_reason == "complied"
+
+    def test_hesitation_holds_one_turn(self):
+        tracker = EscalationTracker(5, stage_turns=1)
+        tracker.observe_user("MEDIUM")
+        tracker.observe_scammer()
+        assert tracker.stage == 0
+        tracker.observe_user("LOW")
+        tracker.observe_scammer()
+        assert tracker.stage == 1
+
+    def test_reset(self):
+        tracker = EscalationTracker(5)
+        tracker.observe_user("HIGH")
+        tracker.reset()
+        assert tracker.snapshot()["stage"] == 0
+
+
+class TestStagePrompt:
+    """Test rendering only the current step of the scenario."""
+
+    def test_only_current_and_next_step(self):
+        steps = [step.split(". ", 1)[1] for step in SCENARIOS["bank"]["escalation_pattern"]]
+        prompt = build_stage_prompt("student", 20, "bank", 1)
+        assert f"CURRENT STEP (2 of 5): {steps[1]}" in prompt
+        assert steps[2] in prompt
+        assert steps[0] not in prompt and steps[3] not in prompt
+        assert "ESCALATION RULES" not in prompt
+
+    def test_data_targets_wait_for_later_stages(self):
+        assert "Do NOT ask for sensitive data yet." in build_stage_prompt("student", 20, "bank", 0)
+        assert "DATA YOU SHOULD TRY TO EXTRACT NOW: Full account number, OTP" in build_stage_prompt("student", 20, "bank", 3)
+        assert "This is the final step." in build_stage_prompt("student", 20, "bank", 9)
+
+    def test_smaller_than_full_prompt(self):
+        for persona in PERSONAS:
+            for scenario in SCENARIOS:
+                full = count_tokens(build_simulator_prompt(persona, 30, scenario))
+                for stage in range(len(SCENARIOS[scenario]["escalation_pattern"])):
+                    assert count_tokens(build_stage_prompt(persona, 30, scenario, stage)) < full
+
+    def test_measure(self):
+        rows = measure_stage_prompts()
+        assert [row["stage"] for row in rows] == [1, 2, 3, 4, 5]
+        assert all(row["saved_pct"] > 0 for row in rows)
+
+
+class TestControllerStages:
+    """Test the controller prompting per stage."""
+
+    def test_turns_move_through_stages(self, fake):
+        controller = SimulationController("student", 20, "bank")
+        controller.start_simulation()
+        controller.user_message("who is this?")
+        assert "CURRENT STEP (1 of 5)" in fake.prompts[-1]
+        controller.user_message("which branch?")
+        assert "CURRENT STEP (2 of 5)" in fake.prompts[-1]
+        assert controller.get_session_info()["escalation"]["stage"] == 1
+        assert set(simulation_controller.stage_prompt_stats) == {1, 2}
+
+    def test_hesitation_holds_and_compliance_advances(self, fake):
+        controller = SimulationController("student", 20, "bank")
+        controller.start_simulation()
+        controller.user_message("is this safe?")
+        controller.user_message("not sure about this")
+        assert "CURRENT STEP (1 of 5)" in fake.prompts[-1]
+
+        assert controller.user_message("my otp is 482913")["mode"] == "MENTOR"
+        controller.continue_simulation()
+        controller.user_message("ok which branch?")
+        assert "CURRENT STEP (2 of 5)" in fake.prompts[-1]
+
+    def test_secondary_hesitation_applies_from_next_turn(self, fake, monkeypatch):
+        monkeypatch.setattr(simulation_controller, "SPECULATIVE_GENERATION", True)
+        monkeypatch.setattr(
+            risk_detection, "secondary_detectors", [lambda text, risk: "MEDIUM" if "who" in text else risk]
+        )
+        controller = SimulationController("student", 20, "bank")
+        controller.start_simulation()
+        assert controller.user_message("who is this?")["risk"] == "MEDIUM"
+        assert "CURRENT STEP (1 of 5)" in fake.prompts[-1]
+        assert controller.escalation.stage == 0
+
+        controller.user_message("which branch?")
+        assert "CURRENT STEP (1 of 5)" in fake.prompts[-1]  # Held, as for a fast-pass MEDIUM
+        assert set(simulation_controller.stage_prompt_stats) == {1}
+
+    def test_retry_resets_stage(self, fake):
+        controller = SimulationController("student", 20, "bank")
+        controller.start_simulation()
+        controller.user_message("who is this?")
+        controller.retry_simulation()
+        assert controller.escalation.stage == 0
+
+    def test_full_prompt_when_disabled(self, fake, monkeypatch):
+        monkeypatch.setattr(simulation_controller, "STAGED_SIMULATOR_PROMPTS", False)
+        controller = SimulationController("student", 20, "bank")
+        controller.start_simulation()
+        controller.user_message("who is this?")
+        assert "ESCALATION STRATEGY:" in fake.prompts[-1]
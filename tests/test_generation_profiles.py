@@ -0,0 +1,65 @@
+"""
+Tests for per-call-type Ollama generation profiles.
+Run with: python -m pytest tests/test_generation_profiles.py -v
+"""
+import os
+import sys
+import threading
+
+import pytest
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from ai.llm import ollama_client
+from ai.llm.generation_profiles import GENERATION_PROFILES, build_generation_options, get_generation_profile
+from ai.llm.stub_ollama import StubOllamaConfig, generate_reply
+
+
+@pytest.fixture
+def stub_config():
+    # Rambles on past the scammer's line, as an uncapped model does
+    return StubOllamaConfig(latency_ms=0, tokens_per_sec=10_000, default_tokens=300, continue_dialogue=True)
+
+
+class TestProfiles:
+    """Test profile lookup and the options sent to Ollama."""
+
+    def test_options(self):
+        options, keep_alive = build_generation_options("scammer_turn")
+        assert options["num_predict"] == GENERATION_PROFILES["scammer_turn"]["num_predict"]
+        assert "\nUser:" in options["stop"]
+        assert keep_alive
+
+    def test_profiles_share_context_size(self):
+        # A different num_ctx makes Ollama reload the model
+        sizes = {build_generation_options(name)[0]["num_ctx"] for name in GENERATION_PROFILES}
+        assert len(sizes) == 1
+
+    def test_unknown_profile_defaults_to_scammer_turn(self):
+        assert get_generation_profile("nope") is GENERATION_PROFILES["scammer_turn"]
+
+    def test_no_profile_sends_no_options(self):
+        assert "options" not in ollama_client._payload("hi", False, None)
+
+
+class TestAgainstStub:
+    """Test that profiles cap length and stop at the next speaker."""
+
+    def test_stub_cuts_at_stop_sequence(self):
+        reply = generate_reply("prompt", 200, continue_dialogue=True, stop=["\nUser:"])
+        assert "User:" not in reply
+        assert "User:" in generate_reply("prompt", 200, continue_dialogue=True)
+
+    def test_scammer_turn_is_capped_and_stops(self, stub):
+        unconstrained = ollama_client.call_ollama("prompt")
+        turn = ollama_client.call_ollama("prompt", profile="scammer_turn")
+        assert "User:" in unconstrained
+        assert "User:" not in turn
+        assert len(turn.split()) <= GENERATION_PROFILES["scammer_turn"]["num_predict"]
+
+    def test_streamed_call_uses_profile(self, stub):
+        turn = ollama_client.call_ollama("prompt", threading.Event(), "opening")
+        assert turn == ollama_client.call_ollama("prompt", profile="opening")
+        assert "User:" not in turn
@@ -0,0 +1,125 @@
+"""
+Tests for the rolling summary of turns older than the history window.
+Run with: python -m pytest tests/test_history_summary.py -v
+"""
+import os
+import sys
+import threading
+
+import pytest
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from ai.controller import simulation_controller
+from ai.controller.simulation_controller import SUMMARY_MAX_TOKENS, SimulationController
+from ai.llm.generation_profiles import GENERATION_PROFILES
+from ai.llm.ollama_client import LLMUnavailable
+from ai.llm.scheduler import PRIORITY_CLASSES
+
+QUESTIONS = ["who is this?", "which branch are you calling from?", "why now?", "what is your name?"]
+
+
+class FakeOllama:
+    """Scammer turns get a fixed line; summaries are numbered so updates can be told apart."""
+
+    def __init__(self):
+        self.summary_calls = []
+        self.release = threading.Event()
+        self.release.set()
+        self.fail = False
+        self.started = threading.Event()
+
+    def __call__(self, prompt, cancel_event=None, profile=None, user=None):
+        if profile != "summary":
+            return "Sir, please confirm your account details now"
+        self.summary_calls.append(prompt)
+        self.started.set()
+        self.release.wait(5)
+        if self.fail:
+            raise LLMUnavailable("down")
+        return f"Summary {len(self.summary_calls)}: the caller claimed to be from the bank."
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    fake = FakeOllama()
+    monkeypatch.setattr(simulation_controller, "call_ollama", fake)
+    monkeypatch.setitem(GENERATION_PROFILES["scammer_turn"], "history_tokens", 40)
+    monkeypatch.setattr(simulation_controller, "summary_stats", {"updates": 0, "lines_folded": 0, "failures": 0, "stale": 0})
+    return fake
+
+
+def chat(controller, turns):
+    for i in range(turns):
+        assert controller.user_message(QUESTIONS[i % len(QUESTIONS)])["mode"] == "SIMULATOR"
+        controller.wait_for_summary(5)
+
+
+class TestRollingSummary:
+    """Test folding evicted turns into the session summary."""
+
+    def test_summary_profile_is_background(self):
+        assert GENERATION_PROFILES["summary"]["priority"] == PRIORITY_CLASSES[-1]
+
+    def test_evicted_turns_are_summarized(self, fake):
+        controller = SimulationController("student", 20, "bank")
+        controller.start_simulation()
+        chat(controller, 6)
+
+        assert controller.session.summary.startswith("Summary")
+        assert controller.session.summarized_lines >= simulation_controller.SUMMARY_BATCH_LINES
+        assert "User: who is this?" in fake.summary_calls[0]
+
+        prompt, _ = controller._build_turn_prompt()
+        assert "Story so far (earlier messages):\n" + controller.session.summary in prompt
+        # Summarized lines are not repeated verbatim
+        history = prompt.split("Conversation so far:")[1]
+        assert history.count("\n") - 2 <= len(controller._history_lines()) - controller.session.summarized_lines
+
+    def test_prompt_size_stays_bounded(self, fake):
+        controller = SimulationController("student", 20, "bank")
+        controller.start_simulation()
+        chat(controller, 20)
+        bound = controller.frame_tokens + 40 + SUMMARY_MAX_TOKENS + 10
+        assert controller.last_prompt_tokens <= bound
+        assert simulation_controller.summary_stats["updates"] >= 3
+
+    def test_summary_runs_after_the_response(self, fake):
+        fake.release.clear()
+        controller = SimulationController("student", 20, "bank")
+        controller.start_simulation()
+        for i in range(4):
+            result = controller.user_message(QUESTIONS[i])
+        assert result["mode"] == "SIMULATOR"
+        assert fake.started.wait(5)
+        assert len(fake.summary_calls) == 1
+        assert controller.session.summary == ""  # Still generating
+        fake.release.set()
+        controller.wait_for_summary(5)
+        assert controller.session.summary
+
+    def test_failure_keeps_old_summary_and_retries(self, fake):
+        fake.fail = True
+        controller = SimulationController("student", 20, "bank")
+        controller.start_simulation()
+        chat(controller, 4)
+        assert controller.session.summary == ""
+        assert simulation_controller.summary_stats["failures"] >= 1
+
+        fake.fail = False
+        chat(controller, 1)
+        assert controller.session.summary
+
+    def test_reset_discards_stale_summary(self, fake):
+        fake.release.clear()
+        controller = SimulationController("student", 20, "bank")
+        controller.start_simulation()
+        for i in range(4):
+            controller.user_message(QUESTIONS[i])
+        controller.retry_simulation()
+        fake.release.set()
+        controller.wait_for_summary(5)
+        assert controller.session.summary == ""
+        assert simulation_controller.summary_stats["stale"] == 1
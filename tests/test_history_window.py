@@ -0,0 +1,113 @@
+"""
+Tests for token counting and the token-budgeted history window.
+Run with: python -m pytest tests/test_history_window.py -v
+"""
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from ai.controller import simulation_controller
+from ai.controller.simulation_controller import SimulationController
+from ai.llm import tokens
+from ai.llm.generation_profiles import GENERATION_PROFILES
+from ai.llm.tokens import count_tokens, estimate_tokens, truncate_to_tokens
+
+
+@pytest.fixture
+def stats(monkeypatch):
+    fresh = {key: 0 for key in simulation_controller.prompt_token_stats}
+    monkeypatch.setattr(simulation_controller, "prompt_token_stats", fresh)
+    return fresh
+
+
+def controller_with(messages):
+    controller = SimulationController("student", 20, "bank")
+    for i, message in enumerate(messages):
+        controller.session.add_message("User" if i % 2 == 0 else "Scammer", message)
+    return controller
+
+
+class TestTokens:
+    """Test the estimator, the exact tokenizer path and truncation."""
+
+    def test_estimate(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("share the OTP now") == 4
+        assert estimate_tokens("OTP 482913") == 7  # Digits are single tokens
+        assert estimate_tokens("immediately!") == 3
+
+    def test_exact_tokenizer_is_used(self, monkeypatch):
+        class Encoding:
+            def __init__(self, text):
+                self.ids = list(text)
+
+        class CharTokenizer:
+            def encode(self, text, add_special_tokens=True):
+                return Encoding(text)
+
+        monkeypatch.setattr(tokens, "_tokenizer", CharTokenizer())
+        assert count_tokens("hello world") == 11
+
+    def test_truncate_fits_budget(self):
+        text = " ".join(["please"] * 100)
+        truncated = truncate_to_tokens(text, 10)
+        assert count_tokens(truncated) <= 10
+        assert text.startswith(truncated) and not truncated.endswith(" ")
+        assert truncate_to_tokens("short", 10) == "short"
+
+
+class TestHistoryWindow:
+    """Test packing recent turns into the token budget."""
+
+    def test_short_chat_keeps_more_than_five_exchanges(self, stats):
+        controller = controller_with(["ok"] * 30)
+        history, used = controller._get_limited_history(1024)
+        assert history.count("\n") + 1 == 30
+        assert used == sum(count_tokens(line) + 1 for line in history.split("\n"))
+        assert controller._window_start == 0
+
+    def test_long_message_pushes_out_older_turns(self, stats):
+        long_message = " ".join(["blah"] * 300)
+        controller = controller_with(["first", "hello", long_message, "why?", "ok"])
+        history, used = controller._get_limited_history(315)
+        assert used <= 315
+        assert "first" not in history
+        assert history.endswith("User: ok")
+        assert long_message in history
+        assert controller._window_start == 2
+
+    def test_oversized_latest_message_is_truncated(self, stats):
+        controller = controller_with(["hello", "hi", " ".join(["blah"] * 2000)])
+        history, used = controller._get_limited_history(100)
+        assert used <= 100
+        assert history.startswith("User: blah") and history.endswith(" ...")
+        assert controller._window_truncated
+
+    def test_prompt_tokens_reported(self, stats, monkeypatch):
+        monkeypatch.setitem(GENERATION_PROFILES["scammer_turn"], "history_tokens", 50)
+        controller = controller_with([" ".join(["blah"] * 40)] * 10)
+        prompt, usage = controller._build_turn_prompt()
+        assert stats["turns"] == 0  # Not sent yet
+        controller._record_prompt(usage)
+        assert controller.last_prompt_tokens <= controller.frame_tokens + 50
+        assert abs(controller.last_prompt_tokens - count_tokens(prompt)) <= 2
+        assert stats["turns"] == 1
+        assert stats["max_prompt_tokens"] == controller.last_prompt_tokens
+        assert controller.get_session_info()["prompt_tokens"] == controller.last_prompt_tokens
+
+    def test_dropped_lines_counted_once(self, stats, monkeypatch):
+        monkeypatch.setitem(GENERATION_PROFILES["scammer_turn"], "history_tokens", 50)
+        controller = controller_with([" ".join(["blah"] * 20)] * 6)
+        for _ in range(3):
+            controller._record_prompt(controller._build_turn_prompt()[1])
+        assert stats["dropped_messages"] == controller._window_start == 4
+
+        controller.session.add_message("User", " ".join(["blah"] * 20))
+        controller._record_prompt(controller._build_turn_prompt()[1])
+        assert stats["dropped_messages"] == controller._window_start == 5
+        assert stats["turns"] == 4
@@ -0,0 +1,80 @@
+"""
+Tests for the Aho-Corasick keyword prefilter in front of the risk regexes.
+Run with: python -m pytest tests/test_keyword_prefilter.py -v
+"""
+import sys
+import os
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from ai.risk_detection import risk_detection
+from ai.risk_detection.risk_detection import detect_risk
+from ai.risk_detection.corpus import generate_corpus, LABELED_CORPUS
+from ai.risk_detection.keyword_prefilter import AhoCorasick, KeywordPrefilter, required_keywords, fold, DIGIT
+
+UNICODE_CASES = ["İ WILL SEND", "OTP ١٢٣٤٥٦", "ſent the code", "OK", "₹ 500 bhej diya", "a/c no do"]
+
+
+class TestAhoCorasick:
+    """Test the multi-keyword matcher."""
+
+    def test_finds_overlapping_keywords(self):
+        automaton = AhoCorasick(["he", "she", "hers", "his", "abc", "bc", "c"])
+        assert automaton.find_all("ushers abcx") == {"he", "she", "hers", "abc", "bc", "c"}
+
+    def test_no_keywords(self):
+        assert AhoCorasick(["otp", "pin"]).find_all("hello there") == set()
+
+
+class TestRequiredKeywords:
+    """Test keyword derivation from regex syntax trees."""
+
+    def test_literal_and_alternation(self):
+        clauses = required_keywords(r'\b(send|share)\s+(the\s+)?otp\b')
+        assert frozenset(["otp"]) in clauses
+        for text in ["send the otp", "share otp"]:
+            assert all(any(keyword in text for keyword in clause) for clause in clauses)
+        assert not all(any(keyword in "give otp" for keyword in clause) for clause in clauses)
+
+    def test_digits_and_optional_parts(self):
+        assert required_keywords(r'\b\d{6,}\b') == [frozenset([DIGIT])]
+        assert required_keywords(r'(yes)?') == []
+
+    def test_fold(self):
+        assert fold("OTP ١٢٣") == "otp 000"
+        assert fold("İ") == "i"
+
+
+class TestPrefilterEquivalence:
+    """The prefilter must never change a detection result."""
+
+    def test_same_results_on_and_off(self):
+        messages = [m for m, _ in generate_corpus(3000, seed=11)]
+        messages += [m for m, _ in LABELED_CORPUS] + UNICODE_CASES
+
+        prefilter = risk_detection.rule_packs.active.prefilter
+        try:
+            on = [detect_risk(m) for m in messages]
+            prefilter.enabled = False
+            off = [detect_risk(m) for m in messages]
+        finally:
+            prefilter.enabled = True
+        assert on == off
+
+    def test_literals_with_digits(self):
+        assert required_keywords(r'\bm2m\b') == [frozenset([fold("m2m")])]
+        prefilter = KeywordPrefilter({"x": [r'\b24/7\b', r'\bM2M\b']})
+        for text in ["open 24/7", "an m2m transfer"]:
+            live = prefilter.scan(text)
+            assert prefilter.search("x", text, live) is not None
+        assert prefilter.nothing_can_match(prefilter.scan("hello"))
+
+    def test_plain_chat_skips_regexes(self):
+        prefilter = risk_detection.rule_packs.active.prefilter
+        prefilter.reset_stats()
+        for message in ["who are you?", "what is this about", "hello, good morning"]:
+            assert detect_risk(message) == "LOW"
+        assert prefilter.stats["short_circuited"] == 3
+        assert prefilter.stats["patterns_run"] == 0
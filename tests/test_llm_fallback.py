@@ -0,0 +1,152 @@
+"""
+Tests for the LLM circuit breaker, latency budgets and templated fallbacks.
+Run with: python -m pytest tests/test_llm_fallback.py -v
+"""
+import os
+import sys
+import time
+
+import pytest
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from ai.controller import simulation_controller
+from ai.controller.simulation_controller import SimulationController
+from ai.llm import ollama_client
+from ai.llm.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from ai.llm.generation_profiles import GENERATION_PROFILES
+from ai.llm.ollama_client import LLMUnavailable, call_ollama
+from ai.mentor_engine.mentor_engine import build_fallback_mentor_text
+from ai.prompts.scenarios import SCENARIOS, get_fallback_message
+
+
+@pytest.fixture
+def fast_breaker(monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.1)
+    monkeypatch.setattr(ollama_client, "llm_breaker", breaker)
+    return breaker
+
+
+@pytest.fixture
+def llm_down(monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    monkeypatch.setattr(ollama_client, "llm_breaker", breaker)
+    monkeypatch.setattr(simulation_controller, "fallback_stats", {"scammer": 0, "mentor": 0})
+    return breaker
+
+
+class TestCircuitBreaker:
+    """Test breaker state transitions."""
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+        for _ in range(2):
+            assert breaker.allow()
+            breaker.record_failure()
+        breaker.record_success()
+        for _ in range(3):
+            breaker.record_failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+        assert breaker.get_stats()["rejected"] == 1
+
+    def test_half_open_lets_one_trial_through(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        assert breaker.allow()
+        assert breaker.state == HALF_OPEN
+        assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+
+    def test_failed_trial_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+
+
+class TestOllamaClient:
+    """Test budgets and the breaker around call_ollama."""
+
+    def test_over_budget_raises(self, stub, fast_breaker, monkeypatch):
+        stub.config.latency_ms = 1000
+        monkeypatch.setitem(GENERATION_PROFILES["scammer_turn"], "timeout_seconds", 0.2)
+        started = time.perf_counter()
+        with pytest.raises(LLMUnavailable):
+            call_ollama("hello", profile="scammer_turn")
+        assert time.perf_counter() - started < 0.5
+
+    def test_open_circuit_fails_fast_and_recovers(self, stub, fast_breaker):
+        stub.config.available = False
+        for _ in range(2):
+            with pytest.raises(LLMUnavailable):
+                call_ollama("hello", profile="scammer_turn")
+        requests_before = stub.stats["requests"]
+
+        started = time.perf_counter()
+        with pytest.raises(LLMUnavailable):
+            call_ollama("hello", profile="scammer_turn")
+        assert time.perf_counter() - started < 0.01
+        assert stub.stats["requests"] == requests_before
+
+        stub.config.available = True
+        time.sleep(0.11)
+        assert call_ollama("hello", profile="scammer_turn")
+        assert ollama_client.llm_breaker.state == CLOSED
+
+
+class TestTemplates:
+    """Test the templated scammer and mentor text."""
+
+    def test_scammer_lines_walk_samples_then_press(self):
+        for key, scenario in SCENARIOS.items():
+            samples = scenario["sample_messages"]
+            assert get_fallback_message(key, 0) == samples[0]
+            later = get_fallback_message(key, len(samples))
+            assert later.endswith(samples[-1]) and later != samples[-1]
+            assert get_fallback_message(key, 7) == get_fallback_message(key, 7)
+
+    def test_mentor_text_uses_scenario(self):
+        text = build_fallback_mentor_text("my otp is 4821", "student", "bank")
+        assert "Bank Fraud" in text
+        assert "Asking for OTP which banks never request" in text
+        assert "Urgency: Must act within minutes" in text
+        assert '"my otp is 4821"' in text
+
+
+class TestControllerFallback:
+    """Test the training flow continuing while the LLM is down."""
+
+    def test_opening(self, llm_down):
+        controller = SimulationController("student", 20, "bank")
+        started = time.perf_counter()
+        result = controller.start_simulation()
+        assert time.perf_counter() - started < 0.05
+        assert result["fallback"] is True
+        assert result["message"] == SCENARIOS["bank"]["sample_messages"][0]
+
+    def test_scammer_turn_advances(self, llm_down):
+        controller = SimulationController("student", 20, "bank")
+        controller.start_simulation()
+        result = controller.user_message("who is this?")
+        assert result["mode"] == "SIMULATOR"
+        assert result["fallback"] is True
+        assert result["message"] == SCENARIOS["bank"]["sample_messages"][1]
+        assert simulation_controller.fallback_stats["scammer"] == 2
+
+    def test_mentor(self, llm_down):
+        controller = SimulationController("student", 20, "bank")
+        controller.start_simulation()
+        result = controller.user_message("my otp is 482913")
+        assert result["mode"] == "MENTOR"
+        assert result["fallback"] is True
+        assert "Bank Fraud" in result["message"]
+        assert simulation_controller.fallback_stats["mentor"] == 1
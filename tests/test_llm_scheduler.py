@@ -0,0 +1,178 @@
+"""
+Tests for the priority-aware LLM request scheduler.
+Run with: python -m pytest tests/test_llm_scheduler.py -v
+"""
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from ai.llm import ollama_client
+from ai.llm.ollama_client import GenerationCancelled, call_ollama
+from ai.llm.scheduler import LLMScheduler
+from ai.llm.stub_ollama import StubOllamaConfig
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline and not condition():
+        time.sleep(0.005)
+    return condition()
+
+
+def waiting(scheduler):
+    return sum(c["waiting"] for c in scheduler.get_stats()["classes"].values())
+
+
+def queue_in_order(scheduler, requests):
+    """
+    Queue (name, priority, user) requests one at a time behind a held slot,
+    then free it; returns the order in which they got a slot.
+    """
+    order = []
+    scheduler.acquire("interactive", "holder")
+
+    def worker(name, priority, user):
+        scheduler.acquire(priority, user)
+        order.append(name)
+        scheduler.release(priority)
+
+    threads = []
+    for i, request in enumerate(requests):
+        thread = threading.Thread(target=worker, args=request)
+        thread.start()
+        threads.append(thread)
+        assert wait_for(lambda: waiting(scheduler) == i + 1)
+
+    scheduler.release("interactive")
+    for thread in threads:
+        thread.join()
+    return order
+
+
+class TestScheduling:
+    """Test ordering, limits and fairness."""
+
+    def test_priority_order(self):
+        scheduler = LLMScheduler(max_concurrency=1)
+        order = queue_in_order(scheduler, [
+            ("summary", "background", "a"),
+            ("turn", "interactive", "b"),
+            ("mentor", "mentor", "c"),
+        ])
+        assert order == ["mentor", "turn", "summary"]
+
+    def test_round_robin_across_users(self):
+        scheduler = LLMScheduler(max_concurrency=1)
+        order = queue_in_order(scheduler, [
+            ("a1", "interactive", "a"),
+            ("a2", "interactive", "a"),
+            ("a3", "interactive", "a"),
+            ("b1", "interactive", "b"),
+            ("c1", "interactive", "c"),
+        ])
+        assert order == ["a1", "b1", "c1", "a2", "a3"]
+
+    def test_concurrency_limit(self):
+        scheduler = LLMScheduler(max_concurrency=3)
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def worker():
+            scheduler.acquire()
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.pop()
+            scheduler.release()
+
+        threads = [threading.Thread(target=worker) for _ in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert max(peak) == 3
+        assert scheduler.get_stats()["classes"]["interactive"]["requests"] == 12
+
+    def test_background_cannot_take_interactive_slots(self):
+        scheduler = LLMScheduler(max_concurrency=3, background_slots=1)
+        assert scheduler.acquire("background")
+        threading.Thread(target=scheduler.acquire, args=("background",), daemon=True).start()
+        assert wait_for(lambda: waiting(scheduler) == 1)
+
+        started = time.perf_counter()
+        assert scheduler.acquire("interactive", "a")
+        assert scheduler.acquire("mentor", "b")
+        assert time.perf_counter() - started < 0.05
+
+    def test_cancel_while_queued(self):
+        scheduler = LLMScheduler(max_concurrency=1)
+        scheduler.acquire()
+        cancel = threading.Event()
+        threading.Timer(0.05, cancel.set).start()
+
+        assert scheduler.acquire("interactive", "a", cancel) is False
+        stats = scheduler.get_stats()["classes"]["interactive"]
+        assert stats["cancelled"] == 1
+        assert stats["waiting"] == 0
+        scheduler.release()
+        assert scheduler.get_stats()["classes"]["interactive"]["running"] == 0
+
+    def test_wait_metrics(self):
+        scheduler = LLMScheduler(max_concurrency=1)
+        queue_in_order(scheduler, [("turn", "interactive", "a")])
+        stats = scheduler.get_stats()["classes"]["interactive"]
+        assert stats["queued"] == 1
+        assert stats["max_wait_ms"] > 0
+        assert stats["p95_wait_ms"] >= stats["p50_wait_ms"]
+
+
+class TestOllamaClient:
+    """Test call_ollama going through the scheduler."""
+
+    @pytest.fixture
+    def stub_config(self):
+        return StubOllamaConfig(latency_ms=50, tokens_per_sec=1000)
+
+    @pytest.fixture(autouse=True)
+    def scheduler(self, monkeypatch):
+        scheduler = LLMScheduler(max_concurrency=2)
+        monkeypatch.setattr(ollama_client, "llm_scheduler", scheduler)
+        return scheduler
+
+    def test_limit_reaches_the_backend(self, stub):
+        threads = [
+            threading.Thread(target=call_ollama, args=(f"prompt {i}",), kwargs={"profile": "scammer_turn"})
+            for i in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert stub.stats["requests"] == 8
+        assert stub.stats["max_in_flight"] == 2
+
+    def test_profile_sets_priority(self, stub):
+        call_ollama("mentor prompt", profile="mentor", user="session-1")
+        classes = ollama_client.llm_scheduler.get_stats()["classes"]
+        assert classes["mentor"]["requests"] == 1
+        assert classes["interactive"]["requests"] == 0
+
+    def test_cancelled_before_slot_never_reaches_backend(self, stub):
+        scheduler = ollama_client.llm_scheduler
+        scheduler.acquire()
+        scheduler.acquire()
+        cancel = threading.Event()
+        threading.Timer(0.05, cancel.set).start()
+        with pytest.raises(GenerationCancelled):
+            call_ollama("prompt", cancel, "scammer_turn")
+        assert stub.stats["requests"] == 0
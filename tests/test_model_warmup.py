@@ -0,0 +1,111 @@
+"""
+Tests for model warmup, adaptive keep-alive pings and readiness.
+Run with: python -m pytest tests/test_model_warmup.py -v
+"""
+import os
+import sys
+import time
+
+import pytest
+import requests
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from ai.llm import ollama_client
+from ai.llm.backend_pool import BackendPool
+from ai.llm.generation_profiles import build_generation_options
+from ai.llm.ollama_client import call_ollama
+from ai.llm.stub_ollama import StubOllamaConfig
+from ai.llm.warmup import ModelWarmer, run_warmup_benchmark
+
+LOAD_MS = 300
+
+
+@pytest.fixture
+def stub_config():
+    return StubOllamaConfig(latency_ms=10, tokens_per_sec=1000, load_ms=LOAD_MS)
+
+
+def timed_call():
+    started = time.perf_counter()
+    call_ollama("hello", profile="scammer_turn")
+    return time.perf_counter() - started
+
+
+def resident_models(server):
+    return requests.get(f"{server.url}/api/ps").json()["models"]
+
+
+class TestStubModelLoading:
+    """Test the stub's simulated model residency."""
+
+    def test_first_call_pays_load(self, stub):
+        assert resident_models(stub) == []
+        assert timed_call() >= LOAD_MS / 1000
+        assert timed_call() < LOAD_MS / 1000
+        assert stub.stats["loads"] == 1
+        assert len(resident_models(stub)) == 1
+
+    def test_model_unloads_after_keep_alive(self, stub):
+        warmer = ModelWarmer(ollama_client.llm_pool, ["mistral"], keep_alive="0.1s")
+        warmer.warm()
+        time.sleep(0.15)
+        assert resident_models(stub) == []
+
+
+class TestModelWarmer:
+    """Test warmup, keep-alive pings and readiness."""
+
+    def test_warm_makes_first_turn_fast(self, stub):
+        warmer = ModelWarmer(ollama_client.llm_pool, ["mistral"])
+        assert not warmer.is_ready()
+        assert warmer.warm()
+        assert timed_call() < LOAD_MS / 1000
+        assert stub.stats["loads"] == 1
+        assert stub.stats["requests"] == 1  # The preload generates nothing
+
+    def test_preload_uses_profile_context_size(self, stub):
+        warmer = ModelWarmer(ollama_client.llm_pool, ["mistral"])
+        _, body = warmer._request(ollama_client.llm_pool.backends[0], "mistral")
+        options, _ = build_generation_options("scammer_turn")
+        assert body["options"] == {"num_ctx": options["num_ctx"]}
+
+    def test_pings_only_when_idle(self, stub):
+        warmer = ModelWarmer(ollama_client.llm_pool, ["mistral"], keep_alive="1s")
+        warmer.warm()
+
+        call_ollama("hello", profile="scammer_turn")
+        assert warmer.ping_idle() == 0  # Traffic keeps the model alive
+        time.sleep(0.55)
+        assert warmer.ping_idle() == 1
+        assert warmer.get_stats()["pings"] == 1
+        assert stub.stats["loads"] == 1
+
+    def test_evicted_model_is_reloaded(self, stub):
+        warmer = ModelWarmer(ollama_client.llm_pool, ["mistral"], keep_alive="0.1s")
+        warmer.warm()
+        time.sleep(0.15)
+
+        warmer.check_resident()
+        assert not warmer.is_ready()
+        assert warmer.ping_idle() == 1
+        assert warmer.is_ready()
+        assert stub.stats["loads"] == 2
+
+    def test_unreachable_backend_is_not_ready(self, monkeypatch):
+        pool = BackendPool(["http://127.0.0.1:9"])
+        warmer = ModelWarmer(pool, ["mistral"], load_timeout=1)
+        assert warmer.warm() is False
+        assert warmer.get_stats()["failures"] == 1
+
+
+class TestBenchmark:
+    """Test the cold vs warm first-turn measurement."""
+
+    def test_warm_first_turn_skips_load(self):
+        report = run_warmup_benchmark(load_ms=LOAD_MS, latency_ms=10, tokens_per_sec=1000)
+        assert report["cold"]["first_turn_ms"] >= LOAD_MS
+        assert report["warm"]["first_turn_ms"] < LOAD_MS
+        assert report["warm"]["warmup_ms"] >= LOAD_MS
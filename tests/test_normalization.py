@@ -0,0 +1,71 @@
+"""
+Tests for the shared risk-detection normalization pass.
+Run with: python -m pytest tests/test_normalization.py -v
+"""
+import sys
+import os
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from ai.risk_detection.normalization import normalize
+from ai.risk_detection.risk_detection import detect_risk
+
+
+class TestNormalize:
+    """Test the normalized view shared by all rule categories."""
+
+    def test_unicode_and_digits(self):
+        assert normalize("ＯＴＰ １２３４５６") == "otp 123456"
+        assert normalize("OTP ४५६७८९") == "otp 456789"
+        assert normalize("  Hello There ") == "hello there"
+
+    def test_obfuscated_keywords(self):
+        assert normalize("my 0TP") == "my otp"
+        assert normalize("o.t.p") == "otp"
+        assert normalize("P1N") == "pin"
+        assert normalize("p@n card") == "pan card"
+        assert normalize("o t p") == "otp"
+        assert normalize("u. p. i") == "upi"
+
+    def test_words_containing_keywords_untouched(self):
+        for text in ["japan", "spin", "cupid", "top in the class"]:
+            assert normalize(text) == text
+
+    def test_separate_words_not_joined(self):
+        for text in ["what's up i dont get it", "sign me up i am not sure", "sto p in", "o.t p"]:
+            assert normalize(text) == text
+
+    def test_separated_digits_joined(self):
+        assert normalize("4 5 6 7") == "4567"
+        assert normalize("1234-5678-9012-3456") == "1234567890123456"
+
+    def test_phone_numbers_joined(self):
+        for text in ["98765 43210", "+91 98765 43210", "+9198765-43210", "0 98765 43210", "91 9876543210"]:
+            assert normalize(text) == "9876543210"
+        assert normalize("call me at 98765-43210") == "call me at 9876543210"
+
+    def test_dates_times_and_amounts_kept(self):
+        for text in ["12-05-1990", "call at 10 30", "45,000", "rs.1.5 lakh"]:
+            assert normalize(text) == text
+
+    def test_idempotent(self):
+        for text in ["my 0TP is 4 5 6 7", "ＯＴＰ １２３", "p1n 4-3-2-1"]:
+            assert normalize(normalize(text)) == normalize(text)
+
+
+class TestEvasionDetection:
+    """Test disguised sensitive data is caught."""
+
+    def test_disguised_otp(self):
+        assert detect_risk("my 0TP is 4 5 6 7 8 9") == "HIGH"
+        assert detect_risk("o.t.p 1 2 3 4 5 6") == "HIGH"
+
+    def test_words_around_keywords_not_flagged(self):
+        assert detect_risk("what's up i dont get it") == "LOW"
+        assert detect_risk("can you sign me up i am not interested") == "LOW"
+        assert detect_risk("sign me up i am not sure") == "MEDIUM"  # Hesitation, not a upi mention
+
+    def test_disguised_pin(self):
+        assert detect_risk("p1n is 4-3-2-1") == "HIGH"
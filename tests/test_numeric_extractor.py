@@ -0,0 +1,82 @@
+"""
+Tests for the checksum-validated numeric extractor.
+Run with: python -m pytest tests/test_numeric_extractor.py -v
+"""
+import sys
+import os
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from ai.risk_detection.numeric_extractor import extract_numbers, luhn_valid, verhoeff_valid
+from ai.risk_detection.risk_detection import detect_risk
+
+
+def kinds(text):
+    return [span.kind for span in extract_numbers(text)]
+
+
+class TestChecksums:
+    """Test Luhn and Verhoeff validation."""
+
+    def test_luhn(self):
+        assert luhn_valid("4539148803436467")
+        assert not luhn_valid("4539148803436468")
+
+    def test_verhoeff(self):
+        assert verhoeff_valid("2363")
+        assert verhoeff_valid("234567890124")
+        assert not verhoeff_valid("234567890125")
+
+
+class TestClassification:
+    """Test each digit run is classified from length, checksum and context."""
+
+    def test_card_aadhaar_account(self):
+        assert kinds("4539148803436467") == ["card"]
+        assert kinds("aadhaar 234567890124") == ["aadhaar"]
+        assert kinds("number is 30012345678") == ["account_number"]
+
+    def test_pan(self):
+        assert kinds("abcde1234f") == ["pan"]
+        assert kinds("xabcde1234f") == [None]
+
+    def test_money(self):
+        assert kinds("45,000") == ["money"]
+        assert kinds("rs.10000") == ["money"]
+        assert kinds("i only have 5k") == ["money"]
+        assert kinds("can i pay 500 dollars") == ["money"]
+
+    def test_otp_context_and_bare_numbers(self):
+        assert kinds("482913") == ["otp"]
+        assert kinds("the code is 4821") == ["otp"]
+        assert kinds("1234 is the pin") == ["otp"]
+        assert kinds("it is 482913") == ["otp"]
+        assert kinds("it's 482913") == ["otp"]
+
+    def test_phone(self):
+        assert kinds("call me at 9876543210") == ["phone"]
+
+    def test_years_and_times_are_harmless(self):
+        assert kinds("my exam is in 2024") == [None]
+        assert kinds("call me after 1430") == [None]
+        assert kinds("1000 people came") == [None]
+        assert kinds("the year is 1985") == [None]
+
+    def test_no_digits(self):
+        assert extract_numbers("hello there") == []
+
+
+class TestFalseTriggers:
+    """Numbers that used to trigger the mentor now stay LOW."""
+
+    def test_years_low(self):
+        assert detect_risk("my exam is in 2024") == "LOW"
+        assert detect_risk("I was born in 1985 so I am old") == "LOW"
+
+    def test_sensitive_numbers_still_high(self):
+        assert detect_risk("4539 1488 0343 6467") == "HIGH"
+        assert detect_risk("84567389290") == "HIGH"
+        assert detect_risk("482913") == "HIGH"
+        assert detect_risk("ABCDE1234F") == "HIGH"
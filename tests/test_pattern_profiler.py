@@ -0,0 +1,67 @@
+"""
+Tests for the sampling per-pattern cost profiler.
+Run with: python -m pytest tests/test_pattern_profiler.py -v
+"""
+import sys
+import os
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from ai.risk_detection.profiler import PatternProfiler, pattern_profiler
+from ai.risk_detection.risk_detection import detect_risk
+
+
+class TestPatternProfiler:
+    """Test sampling and aggregation."""
+
+    def test_disabled_records_nothing(self):
+        profiler = PatternProfiler(0.0)
+        assert not profiler.should_sample()
+        assert profiler.report()["sampled_messages"] == 0
+
+    def test_sample_rate_is_respected(self):
+        profiler = PatternProfiler(0.01)
+        sampled = sum(profiler.should_sample() for _ in range(100_000))
+        assert 500 < sampled < 1500
+
+    def test_report_aggregates_and_sorts(self):
+        profiler = PatternProfiler(1.0)
+        profiler.record("money", "cheap", 1_000, False, "a")
+        profiler.record("money", "slow", 50_000, True, "worst one")
+        profiler.record("money", "slow", 10_000, False, "b")
+
+        rows = profiler.report()["patterns"]
+        assert [row["pattern"] for row in rows] == ["slow", "cheap"]
+        assert rows[0]["evaluations"] == 2
+        assert rows[0]["hits"] == 1
+        assert rows[0]["worst_input"] == "worst one"
+        assert rows[0]["worst_us"] == 50.0
+
+    def test_worst_input_is_redacted(self):
+        profiler = PatternProfiler(1.0)
+        profiler.record("data_sharing", "otp", 5_000, True, "my otp is 482913, card 4111 1111")
+        row = profiler.report()["patterns"][0]
+        assert row["worst_input"] == "my otp is ######, card #### ####"
+        assert row["worst_input_chars"] == 32
+
+
+class TestDetectRiskProfiling:
+    """Test detect_risk feeds the global profiler when sampled."""
+
+    def test_patterns_recorded(self):
+        previous = pattern_profiler.sample_rate
+        pattern_profiler.reset()
+        pattern_profiler.sample_rate = 1.0
+        try:
+            assert detect_risk("my otp is 123456") == "HIGH"
+            report = pattern_profiler.report()
+        finally:
+            pattern_profiler.sample_rate = previous
+            pattern_profiler.reset()
+
+        names = {(row["category"], row["pattern"]) for row in report["patterns"]}
+        assert ("engine", "keyword_scan") in names
+        assert any(category == "data_sharing" for category, _ in names)
+        assert report["sampled_messages"] == 1
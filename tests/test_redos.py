@@ -0,0 +1,78 @@
+"""
+ReDoS checks for the risk rule packs (CI gate).
+Run with: python -m pytest tests/test_redos.py -v
+Full check: python -m ai.risk_detection.redos
+"""
+import os
+import sys
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from ai.risk_detection.redos import analyze_pattern, fuzz_pattern, check_categories, module_patterns
+from ai.risk_detection.rule_pack import DEFAULT_RULE_PACK, RULE_PACK_PATH, RuleMatcher, load_rule_pack
+from ai.risk_detection.risk_detection import rule_packs, validate_rule_matcher
+
+
+def severities(pattern):
+    return [finding.severity for finding in analyze_pattern(pattern)]
+
+
+class TestStaticAnalysis:
+    """Test syntax-tree checks."""
+
+    def test_nested_quantifiers(self):
+        assert "error" in severities(r'(\w+\s*)+$')
+        assert "error" in severities(r'(a+)+b')
+        assert severities(r'\d+(?:,\d+)*') == []
+
+    def test_overlapping_alternation_in_repeat(self):
+        assert "error" in severities(r'(\w|\d\d)+$')
+        assert "error" in severities(r'(\w|\w\w)*$')
+        assert severities(r'(x|xy)+z') == []
+
+    def test_polynomial_warnings(self):
+        assert severities(r'\s*.*\s*x') == ["warning"]
+        assert severities(r'\b\d{4,6}\b(?=.*\b(otp|code)\b)') == ["warning"]
+
+    def test_anchored_lookahead_allowed(self):
+        assert severities(r'(?m)^(?=(.*?\bok\b))\1.*\bpay') == []
+
+    def test_safe_patterns(self):
+        for pattern in [r'\b(otp|one\s*time\s*password)\b', r'\d{1,3}(?:,\d{2,3})+', r'^(ok|okay)\.?$']:
+            assert severities(pattern) == []
+
+
+class TestFuzzing:
+    """Test adversarial inputs expose slow patterns."""
+
+    def test_exponential_pattern_caught_quickly(self):
+        findings = fuzz_pattern(r'(a|aa)+$', budget_ms=5, time_limit_seconds=2)
+        assert findings and findings[0].severity == "error"
+
+    def test_linear_pattern_passes(self):
+        assert fuzz_pattern(r'\b(cvv|cvc|security\s*code)\b', time_limit_seconds=0.2) == []
+
+
+class TestRulePacks:
+    """The shipped and active rule packs must be clean."""
+
+    def test_default_pack_has_no_findings(self):
+        pack = load_rule_pack(DEFAULT_RULE_PACK)
+        findings = check_categories(pack["categories"], budget_ms=25, time_limit_seconds=0.3)
+        assert [str(f) for f in findings] == []
+
+    def test_engine_module_patterns_clean(self):
+        findings = check_categories(module_patterns(), budget_ms=25, time_limit_seconds=0.3)
+        assert [str(f) for f in findings] == []
+
+    def test_active_pack_statically_clean(self):
+        findings = check_categories(load_rule_pack(RULE_PACK_PATH)["categories"], fuzz=False)
+        assert [str(f) for f in findings if f.severity == "error"] == []
+
+    def test_reload_rejects_redos_prone_pack(self):
+        pack = load_rule_pack(DEFAULT_RULE_PACK)
+        pack["categories"]["financial"] = pack["categories"]["financial"] + [r'(\w+\s*)+bank$']
+        problems = validate_rule_matcher(RuleMatcher(pack), rule_packs.active)
+        assert any("nested unbounded" in problem for problem in problems)
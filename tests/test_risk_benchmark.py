@@ -0,0 +1,52 @@
+"""
+Latency and accuracy regression checks for risk detection.
+Run with: python -m pytest tests/test_risk_benchmark.py -v
+Full benchmark: python -m ai.risk_detection.benchmark --size 100000
+"""
+import sys
+import os
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from ai.risk_detection.corpus import generate_corpus, CATEGORIES
+from ai.risk_detection.benchmark import run_latency_benchmark, run_accuracy_check, find_regressions
+
+# Generous absolute budget so shared CI runners don't flake; the CLI's
+# --baseline mode is the tight regression gate.
+MAX_P99_US = 5000
+MIN_HIGH_PRECISION = 0.9
+MIN_RECALL = {"HIGH": 0.9, "MEDIUM": 0.9, "LOW": 0.75}
+
+
+class TestRiskLatency:
+    """Test detect_risk stays within its latency budget."""
+
+    def test_corpus_is_deterministic_and_covers_categories(self):
+        corpus = generate_corpus(700, seed=7)
+        assert corpus == generate_corpus(700, seed=7)
+        assert {category for _, category in corpus} == set(CATEGORIES)
+
+    def test_p99_within_budget(self):
+        latency = run_latency_benchmark(generate_corpus(5000), warmup=200)
+        assert find_regressions(latency, max_p99_us=MAX_P99_US) == []
+
+    def test_regression_against_baseline_is_reported(self):
+        latency = {"ALL": {"p99_us": 130.0}}
+        baseline = {"ALL": {"p99_us": 100.0}}
+        assert find_regressions(latency, baseline, tolerance=0.25)
+        assert not find_regressions(latency, baseline, tolerance=0.5)
+
+
+class TestRiskAccuracy:
+    """Test precision/recall per risk level on the labeled corpus."""
+
+    def test_high_precision(self):
+        report = run_accuracy_check()
+        assert report["HIGH"]["precision"] >= MIN_HIGH_PRECISION
+
+    def test_recall_per_level(self):
+        report = run_accuracy_check()
+        for level, minimum in MIN_RECALL.items():
+            assert report[level]["recall"] >= minimum, (level, report["misses"])
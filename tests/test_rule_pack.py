@@ -0,0 +1,101 @@
+"""
+Tests for hot-reloadable risk rule packs.
+Run with: python -m pytest tests/test_rule_pack.py -v
+"""
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from ai.risk_detection.rule_pack import (
+    DEFAULT_RULE_PACK, RuleMatcher, RulePackError, RulePackManager, load_rule_pack
+)
+from ai.risk_detection.risk_detection import _detect, validate_rule_matcher
+from ai.risk_detection.normalization import normalize
+
+
+def write_pack(path, version, **overrides):
+    pack = load_rule_pack(DEFAULT_RULE_PACK)
+    pack["version"] = version
+    pack["categories"].update(overrides)
+    path.write_text(json.dumps(pack), encoding="utf-8")
+    # Make sure the mtime moves even on coarse filesystem clocks
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 1))
+    return str(path)
+
+
+class TestLoading:
+    """Test rule pack parsing and compilation."""
+
+    def test_default_pack_passes_validation(self):
+        matcher = RuleMatcher(load_rule_pack(DEFAULT_RULE_PACK))
+        assert matcher.version == load_rule_pack(DEFAULT_RULE_PACK)["version"]
+        assert matcher.compile_ms > 0
+        assert validate_rule_matcher(matcher, matcher) == []
+
+    def test_missing_category_rejected(self, tmp_path):
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps({"version": "x", "categories": {"financial": []}}))
+        with pytest.raises(RulePackError):
+            load_rule_pack(str(path))
+
+    def test_bad_regex_rejected(self, tmp_path):
+        pack = load_rule_pack(write_pack(tmp_path / "rules.json", "bad", financial=["(unclosed"]))
+        with pytest.raises(RulePackError):
+            RuleMatcher(pack)
+
+
+class TestHotReload:
+    """Test validated atomic swaps."""
+
+    def test_swap_on_change(self, tmp_path):
+        path = write_pack(tmp_path / "rules.json", "1")
+        manager = RulePackManager(path, validator=validate_rule_matcher)
+        assert manager.reload_if_changed() is None
+
+        financial = load_rule_pack(DEFAULT_RULE_PACK)["categories"]["financial"]
+        write_pack(tmp_path / "rules.json", "2", financial=financial + [r"\bmoneygram\b"])
+        result = manager.reload_if_changed()
+        assert result["swapped"] and manager.active.version == "2"
+        assert _detect(normalize("via moneygram"), manager.active) == "HIGH"
+        assert manager.get_stats()["reloads"] == 1
+
+    def test_regressing_pack_rejected(self, tmp_path):
+        path = write_pack(tmp_path / "rules.json", "1")
+        manager = RulePackManager(path, validator=validate_rule_matcher)
+
+        write_pack(tmp_path / "rules.json", "2", hesitation=[])
+        result = manager.reload()
+        assert not result["swapped"]
+        assert manager.active.version == "1"
+        assert manager.get_stats()["rejected"] == 1
+
+    def test_detection_uninterrupted_during_reloads(self, tmp_path):
+        path = write_pack(tmp_path / "rules.json", "1")
+        manager = RulePackManager(path, validator=validate_rule_matcher)
+        errors = []
+        stop = threading.Event()
+
+        def detect_loop():
+            while not stop.is_set():
+                try:
+                    assert _detect(normalize("my otp is 123456"), manager.active) == "HIGH"
+                except Exception as e:  # pragma: no cover - failure path
+                    errors.append(e)
+
+        worker = threading.Thread(target=detect_loop)
+        worker.start()
+        for version in range(2, 5):
+            write_pack(tmp_path / "rules.json", str(version))
+            assert manager.reload_if_changed()["swapped"]
+        stop.set()
+        worker.join()
+        assert errors == []
+        assert manager.active.version == "4"
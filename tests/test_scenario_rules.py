@@ -0,0 +1,94 @@
+"""
+Tests for scenario-aware risk rule subsets.
+Run with: python -m pytest tests/test_scenario_rules.py -v
+"""
+import json
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from ai.risk_detection.corpus import SCENARIO_LABELED_CORPUS
+from ai.risk_detection.rule_pack import DEFAULT_RULE_PACK, RuleMatcher, RulePackError, load_rule_pack
+from ai.risk_detection.risk_detection import detect_risk, validate_rule_matcher
+
+
+def default_matcher():
+    return RuleMatcher(load_rule_pack(DEFAULT_RULE_PACK))
+
+
+class TestScenarioMatchers:
+    """Test lazy compilation of universal + scenario rules."""
+
+    def test_compiled_on_first_use_and_cached(self):
+        matcher = default_matcher()
+        assert matcher.compiled_scenarios == []
+        lottery = matcher.for_scenario("lottery_offer")
+        assert lottery is not matcher
+        assert matcher.for_scenario("lottery_offer") is lottery
+        assert matcher.compiled_scenarios == ["lottery_offer"]
+
+    def test_unknown_or_missing_scenario_is_universal(self):
+        matcher = default_matcher()
+        assert matcher.for_scenario(None) is matcher
+        assert matcher.for_scenario("no_such_scenario") is matcher
+
+    def test_scenario_matcher_extends_universal_rules(self):
+        matcher = default_matcher()
+        bank = matcher.for_scenario("bank")
+        assert bank.scenario == "bank"
+        assert bank.prefilter.pattern_count > matcher.prefilter.pattern_count
+        for name, patterns in matcher.categories.items():
+            assert bank.categories[name][:len(patterns)] == patterns
+
+
+class TestScenarioDetection:
+    """Test that scenario rules only apply inside their scenario."""
+
+    @pytest.mark.parametrize("scenario", sorted(SCENARIO_LABELED_CORPUS))
+    def test_scenario_corpus(self, scenario):
+        for message, expected in SCENARIO_LABELED_CORPUS[scenario]:
+            assert detect_risk(message, scenario) == expected, message
+
+    def test_rules_do_not_leak_across_scenarios(self):
+        assert detect_risk("yay i won!", "lottery_offer") == "HIGH"
+        assert detect_risk("yay i won!", "bank") == "LOW"
+        assert detect_risk("yay i won!") == "LOW"
+
+    def test_universal_rules_still_apply(self):
+        assert detect_risk("my otp is 482913", "lottery_offer") == "HIGH"
+        assert detect_risk("hello", "government") == "LOW"
+
+    def test_default_pack_validates_every_scenario(self):
+        matcher = default_matcher()
+        assert validate_rule_matcher(matcher, matcher) == []
+
+
+class TestScenarioPackFormat:
+    """Test validation of the pack's scenarios section."""
+
+    def write(self, tmp_path, scenarios):
+        pack = load_rule_pack(DEFAULT_RULE_PACK)
+        pack["scenarios"] = scenarios
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps(pack), encoding="utf-8")
+        return str(path)
+
+    def test_unknown_scenario_rejected(self, tmp_path):
+        with pytest.raises(RulePackError, match="unknown scenario"):
+            load_rule_pack(self.write(tmp_path, {"crypto": {"compliance": ["x"]}}))
+
+    def test_unknown_category_rejected(self, tmp_path):
+        with pytest.raises(RulePackError, match="unknown category"):
+            load_rule_pack(self.write(tmp_path, {"bank": {"misc": ["x"]}}))
+
+    def test_scenario_regression_rejected(self, tmp_path):
+        # A scenario rule that flags a known-LOW reply must not go live
+        path = self.write(tmp_path, {"bank": {"compliance": [r"\bbranch\b"]}})
+        candidate = RuleMatcher(load_rule_pack(path))
+        problems = validate_rule_matcher(candidate, default_matcher())
+        assert any(problem.startswith("[bank]") for problem in problems)
@@ -0,0 +1,136 @@
+"""
+Tests for the optional semantic risk classifier.
+Run with: python -m pytest tests/test_semantic_classifier.py -v
+"""
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+pytest.importorskip("numpy")
+
+from ai.risk_detection import risk_detection
+from ai.risk_detection.normalization import normalize
+from ai.risk_detection.semantic_classifier import (
+    MicroBatchExecutor, SemanticClassifier, corpus_examples, evaluate, featurize, load_transcripts, train
+)
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return train(corpus_examples(3000, seed=1), n_features=2 ** 14, epochs=20, seed=1)
+
+
+class TestFeatures:
+    """Test the hashing vectorizer."""
+
+    def test_stable_and_normalized(self):
+        indices, values = featurize("ok i am sending", 2 ** 12)
+        assert featurize("ok i am sending", 2 ** 12) == (indices, values)
+        assert all(0 <= i < 2 ** 12 for i in indices)
+        assert abs(sum(v * v for v in values) - 1.0) < 1e-6
+
+    def test_empty_message_has_a_feature(self):
+        indices, _ = featurize("", 2 ** 12)
+        assert len(indices) == 1
+
+
+class TestModel:
+    """Test training, scoring and persistence."""
+
+    def test_learns_the_corpus(self, classifier):
+        report = evaluate(classifier, corpus_examples(1000, seed=2))
+        assert report["accuracy"] > 0.9
+
+    def test_batch_matches_single(self, classifier):
+        messages = ["ok i am sending", "is this safe?", "hello", "my otp is 123456"]
+        batch = classifier.predict_proba(messages)
+        for message, row in zip(messages, batch):
+            label, confidence = classifier.classify(message)
+            assert label == classifier.labels[int(row.argmax())]
+            assert confidence == pytest.approx(float(row.max()), rel=1e-5)
+
+    def test_save_and_load(self, classifier, tmp_path):
+        path = str(tmp_path / "model.npz")
+        classifier.save(path)
+        loaded = SemanticClassifier.load(path)
+        assert loaded.labels == classifier.labels
+        assert loaded.version == classifier.version
+        assert loaded.classify("ok i am sending") == classifier.classify("ok i am sending")
+
+    def test_load_transcripts(self, tmp_path):
+        path = tmp_path / "turns.jsonl"
+        rows = [
+            {"user_message": "ok bhej diya", "risk": "HIGH"},
+            {"user_message": "hello", "risk": "LOW", "label": "low"},
+            {"user_message": None, "risk": None},
+        ]
+        path.write_text("\n".join(json.dumps(row) for row in rows), encoding="utf-8")
+        assert load_transcripts(str(path)) == [("ok bhej diya", "HIGH"), ("hello", "LOW")]
+
+
+class TestMicroBatchExecutor:
+    """Test grouping of concurrent requests."""
+
+    def test_concurrent_results_match_direct(self, classifier):
+        executor = MicroBatchExecutor(classifier, max_batch=8)
+        messages = [normalize(m) for m, _ in corpus_examples(400, seed=3)]
+        results = [None] * len(messages)
+
+        def worker(offset):
+            for i in range(offset, len(messages), 20):
+                results[i] = executor.classify(messages[i])
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for message, (label, confidence) in zip(messages, results):
+            expected_label, expected_confidence = classifier.classify(message)
+            assert label == expected_label
+            assert confidence == pytest.approx(expected_confidence, rel=1e-5)
+        stats = executor.get_stats()
+        assert stats["requests"] == len(messages)
+        assert stats["largest_batch"] <= 8
+
+    def test_errors_reach_the_caller(self, classifier):
+        executor = MicroBatchExecutor(classifier)
+        executor.classifier = None  # Scoring now fails inside the batch
+        with pytest.raises(AttributeError):
+            executor.classify("hello")
+        assert executor._scoring is False
+
+
+class TestDetectRiskIntegration:
+    """Test the classifier alongside the regex rules."""
+
+    class Fixed:
+        def __init__(self, label, confidence):
+            self.result = (label, confidence)
+
+        def classify(self, text):
+            return self.result
+
+    def test_confident_prediction_raises_level(self, monkeypatch):
+        monkeypatch.setattr(risk_detection, "semantic_executor", self.Fixed("HIGH", 0.99))
+        assert risk_detection.detect_risk("fine, check your inbox for the code") == "HIGH"
+
+    def test_unconfident_prediction_ignored(self, monkeypatch):
+        monkeypatch.setattr(risk_detection, "semantic_executor", self.Fixed("HIGH", 0.5))
+        assert risk_detection.detect_risk("fine, check your inbox for the code") == "LOW"
+
+    def test_never_lowers_rules_verdict(self, monkeypatch):
+        monkeypatch.setattr(risk_detection, "semantic_executor", self.Fixed("LOW", 0.99))
+        assert risk_detection.detect_risk("my otp is 482913") == "HIGH"
+        assert risk_detection.detect_risk("is this safe?") == "MEDIUM"
+
+    def test_missing_model_disables(self, tmp_path):
+        assert risk_detection.load_semantic_executor(str(tmp_path / "missing.npz")) is None
@@ -0,0 +1,124 @@
+"""
+Tests for speculative scammer generation alongside slow risk checks.
+Run with: python -m pytest tests/test_speculative_generation.py -v
+"""
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from ai.controller import simulation_controller
+from ai.controller.simulation_controller import SimulationController
+from ai.llm.ollama_client import GenerationCancelled, call_ollama
+from ai.llm.stub_ollama import StubOllamaConfig
+from ai.risk_detection import risk_detection
+
+DETECTOR_DELAY = 0.2
+
+
+@pytest.fixture
+def stub_config():
+    return StubOllamaConfig(latency_ms=100, tokens_per_sec=400)
+
+
+@pytest.fixture(autouse=True)
+def canned_mentor(monkeypatch):
+    monkeypatch.setattr(simulation_controller, "run_mentor", lambda **kwargs: "mentor")
+
+
+@pytest.fixture
+def slow_detector(monkeypatch):
+    """A secondary detector that takes DETECTOR_DELAY and flags 'inbox'."""
+    def detector(text, risk):
+        time.sleep(DETECTOR_DELAY)
+        return "HIGH" if "inbox" in text else risk
+
+    monkeypatch.setattr(risk_detection, "secondary_detectors", [detector])
+    return detector
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline and not condition():
+        time.sleep(0.01)
+    return condition()
+
+
+class TestCancellableCall:
+    """Test aborting a streamed Ollama request."""
+
+    def test_stream_matches_plain_call(self, stub):
+        assert call_ollama("hello", threading.Event()) == call_ollama("hello")
+
+    def test_cancel_aborts_generation(self, stub):
+        cancel = threading.Event()
+        threading.Timer(0.15, cancel.set).start()
+        with pytest.raises(GenerationCancelled):
+            call_ollama("hello", cancel)
+        assert wait_for(lambda: stub.stats["cancelled"] == 1)
+        assert stub.stats["tokens_generated"] < 60
+
+
+class TestSpeculativeController:
+    """Test the controller overlapping generation with secondary checks."""
+
+    def test_clean_message_overlaps_detection_and_generation(self, stub, slow_detector):
+        controller = SimulationController("student", 20, "bank")
+        controller.start_simulation()
+
+        started = time.perf_counter()
+        result = controller.user_message("who is this?")
+        elapsed = time.perf_counter() - started
+
+        assert result["mode"] == "SIMULATOR"
+        assert result["message"]
+        # Serial would be detector (0.2s) + generation (~0.25s)
+        assert elapsed < DETECTOR_DELAY + 0.2
+
+    def test_escalation_cancels_and_never_shows_reply(self, stub, slow_detector, monkeypatch):
+        controller = SimulationController("student", 20, "bank")
+        controller.start_simulation()
+        monkeypatch.setattr(stub.config, "tokens_per_sec", 20)  # Still generating when the detector fires
+        prompt_stats = {key: 0 for key in simulation_controller.prompt_token_stats}
+        monkeypatch.setattr(simulation_controller, "prompt_token_stats", prompt_stats)
+        history_before = controller.session.history
+
+        result = controller.user_message("fine, check your inbox for the code")
+
+        assert result["mode"] == "MENTOR"
+        assert result["risk"] == "HIGH"
+        assert result["message"] == "mentor"
+        assert controller.session.history.count("Scammer:") == history_before.count("Scammer:")
+        assert wait_for(lambda: stub.stats["cancelled"] == 1)
+        assert prompt_stats["turns"] == 0  # The cancelled prompt is not counted
+
+    def test_detector_error_cancels_generation(self, stub, monkeypatch):
+        def broken(text, risk):
+            time.sleep(0.05)
+            raise RuntimeError("rule service down")
+
+        monkeypatch.setattr(risk_detection, "secondary_detectors", [broken])
+        controller = SimulationController("student", 20, "bank")
+        controller.start_simulation()
+        monkeypatch.setattr(stub.config, "tokens_per_sec", 20)
+
+        with pytest.raises(RuntimeError):
+            controller.user_message("who is this?")
+        assert wait_for(lambda: stub.stats["cancelled"] == 1)
+
+    def test_serial_when_disabled(self, stub, slow_detector, monkeypatch):
+        monkeypatch.setattr(simulation_controller, "SPECULATIVE_GENERATION", False)
+        controller = SimulationController("student", 20, "bank")
+        controller.start_simulation()
+        requests_before = stub.stats["requests"]
+
+        result = controller.user_message("fine, check your inbox for the code")
+
+        assert result["mode"] == "MENTOR"
+        assert stub.stats["requests"] == requests_before
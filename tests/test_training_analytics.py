@@ -0,0 +1,155 @@
+"""
+Tests for incremental training analytics.
+Run with: python -m pytest tests/test_training_analytics.py -v
+"""
+import asyncio
+import sys
+import os
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("aiosqlite")
+
+# Add server directory to path
+server_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'server'))
+sys.path.insert(0, server_root)
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from src.app.database import Base
+from src.app.services.training_analytics import TrainingAnalytics
+
+
+async def _factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stats.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine, async_sessionmaker(bind=engine, expire_on_commit=False)
+
+
+def _play(analytics, session_id, user_id, risks):
+    analytics.start_session(session_id, user_id, "student", "bank")
+    for risk in risks:
+        analytics.record_turn(session_id, risk, "MENTOR" if risk == "HIGH" else "SIMULATOR")
+    analytics.end_session(session_id)
+
+
+class TestTrainingAnalytics:
+    """Test counter updates and persistence round-trip."""
+
+    def test_counts_turns_to_first_high(self):
+        analytics = TrainingAnalytics(session_factory=None)
+        _play(analytics, "s1", 7, ["LOW", "MEDIUM", "HIGH", "HIGH"])
+        _play(analytics, "s2", 7, ["LOW", "LOW"])
+
+        stats = analytics.get_user_stats(7)
+
+        assert stats["sessions"] == 2
+        assert stats["turns"] == 6
+        assert stats["high_turns"] == 2
+        assert stats["mentor_triggers"] == 2
+        assert stats["sessions_with_high"] == 1
+        assert stats["avg_turns_to_first_high"] == 3
+        assert stats["fall_rate"] == 0.5
+
+        scenarios = analytics.get_scenario_stats()
+        assert [(s["persona"], s["scenario"], s["turns"]) for s in scenarios] == [("student", "bank", 6)]
+
+    def test_flush_and_load_round_trip(self, tmp_path):
+        async def scenario():
+            engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stats.db'}")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+            analytics = TrainingAnalytics(factory)
+            _play(analytics, "s1", 3, ["LOW", "HIGH"])
+            written = await analytics.flush()
+            _play(analytics, "s2", 3, ["HIGH"])
+            await analytics.flush()
+
+            restored = TrainingAnalytics(factory)
+            await restored.load()
+            await engine.dispose()
+            return written, restored.get_user_stats(3)
+
+        written, stats = asyncio.run(scenario())
+
+        assert written == 2  # one user row, one scenario row
+        assert stats["sessions"] == 2
+        assert stats["turns"] == 3
+        assert stats["turns_to_first_high_total"] == 3
+
+    def test_flush_without_load_keeps_history(self, tmp_path):
+        async def scenario():
+            engine, factory = await _factory(tmp_path)
+            first = TrainingAnalytics(factory)
+            _play(first, "s1", 3, ["LOW", "LOW", "LOW"])
+            await first.flush()
+
+            # A restart whose load() failed must add to the history, not replace it
+            second = TrainingAnalytics(factory)
+            _play(second, "s2", 3, ["HIGH"])
+            await second.flush()
+
+            restored = TrainingAnalytics(factory)
+            await restored.load()
+            await engine.dispose()
+            return restored.get_user_stats(3)
+
+        stats = asyncio.run(scenario())
+        assert stats["sessions"] == 2
+        assert stats["turns"] == 4
+
+    def test_workers_add_up(self, tmp_path):
+        async def scenario():
+            engine, factory = await _factory(tmp_path)
+            workers = [TrainingAnalytics(factory), TrainingAnalytics(factory)]
+            for round_ in range(2):
+                for i, worker in enumerate(workers):
+                    _play(worker, f"s{round_}{i}", 5, ["LOW"])
+                    await worker.flush()
+            await workers[0].load()
+            await engine.dispose()
+            return workers[0].get_user_stats(5)
+
+        stats = asyncio.run(scenario())
+        assert stats["sessions"] == 4
+        assert stats["turns"] == 4
+
+    def test_load_keeps_unflushed_increments(self, tmp_path):
+        async def scenario():
+            engine, factory = await _factory(tmp_path)
+            analytics = TrainingAnalytics(factory)
+            _play(analytics, "s1", 3, ["LOW"])
+            await analytics.flush()
+            _play(analytics, "s2", 3, ["LOW"])
+            await analytics.load()
+            await engine.dispose()
+            return analytics.get_user_stats(3)
+
+        assert asyncio.run(scenario())["sessions"] == 2
+
+    def test_paused_messages_are_not_turns(self):
+        analytics = TrainingAnalytics(session_factory=None)
+        analytics.start_session("s1", 1, "student", "bank")
+        analytics.record_turn("s1", "LOW", "SIMULATOR")
+        analytics.record_turn("s1", "HIGH", "MENTOR")
+        for _ in range(3):
+            analytics.record_turn("s1", None, "MENTOR")
+
+        stats = analytics.get_user_stats(1)
+        assert stats["turns"] == 2
+        assert stats["high_rate"] == 0.5
+
+    def test_sessions_are_evicted(self):
+        analytics = TrainingAnalytics(session_factory=None)
+        analytics.start_session("ended", 1, "student", "bank")
+        analytics.record_turn("ended", None, "ENDED")
+        analytics.start_session("abandoned", 1, "student", "bank")
+        assert "ended" not in analytics._sessions
+
+        assert analytics.evict_idle(3600) == 0
+        assert analytics.evict_idle(0) == 1
+        assert analytics._sessions == {}
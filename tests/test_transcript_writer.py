@@ -0,0 +1,108 @@
+"""
+Tests for the batched simulation transcript writer.
+Run with: python -m pytest tests/test_transcript_writer.py -v
+"""
+import asyncio
+import sys
+import os
+import time
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("aiosqlite")
+
+# Add server directory to path
+server_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'server'))
+sys.path.insert(0, server_root)
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from src.app.database import Base
+from src.app.models.transcript import SimulationTurn
+from src.app.services.transcript_writer import TranscriptWriter
+
+
+async def _factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'transcripts.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine, async_sessionmaker(bind=engine, expire_on_commit=False)
+
+
+def _record(writer, i):
+    return writer.record(
+        session_id=f"session-{i % 50}",
+        user_id=i % 20,
+        persona="student",
+        scenario="bank",
+        turn_index=i,
+        user_message="ok i will send",
+        response_message="Share the OTP immediately.",
+        mode="SIMULATOR",
+        risk="LOW",
+        latency_ms=12.5,
+    )
+
+
+class TestTranscriptWriter:
+    """Test batching, draining and sustained throughput."""
+
+    def test_stop_flushes_pending_rows(self, tmp_path):
+        async def scenario():
+            engine, factory = await _factory(tmp_path)
+            writer = TranscriptWriter(factory, flush_interval_ms=10_000, batch_size=1000)
+            writer.start()
+            for i in range(25):
+                _record(writer, i)
+            await writer.stop()
+            async with factory() as db:
+                count = (await db.execute(select(func.count(SimulationTurn.id)))).scalar_one()
+            await engine.dispose()
+            return count, writer.stats
+
+        count, stats = asyncio.run(scenario())
+
+        assert count == 25
+        assert stats["batches_written"] == 1
+
+    def test_sustains_1000_turns_per_second(self, tmp_path):
+        """Enqueue 1,000 turns/sec for two seconds; the writer must keep up."""
+        rate, seconds, tick = 1000, 2, 0.01
+
+        async def scenario():
+            engine, factory = await _factory(tmp_path)
+            writer = TranscriptWriter(factory, flush_interval_ms=100, batch_size=500)
+            writer.start()
+
+            per_tick = int(rate * tick)
+            enqueue_time = 0.0
+            max_depth = 0
+            start = time.perf_counter()
+            for t in range(int(seconds / tick)):
+                t0 = time.perf_counter()
+                for i in range(per_tick):
+                    _record(writer, t * per_tick + i)
+                enqueue_time += time.perf_counter() - t0
+                max_depth = max(max_depth, writer.get_stats()["queue_depth"])
+                # Hold the schedule so the offered load stays at `rate`
+                await asyncio.sleep(max(0.0, start + (t + 1) * tick - time.perf_counter()))
+
+            await writer.stop()
+            async with factory() as db:
+                count = (await db.execute(select(func.count(SimulationTurn.id)))).scalar_one()
+            await engine.dispose()
+            return count, writer.stats, enqueue_time, max_depth
+
+        count, stats, enqueue_time, max_depth = asyncio.run(scenario())
+        total = rate * seconds
+
+        assert count == total
+        assert stats["rows_dropped"] == 0
+        # Coalescing: far fewer INSERT statements than rows
+        assert stats["batches_written"] < total / 20
+        # Enqueueing must stay off the request path: well under 50us per turn
+        assert enqueue_time / total < 50e-6
+        # The backlog never grows beyond a few flush intervals of traffic
+        assert max_depth < rate